@@ -236,6 +236,8 @@ SML tags available:
     headless_optional_group.add_argument(cli_options[35], type=str, default='', help='''(Optional) Audiobookshelf API token.''')
     headless_optional_group.add_argument(cli_options[36], type=str, default='', help='''(Optional) Audiobookshelf library ID.''')
     headless_optional_group.add_argument(cli_options[37], action='store_true', help='''(Optional) Auto-upload to Audiobookshelf after processing.''')
+    headless_optional_group.add_argument(cli_options[38], type=int, default=1, help='''(Optional, CPU only) Number of TTS worker processes, each one loading its own engine
+    and converting its own range of sentences. Default is 1.''')
 
     for arg in sys.argv:
         if arg.startswith('--') and arg not in cli_options:
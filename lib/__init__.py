@@ -8,7 +8,7 @@ from .conf import (
     max_python_version, min_python_version, models_dir, os,
     output_formats, prog_version, python_env_dir,
     requirements_file, components_dir, root_dir, tmp_dir, run_dir, gradio_cache_dir, tmp_expire, max_ebook_textarea_length,
-    tts_dir, voice_formats, voices_dir, default_output_split, default_output_split_hours,
+    latents_dir, max_latents_cache, sentences_cache_dir, ocr_cache_dir, max_sentences_cache_gb, max_romanize_cache, models_reserve_vram_gb, models_reserve_ram_gb, fast_model_load, sentences_split_ahead, parse_workers, parse_pool_idle, date_ner_window, date_ner_batch, profile_text, native_conversion, ocr_workers, ocr_inflight, max_ocr_cache_mb, ocr_output_format, ocr_debug, safetensors_dir, models_manifest, tts_dir, voice_formats, voices_dir, default_output_split, default_output_split_hours,
     default_abs_enabled, default_abs_server_url, default_abs_api_token, default_abs_library_id,
     default_abs_auto_upload
 )
@@ -41,7 +41,7 @@ __all__ = [
     "max_python_version", "min_python_version", "models_dir", "os",
     "output_formats", "prog_version", "python_env_dir",
     "requirements_file", "components_dir", "root_dir", "tmp_dir", "run_dir", "gradio_cache_dir", "tmp_expire", "max_ebook_textarea_length", 
-    "tts_dir", "voice_formats", "voices_dir", "default_output_split", "default_output_split_hours",
+    "latents_dir", "max_latents_cache", "sentences_cache_dir", "ocr_cache_dir", "max_sentences_cache_gb", "max_romanize_cache", "models_reserve_vram_gb", "models_reserve_ram_gb", "fast_model_load", "sentences_split_ahead", "parse_workers", "parse_pool_idle", "date_ner_window", "date_ner_batch", "profile_text", "native_conversion", "ocr_workers", "ocr_inflight", "max_ocr_cache_mb", "ocr_output_format", "ocr_debug", "safetensors_dir", "models_manifest", "tts_dir", "voice_formats", "voices_dir", "default_output_split", "default_output_split_hours",
 
     # from conf_lang
     "abbreviations_mapping", "chapter_word_mapping", "default_language_code",
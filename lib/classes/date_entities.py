@@ -0,0 +1,110 @@
+import regex as re
+
+from typing import Any, Callable
+
+from lib.conf import date_ner_window, date_ner_batch
+from lib.conf_lang import abbreviations_mapping
+from lib.conf_models import sml_escape_tag
+
+class DateEntities:
+
+    '''DATE entity detection with a rule based pre-pass.
+    Years and ordinal days are located with regexes first; only the sentence around each
+    of them (at most date_ner_window chars on each side) is given to the stanza NER, all
+    windows of a text in bulk_process() batches. a '.' closing an abbreviation of the language
+    (Mr., Dr.) or followed by a lowercase word or a digit (Dec. 25th) does not end a window, so
+    the month stays with its day. stanza can still see less context than in a full text pass
+    and its spans can differ there.
+    The pipeline comes from loader() on the first text having a candidate.
+    '''
+
+    _CANDIDATE = re.compile(
+        r'\b(?:1[0-9]|20)\d{2}\b|(?<!\w)(?:0?[1-9]|[12][0-9]|3[01])(?:\s|\u00A0)*(?:st|nd|rd|th)(?!\w)',
+        re.IGNORECASE
+    )
+    # sentence ends, line breaks and escaped SML tags
+    _BOUNDARY_PATTERN = rf'[.!?\u2026\n](?=\s|$)|[{chr(sml_escape_tag)}-{chr(0x10FFFF)}]'
+    _BOUNDARY = re.compile(_BOUNDARY_PATTERN)
+    _BOUNDARY_LAST = re.compile(_BOUNDARY_PATTERN, flags=re.REVERSE)
+
+    _LAST_WORD = re.compile(r'(\w+)\.$')
+
+    def __init__(self, loader:Callable[[], Any], lang:str|None=None, window:int=date_ner_window, batch_size:int=date_ner_batch)->None:
+        self.loader = loader
+        self.nlp = None
+        self.window = window
+        self.batch_size = batch_size
+        self.abbreviations = {k.lower() for k in abbreviations_mapping.get(lang, {})}
+
+    def _is_abbreviation(self, text:str, b:Any)->bool:
+        if b.group() != '.':
+            return False
+        j = b.end()
+        while j < len(text) and text[j].isspace():
+            j += 1
+        if j < len(text) and (text[j].isdigit() or text[j].islower()):
+            return True
+        w = self._LAST_WORD.search(text, max(0, b.start() - 32), b.end())
+        return w is not None and w.group().lower() in self.abbreviations
+
+    def _boundary_before(self, text:str, lo:int, hi:int)->Any:
+        b = self._BOUNDARY_LAST.search(text, lo, hi)
+        while b and self._is_abbreviation(text, b):
+            b = self._BOUNDARY_LAST.search(text, lo, b.start())
+        return b
+
+    def _boundary_after(self, text:str, lo:int, hi:int)->Any:
+        b = self._BOUNDARY.search(text, lo, hi)
+        while b and self._is_abbreviation(text, b):
+            b = self._BOUNDARY.search(text, b.end(), hi)
+        return b
+
+    def candidates(self, text:str)->list[tuple[int, int]]:
+        windows = []
+        for m in self._CANDIDATE.finditer(text):
+            if windows and m.start() < windows[-1][1]:
+                continue
+            lo = max(0, m.start() - self.window)
+            b = self._boundary_before(text, lo, m.start())
+            if b:
+                start = b.end()
+            else:
+                start = lo
+                if lo > 0:
+                    # do not cut a word
+                    while start < m.start() and not text[start].isspace():
+                        start += 1
+            hi = min(len(text), m.end() + self.window)
+            b = self._boundary_after(text, m.end(), hi)
+            if b:
+                end = b.end()
+            else:
+                end = hi
+                while end > m.end() and end < len(text) and not text[end].isspace():
+                    end -= 1
+            if windows and start <= windows[-1][1]:
+                windows[-1] = (windows[-1][0], end)
+            else:
+                windows.append((start, end))
+        return windows
+
+    def load(self)->None:
+        if self.nlp is None:
+            self.nlp = self.loader()
+
+    def __call__(self, text:str, windows:list[tuple[int, int]]|None=None)->list[tuple[int, int, str]]:
+        if windows is None:
+            windows = self.candidates(text)
+        if not windows:
+            return []
+        self.load()
+        import stanza
+        spans = []
+        for i in range(0, len(windows), self.batch_size):
+            batch = windows[i:i + self.batch_size]
+            docs = self.nlp.bulk_process([stanza.Document([], text=text[start:end]) for start, end in batch])
+            for (start, _), doc in zip(batch, docs):
+                for ent in doc.ents:
+                    if ent.type == 'DATE':
+                        spans.append((start + ent.start_char, start + ent.end_char, ent.text))
+        return spans
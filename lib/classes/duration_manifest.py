@@ -0,0 +1,89 @@
+import os, sqlite3
+
+from contextlib import closing
+
+class DurationManifest:
+    # sample counts of the session audio files (sentences, chapters, merged parts) in the durations
+    # table of the session SQLite DB. audio_save() records each sentence as it writes it, so the VTT,
+    # chapter markers, split planning and progress totals get their durations without opening the audio.
+    # a file missing from the table or changed since it was recorded (size/mtime) is measured from its
+    # header once and recorded. keys are real paths, as get_audiolist_duration() returns.
+
+    def __init__(self, db_path:str)->None:
+        self.db_path = db_path
+
+    def _connect(self)->sqlite3.Connection:
+        # the table is ensured on each connection: a reset of the session DB deletes the file
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS durations (
+                path TEXT PRIMARY KEY,
+                frames INTEGER NOT NULL,
+                samplerate INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL
+            )
+        ''')
+        return conn
+
+    def record(self, path:str, frames:int, samplerate:int)->None:
+        try:
+            real = os.path.realpath(path)
+            st = os.stat(real)
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO durations (path, frames, samplerate, size, mtime_ns) VALUES (?, ?, ?, ?, ?)',
+                    (real, int(frames), int(samplerate), st.st_size, st.st_mtime_ns)
+                )
+        except Exception as e:
+            print(f'DurationManifest.record() error: {path}: {e}')
+
+    def _measure(self, path:str)->tuple[int, int]|None:
+        try:
+            import soundfile as sf
+            info = sf.info(path)
+            return info.frames, info.samplerate
+        except Exception:
+            return None
+
+    def durations(self, paths:list[str])->dict[str, float]:
+        reals = [os.path.realpath(p) for p in paths]
+        with closing(self._connect()) as conn, conn:
+            known = {
+                row[0]: row[1:]
+                for row in conn.execute('SELECT path, frames, samplerate, size, mtime_ns FROM durations')
+            }
+        durations = {}
+        measured = []
+        for real in reals:
+            try:
+                st = os.stat(real)
+            except OSError:
+                durations[real] = 0.0
+                continue
+            row = known.get(real)
+            if row is not None and row[2] == st.st_size and row[3] == st.st_mtime_ns and row[1] > 0:
+                durations[real] = row[0] / row[1]
+                continue
+            result = self._measure(real)
+            if result is None:
+                from lib.classes.tts_engines.common.audio import get_audio_duration
+                durations[real] = get_audio_duration(real)
+                continue
+            frames, samplerate = result
+            durations[real] = frames / samplerate if samplerate else 0.0
+            measured.append((real, frames, samplerate, st.st_size, st.st_mtime_ns))
+        if measured:
+            try:
+                with closing(self._connect()) as conn, conn:
+                    conn.executemany(
+                        'INSERT OR REPLACE INTO durations (path, frames, samplerate, size, mtime_ns) VALUES (?, ?, ?, ?, ?)',
+                        measured
+                    )
+            except Exception as e:
+                print(f'DurationManifest.durations() error: {e}')
+        return durations
+
+    def duration(self, path:str)->float:
+        return self.durations([path]).get(os.path.realpath(path), 0.0)
@@ -0,0 +1,406 @@
+import os, posixpath, shutil, uuid, zipfile, ebooklib
+import regex as re
+
+from typing import Any
+from html import escape
+from urllib.parse import quote
+from bs4 import BeautifulSoup, NavigableString, Tag
+
+class EpubBuilder:
+
+    '''In-process conversion to the EPUB read by get_blocks(), for the inputs calibre is not needed for.
+    Every input is split in one document per h1-h5 section, as calibre's --page-breaks-before does,
+    so the blocks are the ones a calibre conversion gives. EPUB documents are cut in place, the other
+    parts added after them in the manifest and the spine, the rest of the EPUB is kept as is.
+    Bare <body> documents get a class attribute: get_body_content() returns the content of a bare body
+    without the body tag and get_blocks() skips it, which is right for the title page calibre generates
+    but not for the chapters of an EPUB calibre did not touch. Quotes, dashes and ellipses are
+    smartened as calibre's --smarten-punctuation does, so the text given to the TTS does not change.
+    build() returns (bool, error), the caller falls back to calibre on failure.
+    '''
+
+    FORMATS = ['.epub', '.txt', '.md', '.html', '.htm', '.xhtml', '.docx']
+    SPLIT_TAGS = ['h1', 'h2', 'h3', 'h4', 'h5']
+    BODY_CLASS = 'e2a'
+
+    _BARE_BODY = re.compile(rb'<body\s*>')
+    _ELLIPSIS = re.compile(r'\.\.\.|\. \. \.')
+    _DASHES = re.compile(r'-{2,3}(?!-)')
+    _OPENERS = '([{\u2014\u2013-/'
+    _RAW_TAGS = ['script', 'style', 'pre', 'code', 'head']
+    _MARKUP = re.compile(r'(<!--.*?-->|<!\[CDATA\[.*?\]\]>|<[^>]*>)', re.DOTALL)
+    _TAG_NAME = re.compile(r'<(/?)([A-Za-z][\w:.-]*)')
+
+    def __init__(self, language:str)->None:
+        self.language = language
+
+    def build(self, src:str, dst:str, title:str|None=None, author:str|None=None)->tuple[bool, str|None]:
+        try:
+            ext = os.path.splitext(src)[1].lower()
+            if ext not in self.FORMATS:
+                return False, f'EpubBuilder: unsupported format {ext}'
+            default_title = os.path.splitext(os.path.basename(src))[0]
+            if ext == '.epub':
+                self._from_epub(src, dst)
+                return True, None
+            images = {}
+            if ext == '.txt':
+                body = self._from_txt(src)
+            elif ext == '.md':
+                body = self._from_markdown(src)
+            elif ext == '.docx':
+                body, meta_title, meta_author = self._from_docx(src)
+                title = title or meta_title
+                author = author or meta_author
+            else:
+                body, meta_title = self._from_html(src, images)
+                title = title or meta_title
+            self._smarten_body(body)
+            sections = self._split(body)
+            if not sections:
+                return False, f'EpubBuilder: no content found in {src}'
+            self._write(dst, title or default_title, author, sections, images)
+            return True, None
+        except Exception as e:
+            if os.path.exists(dst):
+                os.remove(dst)
+            return False, f'EpubBuilder.build() error: {e}'
+
+    def _from_epub(self, src:str, dst:str)->None:
+        from lib.classes.epub_reader import EpubReader
+        with EpubReader(src) as reader:
+            # same cover lookup as get_cover()
+            covers = set()
+            for item in reader.get_items_of_type(ebooklib.ITEM_COVER):
+                covers.add(os.path.basename(item.file_name))
+            for item in reader.get_items_of_type(ebooklib.ITEM_IMAGE):
+                if 'cover' in item.file_name.lower() or 'cover' in item.get_id().lower():
+                    covers.add(os.path.basename(item.file_name))
+            spine_ids = {uid for uid, _ in reader.spine}
+            opf = reader.zf.read(reader.opf_path).decode('utf-8')
+            patched = {}
+            added = {}
+            for item in reader.get_items_of_type(ebooklib.ITEM_DOCUMENT):
+                if item.zip_path not in reader.zip_names:
+                    continue
+                if self._is_cover_page(item.content, covers):
+                    continue
+                content = self._smarten_markup(item.content)
+                parts = self._split_document(content) if item.id in spine_ids else None
+                if parts:
+                    opf = self._add_splits(reader, item, parts, opf, patched, added)
+                    continue
+                m = self._BARE_BODY.search(content)
+                if m:
+                    content = content[:m.start()] + f'<body class="{self.BODY_CLASS}">'.encode() + content[m.end():]
+                if content != item.content:
+                    patched[item.zip_path] = content
+            if not patched:
+                shutil.copyfile(src, dst)
+                return
+            if added:
+                patched[reader.opf_path] = opf.encode('utf-8')
+            with zipfile.ZipFile(dst, 'w') as out:
+                # entries order and compression kept, mimetype stays first and stored
+                for info in reader.zf.infolist():
+                    content = patched.get(info.filename)
+                    out.writestr(info, content if content is not None else reader.zf.read(info))
+                    for name, data in added.get(info.filename, []):
+                        out.writestr(name, data, compress_type=zipfile.ZIP_DEFLATED)
+
+    def _smarten(self, text:str, prev:str)->str:
+        # calibre's --smarten-punctuation: curly quotes, em dashes and ellipses.
+        # prev is the text char before this string, for the quotes at its start
+        text = self._ELLIPSIS.sub('\u2026', text)
+        text = self._DASHES.sub('\u2014', text)
+        if '"' not in text and "'" not in text:
+            return text
+        out = []
+        for i, ch in enumerate(text):
+            opening = prev.isspace() or prev in self._OPENERS
+            if ch == '"':
+                ch = '\u201c' if opening else '\u201d'
+            elif ch == "'":
+                # '90s is an apostrophe
+                ch = '\u2018' if opening and not text[i + 1:i + 2].isdigit() else '\u2019'
+            out.append(ch)
+            prev = ch
+        return ''.join(out)
+
+    def _smarten_body(self, body:Tag)->None:
+        prev = ' '
+        for string in list(body.find_all(string=True)):
+            if string.find_parent(self._RAW_TAGS) is not None or type(string) is not NavigableString:
+                continue
+            text = str(string)
+            new = self._smarten(text, prev)
+            if new != text:
+                string.replace_with(NavigableString(new))
+            if text:
+                prev = new[-1]
+
+    def _smarten_markup(self, content:bytes)->bytes:
+        # same on the text between the tags of an EPUB document, the markup is left byte for byte
+        try:
+            markup = content.decode('utf-8')
+        except UnicodeDecodeError:
+            return content
+        parts = self._MARKUP.split(markup)
+        prev = ' '
+        raw = None
+        for i in range(0, len(parts)):
+            part = parts[i]
+            if i % 2:
+                m = self._TAG_NAME.match(part)
+                if m:
+                    name = m.group(2).lower()
+                    if raw is None and not m.group(1) and name in self._RAW_TAGS and not part.endswith('/>'):
+                        raw = name
+                    elif raw == name and m.group(1):
+                        raw = None
+                continue
+            if raw is not None or not part:
+                continue
+            parts[i] = self._smarten(part, prev)
+            prev = parts[i][-1]
+        smart = ''.join(parts)
+        return content if smart == markup else smart.encode('utf-8')
+
+    def _split_document(self, content:bytes)->list[bytes]|None:
+        # the document cut at its h1-h5 as calibre's --page-breaks-before cuts it, head and body
+        # attributes repeated in each part. None when there is nothing to cut.
+        soup = BeautifulSoup(content, 'html.parser')
+        body = soup.body
+        if body is None or not body.find(self.SPLIT_TAGS):
+            return None
+        sections = self._split(body)
+        if len(sections) < 2:
+            return None
+        html_edges = self._tag_edges(soup.html) if soup.html is not None else ('<html xmlns="http://www.w3.org/1999/xhtml">', '</html>')
+        head = str(soup.head) if soup.head is not None else ''
+        body_edges = self._tag_edges(body) if body.attrs else (f'<body class="{self.BODY_CLASS}">', '</body>')
+        return [
+            (
+                '<?xml version="1.0" encoding="utf-8"?>\n'
+                f'{html_edges[0]}\n{head}\n{body_edges[0]}\n{html}\n{body_edges[1]}\n{html_edges[1]}\n'
+            ).encode('utf-8')
+            for _, html in sections
+        ]
+
+    def _add_splits(self, reader:Any, item:Any, parts:list[bytes], opf:str, patched:dict, added:dict)->str:
+        # the first part replaces the document, the others follow it in the manifest and the spine
+        patched[item.zip_path] = parts[0]
+        stem, ext = posixpath.splitext(posixpath.basename(item.file_name))
+        href_dir = posixpath.dirname(item.file_name)
+        manifest_items = []
+        spine_items = []
+        for n, part in enumerate(parts[1:], 1):
+            uid = f'{item.id}_split{n:03d}'
+            href = posixpath.join(href_dir, f'{stem}_split{n:03d}{ext}')
+            added.setdefault(item.zip_path, []).append((posixpath.normpath(posixpath.join(reader.opf_dir, href)), part))
+            manifest_items.append(f'<item id="{escape(uid)}" href="{escape(quote(href))}" media-type="application/xhtml+xml"/>')
+            spine_items.append(f'<itemref idref="{escape(uid)}"/>')
+        uid = re.escape(item.id)
+        for pattern, new in (
+            (rf'<(?:\w+:)?item\b[^>]*\bid\s*=\s*["\']{uid}["\'][^>]*>', manifest_items),
+            (rf'<(?:\w+:)?itemref\b[^>]*\bidref\s*=\s*["\']{uid}["\'][^>]*>', spine_items)
+        ):
+            m = re.search(pattern, opf)
+            if m is None:
+                raise ValueError(f'cannot locate {item.id} in the OPF')
+            end = m.end()
+            if not m.group().endswith('/>'):
+                # <item ...></item>
+                end = opf.index('>', opf.index('</', end)) + 1
+            opf = opf[:end] + ''.join(new) + opf[end:]
+        return opf
+
+    def _is_cover_page(self, content:bytes, covers:set)->bool:
+        # a page showing the cover image only, left bare so get_blocks() does not OCR the cover
+        soup = BeautifulSoup(content, 'html.parser')
+        body = soup.body
+        if body is None or body.get_text(strip=True):
+            return False
+        refs = [
+            img.get('src') or img.get('href') or img.get('xlink:href')
+            for img in body.find_all(['img', 'image'])
+        ]
+        refs = [os.path.basename(ref) for ref in refs if ref]
+        return bool(refs) and all(ref in covers for ref in refs)
+
+    def _from_txt(self, src:str)->Tag:
+        with open(src, 'r', encoding='utf-8') as f:
+            text = f.read()
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        if re.search(r'\n[ \t]*\n', text.strip()):
+            # paragraphs are separated by blank lines, the lines of a paragraph are joined
+            # as calibre does, so a hard wrapped text gets no [break] at each line end
+            paragraphs = [' '.join(line.strip() for line in block.strip().split('\n')) for block in re.split(r'\n[ \t]*\n', text)]
+        else:
+            # no blank line at all: one paragraph per line
+            paragraphs = [line.strip() for line in text.split('\n')]
+        html = '\n'.join(f'<p>{escape(paragraph)}</p>' for paragraph in paragraphs if paragraph.strip())
+        return BeautifulSoup(f'<body>{html}</body>', 'html.parser').body
+
+    def _from_markdown(self, src:str)->Tag:
+        from markdown import markdown
+        with open(src, 'r', encoding='utf-8') as f:
+            text = f.read()
+        html = markdown(text, extensions=['extra'])
+        return BeautifulSoup(f'<body>{html}</body>', 'html.parser').body
+
+    def _from_html(self, src:str, images:dict)->tuple[Tag, str|None]:
+        with open(src, 'rb') as f:
+            soup = BeautifulSoup(f.read(), 'html.parser')
+        title_tag = soup.find('title')
+        title = title_tag.get_text(strip=True) if title_tag else None
+        body = soup.body or soup
+        # local images are embedded so image-only sections still go to the OCR
+        src_dir = os.path.dirname(os.path.abspath(src))
+        for img in body.find_all(['img', 'image']):
+            attr = next((a for a in ('src', 'href', 'xlink:href') if img.get(a)), None)
+            if attr is None or re.match(r'^[a-z][a-z0-9+.-]*:', img[attr], re.IGNORECASE):
+                continue
+            path = os.path.normpath(os.path.join(src_dir, img[attr]))
+            if not os.path.isfile(path):
+                continue
+            name = f'image{len(images) + 1:04d}{os.path.splitext(path)[1].lower()}'
+            with open(path, 'rb') as f:
+                images[name] = f.read()
+            img[attr] = f'../images/{name}'
+        return body, title or None
+
+    def _from_docx(self, src:str)->tuple[Tag, str|None, str|None]:
+        from docx import Document as DocxDocument
+        from docx.table import Table
+        from docx.text.paragraph import Paragraph
+        docx_doc = DocxDocument(src)
+        parts = []
+        for el in docx_doc.element.body.iterchildren():
+            tag = el.tag.rsplit('}', 1)[-1]
+            if tag == 'p':
+                para = Paragraph(el, docx_doc)
+                text = para.text.strip()
+                if not text:
+                    continue
+                style = para.style.name if para.style is not None else ''
+                m = re.match(r'^Heading (\d+)$', style or '')
+                level = 1 if style == 'Title' else int(m.group(1)) if m else 0
+                if 1 <= level <= 6:
+                    parts.append(f'<h{level}>{escape(text)}</h{level}>')
+                else:
+                    parts.append(f'<p>{escape(text)}</p>')
+            elif tag == 'tbl':
+                rows = []
+                for row in Table(el, docx_doc).rows:
+                    cells = ''.join(f'<td>{escape(cell.text.strip())}</td>' for cell in row.cells)
+                    rows.append(f'<tr>{cells}</tr>')
+                if rows:
+                    parts.append(f"<table>{''.join(rows)}</table>")
+        props = docx_doc.core_properties
+        body = BeautifulSoup(f"<body>{''.join(parts)}</body>", 'html.parser').body
+        return body, props.title or None, props.author or None
+
+    def _split(self, body:Tag)->list[tuple[str, str]]:
+        # (title, html) per section. A wrapper holding a heading (a PDF page div...)
+        # is closed before the break and reopened after it, so its children keep their parent
+        sections = []
+        wrappers = []
+
+        def start():
+            if sections and not sections[-1]['content']:
+                return
+            if sections:
+                sections[-1]['html'] += [closing for _, closing in reversed(wrappers)]
+            sections.append({"title": None, "html": [opening for opening, _ in wrappers], "content": False})
+
+        def walk(node:Tag):
+            for child in node.children:
+                if isinstance(child, Tag) and child.name in self.SPLIT_TAGS:
+                    start()
+                    if sections[-1]['title'] is None:
+                        sections[-1]['title'] = child.get_text(' ', strip=True) or None
+                    sections[-1]['html'].append(str(child))
+                    sections[-1]['content'] = True
+                elif isinstance(child, Tag) and child.find(self.SPLIT_TAGS):
+                    edges = self._tag_edges(child)
+                    sections[-1]['html'].append(edges[0])
+                    wrappers.append(edges)
+                    walk(child)
+                    wrappers.pop()
+                    sections[-1]['html'].append(edges[1])
+                else:
+                    html = str(child)
+                    sections[-1]['html'].append(html)
+                    if isinstance(child, Tag) or (isinstance(child, NavigableString) and html.strip()):
+                        sections[-1]['content'] = True
+
+        start()
+        walk(body)
+        return [(s['title'], ''.join(s['html'])) for s in sections if s['content']]
+
+    def _tag_edges(self, tag:Tag)->tuple[str, str]:
+        attrs = ''.join(
+            f' {k}="{escape(" ".join(v) if isinstance(v, list) else str(v))}"'
+            for k, v in tag.attrs.items()
+        )
+        return f'<{tag.name}{attrs}>', f'</{tag.name}>'
+
+    def _write(self, dst:str, title:str, author:str|None, sections:list[tuple[str, str]], images:dict)->None:
+        lang = escape(self.language or 'en')
+        docs = []
+        for i, (section_title, html) in enumerate(sections, 1):
+            name = f'text/part{i:04d}.xhtml'
+            label = section_title or f'{title} {i}'
+            docs.append((f'part{i:04d}', name, label, (
+                '<?xml version="1.0" encoding="utf-8"?>\n'
+                f'<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" lang="{lang}" xml:lang="{lang}">\n'
+                f'<head>\n<meta charset="utf-8"/>\n<title>{escape(label)}</title>\n</head>\n'
+                f'<body class="{self.BODY_CLASS}">\n{html}\n</body>\n'
+                '</html>\n'
+            )))
+        media_types = {".jpg": 'image/jpeg', ".jpeg": 'image/jpeg', ".png": 'image/png', ".gif": 'image/gif', ".svg": 'image/svg+xml', ".webp": 'image/webp', ".bmp": 'image/bmp', ".tif": 'image/tiff', ".tiff": 'image/tiff'}
+        manifest = ['<item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>']
+        manifest += [f'<item id="{uid}" href="{name}" media-type="application/xhtml+xml"/>' for uid, name, _, _ in docs]
+        manifest += [
+            f'<item id="img{i:04d}" href="images/{name}" media-type="{media_types.get(os.path.splitext(name)[1], "application/octet-stream")}"/>'
+            for i, name in enumerate(images, 1)
+        ]
+        spine = [f'<itemref idref="{uid}"/>' for uid, _, _, _ in docs]
+        creator = f'<dc:creator>{escape(author)}</dc:creator>\n' if author else ''
+        opf = (
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="uid">\n'
+            '<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">\n'
+            f'<dc:identifier id="uid">urn:uuid:{uuid.uuid4()}</dc:identifier>\n'
+            f'<dc:title>{escape(title)}</dc:title>\n'
+            f'{creator}'
+            f'<dc:language>{lang}</dc:language>\n'
+            '</metadata>\n'
+            f"<manifest>\n{chr(10).join(manifest)}\n</manifest>\n"
+            f"<spine>\n{chr(10).join(spine)}\n</spine>\n"
+            '</package>\n'
+        )
+        toc = '\n'.join(f'<li><a href="{name}">{escape(label)}</a></li>' for _, name, label, _ in docs)
+        nav = (
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            f'<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" lang="{lang}" xml:lang="{lang}">\n'
+            f'<head>\n<meta charset="utf-8"/>\n<title>{escape(title)}</title>\n</head>\n'
+            f'<body>\n<nav epub:type="toc" id="toc">\n<ol>\n{toc}\n</ol>\n</nav>\n</body>\n'
+            '</html>\n'
+        )
+        container = (
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">\n'
+            '<rootfiles>\n<rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>\n</rootfiles>\n'
+            '</container>\n'
+        )
+        with zipfile.ZipFile(dst, 'w', zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr('mimetype', 'application/epub+zip', compress_type=zipfile.ZIP_STORED)
+            zf.writestr('META-INF/container.xml', container)
+            zf.writestr('OEBPS/content.opf', opf)
+            zf.writestr('OEBPS/nav.xhtml', nav)
+            for _, name, _, xhtml in docs:
+                zf.writestr(f'OEBPS/{name}', xhtml)
+            for name, data in images.items():
+                zf.writestr(f'OEBPS/images/{name}', data)
@@ -0,0 +1,172 @@
+import posixpath, zipfile
+import xml.etree.ElementTree as ET
+
+from types import SimpleNamespace
+from urllib.parse import unquote
+from ebooklib import epub
+
+NS = {
+    "container": 'urn:oasis:names:tc:opendocument:xmlns:container',
+    "opf": 'http://www.idpf.org/2007/opf',
+    "dc": 'http://purl.org/dc/elements/1.1/',
+    "xhtml": 'http://www.w3.org/1999/xhtml',
+    "epub": 'http://www.idpf.org/2007/ops'
+}
+
+class _ZipContent:
+    # item content read from the epub zip on each access and never kept in memory
+    zf = None
+    zip_path = None
+    _content = None
+
+    @property
+    def content(self)->bytes:
+        if self._content is None and self.zf is not None:
+            return self.zf.read(self.zip_path)
+        return self._content
+
+    @content.setter
+    def content(self, value:bytes)->None:
+        self._content = value if value else None
+
+class ZipHtml(_ZipContent, epub.EpubHtml): pass
+class ZipNav(_ZipContent, epub.EpubNav): pass
+class ZipCoverHtml(_ZipContent, epub.EpubCoverHtml): pass
+class ZipCover(_ZipContent, epub.EpubCover): pass
+class ZipImage(_ZipContent, epub.EpubImage): pass
+class ZipNcx(_ZipContent, epub.EpubNcx): pass
+class ZipSMIL(_ZipContent, epub.EpubSMIL): pass
+class ZipItem(_ZipContent, epub.EpubItem): pass
+
+class EpubReader:
+
+    '''Read-only EPUB opened lazily, in place of ebooklib.epub.read_epub().
+    Only container.xml and the OPF are parsed upfront; manifest items are the ebooklib
+    classes ebooklib would build (same types, ids, names, get_body_content()...) but their
+    content is read from the zip when asked, so documents are loaded one at a time and
+    images only when the cover or the OCR needs them. The zip handle stays open for the
+    OCR of get_blocks() until close().
+    '''
+
+    def __init__(self, path:str)->None:
+        self.path = path
+        self.zf = zipfile.ZipFile(path, 'r')
+        self.zip_names = set(self.zf.namelist())
+        container = ET.fromstring(self.zf.read('META-INF/container.xml'))
+        rootfile = container.find('.//container:rootfile', NS)
+        self.opf_path = rootfile.get('full-path')
+        self.opf_dir = posixpath.dirname(self.opf_path)
+        opf = ET.fromstring(self.zf.read(self.opf_path))
+        self.metadata = {}
+        metadata = opf.find('opf:metadata', NS)
+        if metadata is not None:
+            for el in metadata:
+                if el.tag.startswith(f"{{{NS['dc']}}}"):
+                    name = el.tag.split('}', 1)[1]
+                    self.metadata.setdefault(name, []).append((el.text, dict(el.attrib)))
+        self.items = []
+        manifest = opf.find('opf:manifest', NS)
+        for el in (manifest if manifest is not None else []):
+            if el.tag != f"{{{NS['opf']}}}item":
+                continue
+            item = self._new_item(el)
+            if item is not None:
+                self.items.append(item)
+        self.spine = []
+        spine = opf.find('opf:spine', NS)
+        for el in (spine if spine is not None else []):
+            if el.tag == f"{{{NS['opf']}}}itemref":
+                self.spine.append((el.get('idref'), el.get('linear', 'yes')))
+        self._toc = None
+        # EpubHtml.get_content() renders the documents through the templates and language of the book,
+        # read_epub() leaves both to the EpubBook defaults
+        defaults = epub.EpubBook()
+        self.templates = defaults.templates
+        self.language = defaults.language
+
+    def _new_item(self, el:ET.Element)->epub.EpubItem|None:
+        # same item classes and attributes as ebooklib's EpubReader._load_manifest()
+        href = el.get('href')
+        if not href:
+            return None
+        media_type = el.get('media-type')
+        properties = el.get('properties', '').split()
+        if media_type == 'image/jpg':
+            media_type = 'image/jpeg'
+        file_name = unquote(href)
+        if media_type == 'application/x-dtbncx+xml':
+            item = ZipNcx(uid=el.get('id'), file_name=file_name)
+        elif media_type == 'application/smil+xml':
+            item = ZipSMIL(uid=el.get('id'), file_name=file_name)
+        elif media_type == 'application/xhtml+xml':
+            if 'nav' in properties:
+                item = ZipNav(uid=el.get('id'), file_name=file_name)
+            elif 'cover' in properties:
+                item = ZipCoverHtml()
+            else:
+                item = ZipHtml()
+                item.id = el.get('id')
+                item.file_name = file_name
+                item.media_type = media_type
+                item.media_overlay = el.get('media-overlay', None)
+                item.media_duration = el.get('duration', None)
+                item.properties = properties
+        elif media_type in epub.IMAGE_MEDIA_TYPES:
+            item = ZipCover(uid=el.get('id'), file_name=file_name) if 'cover-image' in properties else ZipImage()
+            item.id = el.get('id')
+            item.file_name = file_name
+            item.media_type = media_type
+        else:
+            item = ZipItem()
+            item.id = el.get('id')
+            item.file_name = file_name
+            item.media_type = media_type
+        item.book = self
+        item.zf = self.zf
+        item.zip_path = posixpath.normpath(posixpath.join(self.opf_dir, file_name))
+        return item
+
+    def get_template(self, name:str)->str:
+        return self.templates.get(name)
+
+    def get_metadata(self, namespace:str, name:str)->list[tuple]:
+        return self.metadata.get(name, []) if namespace == 'DC' else []
+
+    def get_items_of_type(self, item_type:int):
+        return (item for item in self.items if item.get_type() == item_type)
+
+    def get_item_with_id(self, uid:str)->epub.EpubItem|None:
+        return next((item for item in self.items if item.id == uid), None)
+
+    @property
+    def toc(self)->list:
+        # top level entries of the EPUB3 navigation document, as read_epub(ignore_ncx=True) does
+        if self._toc is None:
+            self._toc = []
+            nav = next((item for item in self.items if isinstance(item, epub.EpubNav)), None)
+            if nav is not None:
+                try:
+                    root = ET.fromstring(nav.content)
+                    for el in root.iter(f"{{{NS['xhtml']}}}nav"):
+                        if el.get(f"{{{NS['epub']}}}type") != 'toc':
+                            continue
+                        ol = el.find('xhtml:ol', NS)
+                        for li in (ol if ol is not None else []):
+                            label = li.find('xhtml:a', NS)
+                            if label is None:
+                                label = li.find('xhtml:span', NS)
+                            if label is not None:
+                                self._toc.append(SimpleNamespace(title=''.join(label.itertext()).strip(), href=label.get('href')))
+                        break
+                except ET.ParseError:
+                    pass
+        return self._toc
+
+    def close(self)->None:
+        self.zf.close()
+
+    def __enter__(self)->'EpubReader':
+        return self
+
+    def __exit__(self, *exc)->None:
+        self.close()
@@ -0,0 +1,230 @@
+import gc, time, threading
+
+from typing import Any
+from collections.abc import MutableMapping
+
+from lib.conf import models_reserve_vram_gb, models_reserve_ram_gb
+
+class ModelResidency(MutableMapping):
+    # drop-in replacement of the loaded_tts dict. every entry keeps its measured byte size, its
+    # home device and its last use time. under memory pressure the least recently used unpinned
+    # models are first offloaded from the accelerator to CPU RAM, then dropped (they reload from disk).
+    # conversions pin their engine so it can never be evicted while in use.
+
+    def __init__(self, reserve_vram_gb:float=models_reserve_vram_gb, reserve_ram_gb:float=models_reserve_ram_gb)->None:
+        self.entries = {}
+        self.reserve_vram_bytes = int(reserve_vram_gb * (1024 ** 3))
+        self.reserve_ram_bytes = int(reserve_ram_gb * (1024 ** 3))
+        self.hits = 0
+        self.misses = 0
+        self.offloads = 0
+        self.evictions = 0
+        self.load_times = {}
+        self.lock = threading.RLock()
+
+    # ---- MutableMapping
+
+    def __getitem__(self, key:str)->Any:
+        with self.lock:
+            entry = self.entries[key]
+            entry['last_used'] = time.monotonic()
+            if entry['device'] != entry['home_device'] and self._move(entry, entry['home_device']):
+                # back on the accelerator: the VRAM budget applies as for a new load
+                self._enforce(keep=key)
+            return entry['model']
+
+    def __setitem__(self, key:str, model:Any)->None:
+        self.add(key, model)
+
+    def __delitem__(self, key:str)->None:
+        with self.lock:
+            del self.entries[key]
+
+    def __iter__(self):
+        return iter(list(self.entries.keys()))
+
+    def __len__(self)->int:
+        return len(self.entries)
+
+    def get(self, key:str, default:Any=None)->Any:
+        with self.lock:
+            if key in self.entries:
+                self.hits += 1
+                return self[key]
+            self.misses += 1
+            return default
+
+    def values(self):
+        # size accounting must not refresh the LRU clock nor move models back on device
+        return [entry['model'] for entry in self.entries.values()]
+
+    # ---- residency
+
+    def add(self, key:str, model:Any, load_time:float|None=None)->None:
+        with self.lock:
+            device = self._device_of(model)
+            pinned = self.entries[key]['pinned'] if key in self.entries else 0
+            self.entries[key] = {
+                "model": model,
+                "size_bytes": self._size_bytes(model),
+                "device": device,
+                "home_device": device,
+                "last_used": time.monotonic(),
+                "pinned": pinned
+            }
+            if load_time is not None:
+                self.load_times[key] = load_time
+            self._enforce(keep=key)
+
+    def pin(self, key:str)->None:
+        # the engine may have been offloaded while unused (a preload waiting for get_blocks()):
+        # it holds the model itself, so the weights go back to their home device before it runs
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return
+            entry['pinned'] += 1
+            entry['last_used'] = time.monotonic()
+            if entry['device'] != entry['home_device'] and self._move(entry, entry['home_device']):
+                self._enforce(keep=key)
+
+    def unpin(self, key:str)->None:
+        with self.lock:
+            if key in self.entries and self.entries[key]['pinned'] > 0:
+                self.entries[key]['pinned'] -= 1
+
+    def move(self, key:str, device:str)->bool:
+        # explicit move from the owner, which also becomes the entry home device
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return False
+            entry['last_used'] = time.monotonic()
+            if entry['device'] != device and not self._move(entry, device):
+                return False
+            entry['home_device'] = device
+            if device != 'cpu':
+                self._enforce(keep=key)
+            return True
+
+    def offload(self, key:str)->bool:
+        # explicit request from the owner: allowed even when pinned
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry['device'] == 'cpu':
+                return False
+            if self._move(entry, 'cpu'):
+                self.offloads += 1
+                self._empty_accel_cache()
+                return True
+            return False
+
+    def release_unused(self, active_keys:set)->None:
+        # models no live session refers to are offloaded rather than dropped, so the next
+        # session asking for them pays a host to device copy instead of a reload from disk
+        with self.lock:
+            for key, entry in list(self.entries.items()):
+                if key not in active_keys and entry['pinned'] == 0:
+                    self.offload(key)
+            self._enforce()
+
+    def stats(self)->str:
+        lookups = self.hits + self.misses
+        rate = (self.hits / lookups * 100) if lookups else 0.0
+        resident = ', '.join(
+            f"{key}[{entry['device']}, {entry['size_bytes'] / (1024 ** 3):.2f}GB{', pinned' if entry['pinned'] else ''}]"
+            for key, entry in self.entries.items()
+        )
+        load_times = ', '.join(f'{key}: {t:.1f}s' for key, t in self.load_times.items())
+        return (f'Models: {self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate), '
+                f'{self.offloads} offloads, {self.evictions} evictions. Resident: {resident or "none"}. Load times: {load_times or "none"}')
+
+    # ---- internals
+
+    def _targets(self, model:Any)->list:
+        # VITS/fairseq through the TTS api keep their weights in model.synthesizer,
+        # which is not registered as a submodule
+        syn = getattr(model, 'synthesizer', None)
+        return [syn] if syn is not None else [model]
+
+    def _size_bytes(self, model:Any)->int:
+        total = 0
+        for tgt in self._targets(model):
+            for attr in ('parameters', 'buffers'):
+                try:
+                    for t in getattr(tgt, attr)():
+                        total += t.numel() * t.element_size()
+                except Exception:
+                    pass
+        return total
+
+    def _device_of(self, model:Any)->str:
+        for tgt in self._targets(model):
+            try:
+                return next(tgt.parameters()).device.type
+            except Exception:
+                pass
+        return 'cpu'
+
+    def _move(self, entry:dict, device:str)->bool:
+        try:
+            for tgt in self._targets(entry['model']):
+                if not hasattr(tgt, 'to'):
+                    return False
+                tgt.to(device)
+                if hasattr(tgt, 'use_cuda'):
+                    tgt.use_cuda = device != 'cpu'
+            entry['device'] = device
+            return True
+        except Exception as e:
+            print(f'ModelResidency._move({device}) error: {e}')
+            return False
+
+    def _free_accel_bytes(self)->int|None:
+        try:
+            import torch
+            if torch.cuda.is_available():
+                return torch.cuda.mem_get_info()[0]
+            if hasattr(torch, 'xpu') and torch.xpu.is_available():
+                return torch.xpu.mem_get_info()[0]
+        except Exception:
+            pass
+        return None
+
+    def _free_ram_bytes(self)->int:
+        # imported here: conf_models (and so this module) is loaded by app.py before the requirements are checked
+        import psutil
+        return psutil.virtual_memory().available
+
+    def _empty_accel_cache(self)->None:
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+            if hasattr(torch, 'xpu') and torch.xpu.is_available():
+                torch.xpu.empty_cache()
+        except Exception:
+            pass
+
+    def _lru(self, device_on_accel:bool, keep:str|None)->list:
+        candidates = [
+            (entry['last_used'], key) for key, entry in self.entries.items()
+            if key != keep and entry['pinned'] == 0 and ((entry['device'] != 'cpu') == device_on_accel)
+        ]
+        return [key for _, key in sorted(candidates)]
+
+    def _enforce(self, keep:str|None=None)->None:
+        free_accel = self._free_accel_bytes()
+        if free_accel is not None and free_accel < self.reserve_vram_bytes:
+            for key in self._lru(True, keep):
+                if self.offload(key):
+                    free_accel = self._free_accel_bytes()
+                    if free_accel is None or free_accel >= self.reserve_vram_bytes:
+                        break
+        if self._free_ram_bytes() < self.reserve_ram_bytes:
+            for key in self._lru(False, keep):
+                del self.entries[key]
+                self.evictions += 1
+                gc.collect()
+                if self._free_ram_bytes() >= self.reserve_ram_bytes:
+                    break
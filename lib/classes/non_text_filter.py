@@ -1,4 +1,6 @@
 import regex as re
+import re as sre
+import threading
 import unicodedata
 
 from typing import Optional
@@ -15,6 +17,9 @@ class NonTextFilter:
     language_math_phonemes, then vocalized per-language (or via fallback) by
     math2words downstream.
     Stateless during filter(); safe to share across threads/processes.
+    Characters are classified through tables built once per process: stdlib re
+    character classes over the BMP (compiled to bitmaps) and a memo dict for the
+    astral planes, both filled from the same per-character rules.
     '''
 
     _NO_SPACE_LANGS = frozenset({'zho', 'jpn', 'kor', 'tha', 'lao', 'mya', 'khm', 'bod'})
@@ -101,6 +106,18 @@ class NonTextFilter:
     )
     _PLACEHOLDER_RE = re.compile(r'SMLZZ(\d+)ZZSML')
 
+    # character classes, bit flags of _classify()
+    _MATH_STRIP = 1     # math range char not vocalized by math2words
+    _SPECIAL    = 2     # symbol/private/unassigned/format char not kept as text
+    _NOT_TEXT   = 4     # non-space char not counted as prose by _filter_sentences()
+    _ALNUM_MARK = 8     # alnum or combining mark
+    _SPACE      = 16
+    _WORD       = re.compile(r'\S+')
+    _ASTRAL_RE  = sre.compile('[\U00010000-\U0010FFFF]')
+    _bmp_classes:Optional[dict] = None
+    _astral_flags:dict = {}
+    _tables_lock = threading.Lock()
+
     def __init__(
         self,
         alpha_ratio:float = 0.75,
@@ -124,6 +141,69 @@ class NonTextFilter:
         self.sml_pattern = sml_pattern
         self.lang        = lang
         self._no_space   = lang in self._NO_SPACE_LANGS if lang else None
+        if NonTextFilter._bmp_classes is None:
+            self._build_tables()
+
+    @classmethod
+    def _classify(cls, ch:str)->int:
+        # the reference rules, evaluated once per BMP char at build time and once per astral char met
+        o = ord(ch)
+        flags = 0
+        if ch not in cls._MATH_KEEP and any(lo <= o <= hi for lo, hi in cls._MATH_UNICODE_RANGES):
+            flags |= cls._MATH_STRIP
+        if ch.isspace():
+            return flags | cls._SPACE
+        is_mark = cls._is_mark(ch)
+        if ch.isalnum() or is_mark:
+            flags |= cls._ALNUM_MARK
+        if not (ch.isalpha() or ch.isdigit() or ch in cls._TEXT_PUNCT or is_mark):
+            flags |= cls._NOT_TEXT
+        if not (ch.isalnum() or ch in cls._TEXT_PUNCT or ch in cls._KEEP_CURRENCY or ch in cls._MATH_KEEP):
+            if unicodedata.category(ch) in cls._SPECIAL_CATEGORIES:
+                flags |= cls._SPECIAL
+        return flags
+
+    @classmethod
+    def _build_tables(cls)->None:
+        with cls._tables_lock:
+            if NonTextFilter._bmp_classes is not None:
+                return
+            members = {flag: [] for flag in (cls._MATH_STRIP, cls._SPECIAL, cls._NOT_TEXT, cls._ALNUM_MARK, cls._SPACE)}
+            for o in range(0x10000):
+                flags = cls._classify(chr(o))
+                for flag, codepoints in members.items():
+                    if flags & flag:
+                        codepoints.append(o)
+            classes = {}
+            for flag, codepoints in members.items():
+                ranges = []
+                for o in codepoints:
+                    if ranges and ranges[-1][1] == o - 1:
+                        ranges[-1][1] = o
+                    else:
+                        ranges.append([o, o])
+                body = ''.join(f'\\u{lo:04x}' if lo == hi else f'\\u{lo:04x}-\\u{hi:04x}' for lo, hi in ranges)
+                classes[flag] = sre.compile(f'[{body}]') if body else sre.compile('(?!)')
+            NonTextFilter._bmp_classes = classes
+
+    def _flags_astral(self, ch:str)->int:
+        flags = self._astral_flags.get(ch)
+        if flags is None:
+            flags = self._classify(ch)
+            self._astral_flags[ch] = flags
+        return flags
+
+    def _sub_class(self, s:str, flag:int, repl:str)->str:
+        s = self._bmp_classes[flag].sub(repl, s)
+        if self._ASTRAL_RE.search(s):
+            s = self._ASTRAL_RE.sub(lambda m: repl if self._flags_astral(m.group()) & flag else m.group(), s)
+        return s
+
+    def _count_class(self, s:str, flag:int)->int:
+        count = len(self._bmp_classes[flag].findall(s))
+        if self._ASTRAL_RE.search(s):
+            count += sum(1 for ch in self._ASTRAL_RE.findall(s) if self._flags_astral(ch) & flag)
+        return count
 
     def filter(self, text:str)->str:
         if not text:
@@ -168,31 +248,10 @@ class NonTextFilter:
         return self._PLACEHOLDER_RE.sub(lambda m: store[int(m.group(1))], text)
 
     def _strip_unicode_math(self, s:str)->str:
-        ranges = self._MATH_UNICODE_RANGES
-        keep   = self._MATH_KEEP
-        return ''.join(
-            ch for ch in s
-            if ch in keep or not any(lo <= ord(ch) <= hi for lo, hi in ranges)
-        )
+        return self._sub_class(s, self._MATH_STRIP, '')
 
     def _strip_special_chars(self, s:str)->str:
-        keep_punct    = self._TEXT_PUNCT
-        keep_currency = self._KEEP_CURRENCY
-        keep_math     = self._MATH_KEEP
-        bad_cats      = self._SPECIAL_CATEGORIES
-        out:list = []
-        for ch in s:
-            if (ch.isspace() or ch.isalnum()
-                    or ch in keep_punct
-                    or ch in keep_currency
-                    or ch in keep_math):
-                out.append(ch)
-                continue
-            if unicodedata.category(ch) in bad_cats:
-                out.append(' ')
-            else:
-                out.append(ch)
-        return ''.join(out)
+        return self._sub_class(s, self._SPECIAL, ' ')
 
     @staticmethod
     def _is_mark(ch:str)->bool:
@@ -215,7 +274,6 @@ class NonTextFilter:
 
     def _filter_sentences(self, text:str)->str:
         kept:list = []
-        punct = self._TEXT_PUNCT
         no_space = (
             self._no_space if self._no_space is not None
             else self._detect_no_space(text)
@@ -224,25 +282,26 @@ class NonTextFilter:
             s = sent.strip() if sent else ''
             if not s:
                 continue
-            non_space = [c for c in s if not c.isspace()]
+            non_space = len(s) - self._count_class(s, self._SPACE)
             if not non_space:
                 continue
-            text_chars = sum(
-                1 for c in non_space
-                if c.isalpha() or c.isdigit() or c in punct
-                or self._is_mark(c)
-            )
-            if text_chars / len(non_space) < self.alpha_ratio:
+            text_chars = non_space - self._count_class(s, self._NOT_TEXT)
+            if text_chars / non_space < self.alpha_ratio:
                 continue
             if no_space:
                 if not any(c.isalnum() for c in s):
                     continue
-                if sum(1 for c in s
-                       if c.isalnum() or self._is_mark(c)) < self.min_words * 2:
+                if self._count_class(s, self._ALNUM_MARK) < self.min_words * 2:
                     continue
             else:
-                words = [w for w in re.split(r'\s+', s) if any(c.isalnum() for c in w)]
-                if len(words) < self.min_words:
+                # stop counting words as soon as there are enough
+                words = 0
+                for w in self._WORD.finditer(s):
+                    if any(c.isalnum() for c in w.group()):
+                        words += 1
+                        if words >= self.min_words:
+                            break
+                if words < self.min_words:
                     continue
             kept.append(s)
         return ' '.join(kept)
@@ -0,0 +1,95 @@
+import os, hashlib, threading
+
+from lib.conf import ocr_cache_dir, max_ocr_cache_mb
+
+_lock = threading.Lock()
+
+class OcrCache:
+    # content addressed cache of the ocr2xhtml() output shared by all books and sessions.
+    # the key is the hash of the page image (pixmap samples, or the embedded image bytes as stored)
+    # plus the tesseract language and VERSION, to bump whenever ocr2xhtml() changes its output.
+    # entries are written atomically so concurrent OCR processes can share it. the file mtime is the LRU clock.
+
+    VERSION = 2
+
+    def __init__(self, root:str=ocr_cache_dir, max_mb:float=max_ocr_cache_mb)->None:
+        self.root = root
+        self.max_bytes = int(max_mb * (1024 ** 2))
+        self.total_bytes = None
+        if self.max_bytes > 0:
+            os.makedirs(self.root, exist_ok=True)
+
+    def key(self, image_hash:str, lang:str)->str|None:
+        if self.max_bytes <= 0:
+            return None
+        return hashlib.sha256(f'{self.VERSION}|{lang}|{image_hash}'.encode('utf-8')).hexdigest()
+
+    def _path(self, key:str)->str:
+        return os.path.join(self.root, key[:2], f'{key}.xhtml')
+
+    def get(self, key:str|None)->str|None:
+        if key is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                xhtml = f.read()
+            os.utime(path, None)
+            return xhtml
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f'OcrCache.get() error: {e}')
+            return None
+
+    def put(self, key:str|None, xhtml:str)->None:
+        if key is None or not xhtml:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(xhtml)
+            os.replace(tmp_path, path)
+            with _lock:
+                if self.total_bytes is None:
+                    self.total_bytes = self._scan_size()
+                else:
+                    self.total_bytes += os.path.getsize(path)
+                if self.total_bytes > self.max_bytes:
+                    self._evict()
+        except Exception as e:
+            print(f'OcrCache.put() error: {e}')
+
+    def _entries(self)->list[tuple[float, int, str]]:
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if not name.endswith('.xhtml'):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                    entries.append((st.st_mtime, st.st_size, path))
+                except OSError:
+                    pass
+        return entries
+
+    def _scan_size(self)->int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self)->None:
+        # drop least recently used entries down to 90% of the cap
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                pass
+        self.total_bytes = total
@@ -0,0 +1,108 @@
+import threading, unicodedata
+
+from collections import OrderedDict
+
+from lib.conf import max_romanize_cache
+
+class Romanizer:
+
+    '''Romanization of non-Latin words for Latin-script languages.
+    One converter per script, built on first use. Words are romanized in batch:
+    all Arabic or Cyrillic words of a text go through a single espeak phonemize() call.
+    Results are kept in a bounded LRU memo shared across documents and books.
+    '''
+
+    _ESPEAK_LANGS = {'arabic': 'ar', 'cyrillic': 'ru'}
+
+    def __init__(self, max_entries:int=max_romanize_cache)->None:
+        self.max_entries = max_entries
+        self.memo = OrderedDict()
+        self.kakasi = None
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def script_of(word:str)->str:
+        for ch in word:
+            if ch.isalpha():
+                name = unicodedata.name(ch, '')
+                if 'CYRILLIC' in name:
+                    return 'cyrillic'
+                if 'LATIN' in name:
+                    return 'latin'
+                if 'ARABIC' in name:
+                    return 'arabic'
+                if 'HANGUL' in name:
+                    return 'hangul'
+                if 'HIRAGANA' in name or 'KATAKANA' in name:
+                    return 'japanese'
+                if 'CJK' in name or 'IDEOGRAPH' in name:
+                    return 'chinese'
+        return 'unknown'
+
+    def _japanese(self, word:str)->str:
+        if self.kakasi is None:
+            import pykakasi
+            k = pykakasi.kakasi()
+            k.setMode('H', 'a')
+            k.setMode('K', 'a')
+            k.setMode('J', 'a')
+            k.setMode('r', 'Hepburn')
+            self.kakasi = k.getConverter()
+        return self.kakasi.do(word)
+
+    def _single(self, word:str, scr:str)->str:
+        from unidecode import unidecode
+        try:
+            if scr == 'chinese':
+                from pypinyin import pinyin, Style
+                return ''.join(x[0] for x in pinyin(word, style=Style.NORMAL))
+            if scr == 'japanese':
+                return self._japanese(word)
+            if scr in self._ESPEAK_LANGS:
+                from phonemizer import phonemize
+                return unidecode(phonemize(word, language=self._ESPEAK_LANGS[scr], backend='espeak'))
+            return unidecode(word)
+        except Exception:
+            return unidecode(word)
+
+    def _espeak_batch(self, words:list[str], scr:str)->list[str]:
+        from unidecode import unidecode
+        try:
+            from phonemizer import phonemize
+            phonemes = phonemize(words, language=self._ESPEAK_LANGS[scr], backend='espeak')
+            if len(phonemes) == len(words):
+                return [unidecode(p) for p in phonemes]
+        except Exception:
+            pass
+        return [self._single(w, scr) for w in words]
+
+    def _remember(self, word:str, roman:str)->None:
+        self.memo[word] = roman
+        if len(self.memo) > self.max_entries:
+            self.memo.popitem(last=False)
+
+    def romanize_many(self, words:list[str])->dict[str, str]:
+        # returns {word: romanization} for every word given, Latin words map to themselves
+        result = {}
+        todo = {}
+        with self.lock:
+            for word in dict.fromkeys(words):
+                roman = self.memo.get(word)
+                if roman is not None:
+                    self.memo.move_to_end(word)
+                    result[word] = roman
+                    continue
+                scr = self.script_of(word)
+                if scr == 'latin':
+                    result[word] = word
+                else:
+                    todo.setdefault(scr, []).append(word)
+            for scr, pending in todo.items():
+                if scr in self._ESPEAK_LANGS:
+                    romans = self._espeak_batch(pending, scr)
+                else:
+                    romans = [self._single(w, scr) for w in pending]
+                for word, roman in zip(pending, romans):
+                    result[word] = roman
+                    self._remember(word, roman)
+        return result
@@ -0,0 +1,139 @@
+import os, json, shutil, hashlib, threading
+
+from typing import Any
+
+from lib.conf import sentences_cache_dir, max_sentences_cache_gb, default_audio_proc_format
+from lib.conf_models import SML_TAG_PATTERN
+from lib.classes.tts_engines.common.audio import file_hash
+
+_lock = threading.Lock()
+
+class SentenceCache:
+    # content addressed cache of synthesized sentence audio shared by all books and sessions.
+    # the key covers everything that changes the audio: text, voice content, engine, model,
+    # language and the engine settings of the session. a hit is hard linked (or copied) into
+    # the block dir instead of running the inference. the file mtime is the LRU clock.
+
+    def __init__(self, session:Any, root:str=sentences_cache_dir, max_gb:float=max_sentences_cache_gb)->None:
+        self.session = session
+        self.root = root
+        self.max_bytes = int(max_gb * (1024 ** 3))
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.root, exist_ok=True)
+        self.total_bytes = self._scan_size()
+
+    def _scan_size(self)->int:
+        total = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                try:
+                    total += os.path.getsize(os.path.join(dirpath, name))
+                except OSError:
+                    pass
+        return total
+
+    def _path(self, key:str)->str:
+        return os.path.join(self.root, key[:2], f'{key}.{default_audio_proc_format}')
+
+    def key(self, sentence:str, voice:str|None)->str|None:
+        # [voice:...] tags make the audio depend on state outside the sentence itself: never cache those.
+        if self.max_bytes <= 0:
+            return None
+        if any(m.group('tag') == 'voice' for m in SML_TAG_PATTERN.finditer(sentence)):
+            return None
+        session = self.session
+        engine = session['tts_engine']
+        language = session['translate'] if session.get('translate_enabled') and session.get('translate') else session['language']
+        voice_id = (file_hash(voice) or voice) if voice else None
+        custom_model = session.get('custom_model')
+        if custom_model:
+            custom_model = os.path.basename(os.path.normpath(custom_model))
+        settings = {k: session[k] for k in session.keys() if k.startswith(f'{engine}_')}
+        payload = json.dumps({
+            "text": ' '.join(sentence.split()),
+            "voice": voice_id,
+            "engine": engine,
+            "fine_tuned": session.get('fine_tuned'),
+            "custom_model": custom_model,
+            "language": language,
+            "settings": settings
+        }, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def fetch(self, key:str|None, sentence_file:str)->bool:
+        if key is None:
+            return False
+        path = self._path(key)
+        if not os.path.exists(path):
+            self.misses += 1
+            return False
+        try:
+            self.release(sentence_file)
+            try:
+                os.link(path, sentence_file)
+            except OSError:
+                shutil.copyfile(path, sentence_file)
+            os.utime(path, None)
+            self.hits += 1
+            return True
+        except Exception as e:
+            print(f'SentenceCache.fetch() error: {e}')
+            self.misses += 1
+            return False
+
+    def store(self, key:str|None, sentence_file:str)->None:
+        if key is None or not os.path.exists(sentence_file):
+            return
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            try:
+                os.link(sentence_file, tmp_path)
+            except OSError:
+                shutil.copyfile(sentence_file, tmp_path)
+            os.replace(tmp_path, path)
+            with _lock:
+                self.total_bytes += os.path.getsize(path)
+                if self.total_bytes > self.max_bytes:
+                    self._evict()
+        except Exception as e:
+            print(f'SentenceCache.store() error: {e}')
+
+    def release(self, sentence_file:str)->None:
+        # a sentence file may be a hard link to a cache entry: unlink it before the engine writes
+        # in place, otherwise the new audio would silently overwrite the cached one too.
+        if os.path.lexists(sentence_file):
+            os.unlink(sentence_file)
+
+    def _evict(self)->None:
+        # drop least recently used entries down to 90% of the cap
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                    entries.append((st.st_mtime, st.st_size, path))
+                except OSError:
+                    pass
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                pass
+        self.total_bytes = total
+
+    def stats(self)->str:
+        lookups = self.hits + self.misses
+        rate = (self.hits / lookups * 100) if lookups else 0.0
+        return f'Sentence cache: {self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate), {self.total_bytes / (1024 ** 2):.1f}MB on disk'
@@ -0,0 +1,81 @@
+import regex as re
+
+from typing import Callable
+
+from lib.conf_lang import (
+    abbreviations_mapping, punctuation_switch, chars_remove, punctuation_split_hard_set,
+    punctuation_split_soft_set, specialchars_mapping, default_language_code
+)
+
+class TextNormalizer:
+
+    '''Per-language text normalization for the TTS.
+    All the patterns and translate tables are compiled once in __init__,
+    __call__ only runs them. Stateless after construction; safe to share across threads.
+    '''
+
+    _ACRONYM = re.compile(r'\b(?:[a-zA-Z]\.){1,}[a-zA-Z]?\b\.?')
+    _MULTI_NEWLINES = re.compile(r'(?:\r\n|\r|\n){2,}')
+    _NEWLINE = re.compile(r'\r\n|\r|\n')
+    _QUOTE_SPACES = re.compile(r'\s*"\s*')
+    _QUOTE_INSIDE = re.compile(r'(?<=[\p{L}\p{N}])"(?=[\p{L}\p{N}]|$)')
+    _SPACES = re.compile(r'\s+')
+    _OK = re.compile(r'\bok\b', flags=re.IGNORECASE)
+    _LETTER_DIGIT = re.compile(r'(?<=[\p{L}])(?=\d)|(?<=\d)(?=[\p{L}])')
+    _PUNCT_HARD = re.compile(rf"(\s*({'|'.join(map(re.escape, punctuation_split_hard_set))})\s*)+")
+    _PUNCT_SOFT = re.compile(rf"(\s*({'|'.join(map(re.escape, punctuation_split_soft_set))})\s*)+")
+
+    def __init__(self, lang:str, pause_token:str, romanize:Callable[[str, str], str]|None=None)->None:
+        self.lang = lang
+        self.pause = f' {pause_token} '
+        self.romanize = romanize
+        self.abbreviations = None
+        self.abbreviations_pattern = None
+        mapping = abbreviations_mapping.get(lang)
+        if mapping:
+            # case insensitive lookup: the first key in mapping order wins, as the former linear scan did
+            self.abbreviations = {}
+            for k, expansion in mapping.items():
+                self.abbreviations.setdefault(k.lower(), expansion)
+            # longer keys first so they win the alternation
+            keys = sorted(mapping.keys(), key=len, reverse=True)
+            self.abbreviations_pattern = re.compile(
+                r'(?<!\w)(' + '|'.join(re.escape(k) for k in keys) + r')(?!\w)',
+                flags=re.IGNORECASE
+            )
+        # punctuation switch then chars removal, folded in a single translate table
+        remove_table = str.maketrans({ch: ' ' for ch in chars_remove})
+        table = {ord(ch): ' ' for ch in chars_remove}
+        for ch in {c for k in punctuation_switch for c in k}:
+            table[ord(ch)] = punctuation_switch.get(ch, ch).translate(remove_table)
+        self.punctuation_table = table
+        specialchars = specialchars_mapping.get(lang, specialchars_mapping.get(default_language_code, specialchars_mapping['eng']))
+        self.specialchars_table = {ord(char): f' {word} ' for char, word in specialchars.items()}
+
+    def _abbreviation(self, match:re.Match)->str:
+        token = match.group(1)
+        return self.abbreviations.get(token.lower(), token)
+
+    def __call__(self, text:str)->str:
+        if self.abbreviations_pattern is not None:
+            text = self.abbreviations_pattern.sub(self._abbreviation, text)
+        # uppercase acronyms like a., c.i.a., f.d.a., m.c.
+        text = self._ACRONYM.sub(lambda m: m.group().replace('.', '').upper(), text)
+        if self.romanize is not None:
+            text = self.romanize(text, self.lang)
+        text = self._MULTI_NEWLINES.sub(self.pause, text)
+        text = self._NEWLINE.sub(' ', text)
+        # punctuations causing hallucinations and unwanted chars
+        text = text.translate(self.punctuation_table)
+        # replace double quotes by a comma if no punctuation precedes it
+        text = self._QUOTE_SPACES.sub('"', text)
+        text = self._QUOTE_INSIDE.sub(', ', text)
+        text = text.replace('"', '')
+        text = self._SPACES.sub(' ', text)
+        text = self._OK.sub('Okay', text)
+        # reduce multiple consecutive punctuations, hard then soft
+        text = self._PUNCT_HARD.sub(r'\2 ', text).strip()
+        text = self._PUNCT_SOFT.sub(r'\2 ', text).strip()
+        text = self._LETTER_DIGIT.sub(' ', text)
+        text = text.translate(self.specialchars_table)
+        return ' '.join(text.split())
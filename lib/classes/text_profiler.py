@@ -0,0 +1,85 @@
+import csv, json, threading, time
+
+from typing import Any
+
+class StageTimer:
+
+    '''Laps of one document through the text preparation.
+    lap(stage, text) closes the stage started at the previous lap: wall time,
+    size of the text it received and size of the text it produced (items for a list).
+    Does nothing when not enabled.
+    '''
+
+    def __init__(self, doc:str, text:str='', enabled:bool=True)->None:
+        self.doc = doc
+        self.enabled = enabled
+        self.rows = []
+        self.start = time.perf_counter()
+        self.size = len(text) if isinstance(text, str) else 0
+
+    def lap(self, stage:str, text:Any=None)->None:
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        size = len(text) if isinstance(text, (str, list)) else 0
+        self.rows.append({"doc": self.doc, "stage": stage, "seconds": round(now - self.start, 6), "chars_in": self.size, "chars_out": size})
+        self.start = now
+        self.size = size
+
+class TextProfiler:
+
+    '''Stage timings of the text preparation of a book, collected from the StageTimer
+    of each document (parse workers included), written as JSON and CSV next to the
+    process files and summed up per stage for the console.
+    '''
+
+    FIELDS = ['doc', 'stage', 'seconds', 'chars_in', 'chars_out']
+
+    def __init__(self)->None:
+        self.rows = []
+        self.lock = threading.Lock()
+
+    def add(self, rows:list[dict])->None:
+        with self.lock:
+            self.rows.extend(rows)
+
+    def write(self, path_noext:str)->None:
+        try:
+            with self.lock:
+                rows = list(self.rows)
+            with open(f'{path_noext}.json', 'w', encoding='utf-8') as f:
+                json.dump({"stages": self.totals(rows), "rows": rows}, f, indent=1)
+            with open(f'{path_noext}.csv', 'w', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=self.FIELDS)
+                writer.writeheader()
+                writer.writerows(rows)
+        except Exception as e:
+            print(f'TextProfiler.write() error: {e}')
+
+    def totals(self, rows:list[dict]|None=None)->list[dict]:
+        # one entry per stage in pipeline order, with the document where it was the slowest
+        if rows is None:
+            with self.lock:
+                rows = list(self.rows)
+        stages = {}
+        for row in rows:
+            st = stages.setdefault(row['stage'], {"stage": row['stage'], "calls": 0, "seconds": 0.0, "chars_in": 0, "chars_out": 0, "slowest_doc": None, "slowest_seconds": 0.0})
+            st['calls'] += 1
+            st['seconds'] += row['seconds']
+            st['chars_in'] += row['chars_in']
+            st['chars_out'] += row['chars_out']
+            if row['seconds'] >= st['slowest_seconds']:
+                st['slowest_doc'] = row['doc']
+                st['slowest_seconds'] = row['seconds']
+        return list(stages.values())
+
+    def summary(self)->str:
+        totals = self.totals()
+        grand = sum(st['seconds'] for st in totals) or 1.0
+        lines = [f"{'stage':<20} {'calls':>7} {'seconds':>10} {'%':>6} {'chars in':>12} {'chars out':>12}  slowest"]
+        for st in totals:
+            lines.append(
+                f"{st['stage']:<20} {st['calls']:>7} {st['seconds']:>10.2f} {st['seconds'] / grand * 100:>6.1f} "
+                f"{st['chars_in']:>12} {st['chars_out']:>12}  {st['slowest_doc']} ({st['slowest_seconds']:.2f}s)"
+            )
+        return '\n'.join(lines)
@@ -1,4 +1,4 @@
-import os, subprocess, shutil, json
+import os, subprocess, shutil, json, hashlib
 
 from typing import Any, Union, TYPE_CHECKING
 from lib.classes.subprocess_pipe import SubprocessPipe
@@ -130,6 +130,52 @@ def normalize_audio(input_file:str, output_file:str, samplerate:int, is_gui_proc
         print(f'normalize_audio() error: {input_file}: {e}')
         return False
 
+def concat_audio_files(filepaths:list[str], out_file:str, cancelled:Any=None)->bool:
+    # in-process concatenation: the files are decoded block by block and appended through one
+    # encoder, samples untouched (PCM read as int32 is lossless for 16/24 bit). all files must share
+    # the samplerate and channels of the first one, False otherwise so the caller can use ffmpeg.
+    import soundfile as sf
+    tmp_file = f'{out_file}.{os.getpid()}.tmp'
+    try:
+        info = sf.info(filepaths[0])
+        dtype = 'int32' if info.subtype.startswith('PCM') else 'float32'
+        fmt = os.path.splitext(out_file)[1].lstrip('.').upper()
+        with sf.SoundFile(tmp_file, 'w', samplerate=info.samplerate, channels=info.channels, format=fmt, subtype=info.subtype) as out:
+            for path in filepaths:
+                if cancelled is not None and cancelled():
+                    raise InterruptedError('cancelled')
+                with sf.SoundFile(path) as f:
+                    if f.samplerate != info.samplerate or f.channels != info.channels:
+                        raise ValueError(f'{path}: {f.samplerate}Hz/{f.channels}ch, expected {info.samplerate}Hz/{info.channels}ch')
+                    for block in f.blocks(blocksize=1 << 16, dtype=dtype, always_2d=True):
+                        out.write(block)
+        os.replace(tmp_file, out_file)
+        return True
+    except Exception as e:
+        print(f'concat_audio_files() error: {out_file}: {e}')
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        return False
+
+_file_hash_cache:dict[tuple, str] = {}
+
+def file_hash(filepath:str)->str|None:
+    # sha256 of the file content, memoized on (path, size, mtime) so a voice file is read once per process
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    cache_key = (os.path.realpath(filepath), st.st_size, st.st_mtime_ns)
+    digest = _file_hash_cache.get(cache_key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+        digest = h.hexdigest()
+        _file_hash_cache[cache_key] = digest
+    return digest
+
 def is_audio_data_valid(audio_data:Any)->bool:
     if audio_data is None:
         return False
@@ -0,0 +1,84 @@
+import os, hashlib, tempfile, threading
+
+from typing import Any
+
+from lib.conf import latents_dir, max_latents_cache
+from lib.classes.tts_engines.common.audio import file_hash
+
+_lock = threading.Lock()
+
+class LatentStore:
+    # content addressed store of xtts speaker conditioning latents.
+    # one file per (voice content, model checkpoint) so it survives sessions, books and restarts.
+    # the file mtime is the LRU clock: it is refreshed on every hit and the oldest files are evicted.
+
+    def __init__(self, root:str=latents_dir, max_entries:int=max_latents_cache)->None:
+        self.root = root
+        self.max_entries = max_entries
+        os.makedirs(self.root, exist_ok=True)
+
+    def key(self, voice_path:str|None, model_id:str)->str|None:
+        if not voice_path:
+            return None
+        voice_hash = file_hash(voice_path)
+        if voice_hash is None:
+            return None
+        return hashlib.sha256(f'{model_id}|{voice_hash}'.encode('utf-8')).hexdigest()
+
+    def _path(self, key:str)->str:
+        return os.path.join(self.root, f'{key}.pt')
+
+    def get(self, key:str|None)->tuple|None:
+        if key is None:
+            return None
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            import torch
+            data = torch.load(path, map_location='cpu', weights_only=True)
+            os.utime(path, None)
+            return data['gpt_cond_latent'], data['speaker_embedding']
+        except Exception as e:
+            print(f'LatentStore.get() error: {e}, dropping {path}')
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            return None
+
+    def put(self, key:str|None, gpt_cond_latent:Any, speaker_embedding:Any)->None:
+        if key is None:
+            return
+        try:
+            import torch
+            with _lock:
+                fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+                os.close(fd)
+                torch.save({
+                    'gpt_cond_latent': gpt_cond_latent.detach().cpu(),
+                    'speaker_embedding': speaker_embedding.detach().cpu()
+                }, tmp_path)
+                os.replace(tmp_path, self._path(key))
+                self._evict()
+        except Exception as e:
+            print(f'LatentStore.put() error: {e}')
+
+    def _evict(self)->None:
+        entries = []
+        for name in os.listdir(self.root):
+            if not name.endswith('.pt'):
+                continue
+            path = os.path.join(self.root, name)
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        for _, path in entries[:len(entries) - self.max_entries]:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
@@ -0,0 +1,95 @@
+import os, json, tempfile, threading
+
+from lib.conf import models_manifest
+from lib.classes.tts_engines.common.audio import file_hash
+
+_lock = threading.Lock()
+
+class ModelManifest:
+    # local index of the hub files already downloaded: (cache_dir, repo, filename) -> path, size, mtime, sha256.
+    # a hit is returned without any hub call. the content hash is only recomputed when the size or
+    # mtime of the file changed. on a mismatch the local hub cache holds the same corrupted blob,
+    # so the file is downloaded again with force_download before it is recorded.
+
+    def __init__(self, path:str=models_manifest)->None:
+        self.path = path
+        self.entries = self._read()
+
+    def _read(self)->dict:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self)->None:
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # merge with what other processes recorded meanwhile
+            entries = self._read()
+            entries.update(self.entries)
+            self.entries = entries
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, indent=1)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f'ModelManifest._write() error: {e}')
+
+    def _key(self, repo_id:str, filename:str, cache_dir:str|None)->str:
+        return f'{os.path.abspath(cache_dir) if cache_dir else ""}|{repo_id}|{filename}'
+
+    def _lookup(self, repo_id:str, filename:str, cache_dir:str|None)->tuple[str|None, bool]:
+        # (path, mismatch): mismatch is True when the recorded file no longer has its recorded content
+        with _lock:
+            entry = self.entries.get(self._key(repo_id, filename, cache_dir))
+            if not entry:
+                return None, False
+            path = entry.get('path')
+            try:
+                st = os.stat(path)
+            except (OSError, TypeError):
+                return None, False
+            if st.st_size == entry.get('size') and st.st_mtime_ns == entry.get('mtime_ns'):
+                return path, False
+            if file_hash(path) != entry.get('sha256'):
+                return None, True
+            entry['size'] = st.st_size
+            entry['mtime_ns'] = st.st_mtime_ns
+            self._write()
+            return path, False
+
+    def lookup(self, repo_id:str, filename:str, cache_dir:str|None=None)->str|None:
+        return self._lookup(repo_id, filename, cache_dir)[0]
+
+    def record(self, repo_id:str, filename:str, cache_dir:str|None, path:str)->None:
+        with _lock:
+            try:
+                st = os.stat(path)
+            except OSError:
+                return
+            self.entries[self._key(repo_id, filename, cache_dir)] = {
+                "path": os.path.realpath(path),
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "sha256": file_hash(path)
+            }
+            self._write()
+
+    def resolve(self, repo_id:str, filename:str, cache_dir:str|None=None)->str:
+        # manifest first, then the local hub cache, then the hub itself
+        path, mismatch = self._lookup(repo_id, filename, cache_dir)
+        if path:
+            return path
+        from huggingface_hub import hf_hub_download, try_to_load_from_cache
+        if mismatch:
+            msg = f'{repo_id}/{filename} does not match its recorded hash, downloading it again…'
+            print(msg)
+            path = hf_hub_download(repo_id=repo_id, filename=filename, cache_dir=cache_dir, force_download=True)
+        else:
+            path = try_to_load_from_cache(repo_id=repo_id, filename=filename, cache_dir=cache_dir)
+            if not isinstance(path, str) or not os.path.exists(path):
+                path = hf_hub_download(repo_id=repo_id, filename=filename, cache_dir=cache_dir)
+        self.record(repo_id, filename, cache_dir, path)
+        return path
@@ -1,4 +1,4 @@
-import os, sys, threading, gc, ctypes, tempfile, regex as re
+import os, sys, time, hashlib, threading, gc, ctypes, tempfile, regex as re
 
 from typing import Any, TYPE_CHECKING
 from cryptography.fernet import Fernet
@@ -6,6 +6,9 @@ from pathlib import Path
 
 from lib.classes.vram_detector import VRAMDetector
 from lib.classes.tts_engines.common.audio import normalize_audio, get_audiolist_duration, is_audio_data_valid
+from lib.classes.tts_engines.common.latent_store import LatentStore
+from lib.classes.duration_manifest import DurationManifest
+from lib.classes.tts_engines.common.model_manifest import ModelManifest
 from lib import *
 
 os.environ['HF_TOKEN'] = Fernet(fernet_key.encode('utf-8')).decrypt(fernet_data).decode('utf-8')
@@ -61,7 +64,10 @@ def build_vtt_file(session:dict, vtt_path:str=None, block_indices:set=None)->tup
             progress_bar = gr.Progress(track_tqdm=False)
         msg = 'Get duration of each sentence…'
         print(msg)
-        durations = get_audiolist_duration([str(p) for p in audio_files])
+        if session.get('blocks_current_db'):
+            durations = DurationManifest(session['blocks_current_db']).durations([str(p) for p in audio_files])
+        else:
+            durations = get_audiolist_duration([str(p) for p in audio_files])
         msg = 'Create VTT blocks…'
         print(msg)
         with tqdm(total=audio_files_length, unit='files') as t:
@@ -144,6 +150,57 @@ class TTSUtils:
             error = f'_try_dml(): DirectML GPU path unavailable ({e!r}); ONNX will run on CPU.'
             print(error)
 
+    def _move_to_device(self, targets:list, device:str)->None:
+        # one recursive .to() per weight-bearing module. the per-parameter re-registration walk
+        # is only kept as a fallback for the rare tensors a module .to() leaves behind.
+        import torch
+        import torch.nn as nn
+        target_dev = torch.device(device)
+        for tgt in targets:
+            tgt.to(device)
+            tgt.eval()
+            stray = [m for _, m in tgt.named_modules()
+                if any(p.device != target_dev for p in m.parameters(recurse=False))
+                or any(b.device != target_dev for b in m.buffers(recurse=False))]
+            for m in stray:
+                for pname, p in list(m.named_parameters(recurse=False)):
+                    if p.device != target_dev:
+                        with torch.no_grad():
+                            new_p = nn.Parameter(p.data.to(device), requires_grad=p.requires_grad)
+                        setattr(m, pname, new_p)
+                for bname, b in list(m.named_buffers(recurse=False)):
+                    if b.device != target_dev:
+                        persistent = bname not in m._non_persistent_buffers_set
+                        m.register_buffer(bname, b.to(device), persistent=persistent)
+
+    def _fast_checkpoint(self, engine:Any, checkpoint_path:str)->str|None:
+        # converts a .pth checkpoint once into a memory-mappable safetensors file kept in models/tts.
+        # the file name follows the source path, size and mtime so a replaced checkpoint is converted again.
+        if not fast_model_load:
+            return None
+        try:
+            from safetensors.torch import save_file
+            st = os.stat(checkpoint_path)
+            src_id = hashlib.sha256(f'{os.path.realpath(checkpoint_path)}|{st.st_size}|{st.st_mtime_ns}'.encode('utf-8')).hexdigest()[:24]
+            st_path = os.path.join(safetensors_dir, f'{Path(checkpoint_path).stem}-{src_id}.safetensors')
+            if os.path.exists(st_path):
+                return st_path
+            msg = f'Converting {checkpoint_path} to safetensors for faster next loads…'
+            print(msg)
+            state_dict = engine.get_compatible_checkpoint_state_dict(checkpoint_path)
+            # safetensors refuses tensors sharing storage: give each its own contiguous copy
+            state_dict = {k: v.detach().contiguous().clone() for k, v in state_dict.items()}
+            os.makedirs(safetensors_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=safetensors_dir, suffix='.tmp')
+            os.close(fd)
+            save_file(state_dict, tmp_path)
+            os.replace(tmp_path, st_path)
+            return st_path
+        except Exception as e:
+            error = f'_fast_checkpoint() error: {e}, falling back to torch.load'
+            print(error)
+            return None
+
     def _model_size_bytes(self, model:Any)->int:
         total = 0
         try:
@@ -168,13 +225,26 @@ class TTSUtils:
         gb = total_bytes / (1024 ** 3)
         return round(gb, 2)
 
+    def _get_batch_size(self, batch_size_max:int, item_vram_gb:float)->int:
+        # number of sentences that fit in one batched pass according to the free VRAM left
+        # once the model is loaded. CPU always runs one sentence at a time.
+        if self.session['device'] == devices['CPU']['proc'] or batch_size_max <= 1:
+            return 1
+        try:
+            vram_dict = VRAMDetector().detect_vram(self.session['device'], self.session['script_mode'])
+            free_vram_gb = float(vram_dict.get('free_vram_gb', 0))
+        except Exception:
+            return 1
+        if item_vram_gb <= 0:
+            return batch_size_max
+        return max(1, min(batch_size_max, int(free_vram_gb / item_vram_gb)))
+
     def _load_xtts_builtin_list(self)->dict:
         try:
             import torch
-            from huggingface_hub import hf_hub_download
             if len(xtts_builtin_speakers_list) > 0:
                 return xtts_builtin_speakers_list
-            speakers_path = hf_hub_download(repo_id=default_engine_settings[TTS_ENGINES['XTTS']]['repo'], filename='speakers_xtts.pth', cache_dir=tts_dir)
+            speakers_path = self._hub_file(default_engine_settings[TTS_ENGINES['XTTS']]['repo'], 'speakers_xtts.pth', tts_dir)
             loaded = torch.load(speakers_path, weights_only=False)
             if not isinstance(loaded, dict):
                 error = f'Invalid XTTS speakers format: {type(loaded)}'
@@ -289,36 +359,30 @@ class TTSUtils:
             with _lock:
                 from TTS.api import TTS as TTSEngine
                 import torch
-                import torch.nn as nn
                 engine = loaded_tts.get(key)
                 target_dev = torch.device(device)
                 is_accel = target_dev.type != 'cpu'
+                load_start = time.monotonic()
+                load_time = None
                 if not engine:
                     engine = TTSEngine(model_path).to(device)
+                    load_time = time.monotonic() - load_start
                 if not engine:
                     raise RuntimeError('TTSEngine returned None')
+                targets = []
                 for syn_attr in ('synthesizer', 'voice_converter'):
                     syn = getattr(engine, syn_attr, None)
                     if syn is None:
                         continue
                     syn.use_cuda = is_accel
-                    for _, m in syn.named_modules():
-                        m.to(device)
-                        m.eval()
-                        for pname, p in list(m.named_parameters(recurse=False)):
-                            if p.device != target_dev:
-                                with torch.no_grad():
-                                    new_p = nn.Parameter(p.data.to(device), requires_grad=p.requires_grad)
-                                setattr(m, pname, new_p)
-                        for bname, b in list(m.named_buffers(recurse=False)):
-                            if b.device != target_dev:
-                                persistent = bname not in m._non_persistent_buffers_set
-                                m.register_buffer(bname, b.to(device), persistent=persistent)
+                    targets.append(syn)
+                self._move_to_device(targets, device)
+                if load_time is not None:
+                    msg = f'{key} loaded in {load_time:.1f}s, on {device} in {time.monotonic() - load_start:.1f}s'
+                    print(msg)
+                loaded_tts.add(key, engine, load_time=load_time)
                 vram_dict = VRAMDetector().detect_vram(self.session['device'], self.session['script_mode'])
                 self.session['free_vram_gb'] = vram_dict.get('free_vram_gb', 0)
-                models_loaded_size_gb = self._loaded_tts_size_gb(loaded_tts)
-                if self.session['free_vram_gb'] > models_loaded_size_gb:
-                    loaded_tts[key] = engine
                 return engine
         except Exception as e:
             error = f'_load_api() error: {e}'
@@ -334,6 +398,7 @@ class TTSUtils:
                 checkpoint_path = kwargs.get('checkpoint_path')
                 config_path = kwargs.get('config_path', None)
                 vocab_path = kwargs.get('vocab_path', None)
+                load_start = time.monotonic()
                 if engine_name == TTS_ENGINES['PIPER']:
                     from piper import PiperVoice
                     from piper.download_voices import download_voice
@@ -352,6 +417,7 @@ class TTSUtils:
                     engine = loaded_tts.get(key, False)
                     target_dev = torch.device(device)
                     is_accel = target_dev.type != 'cpu'
+                    load_time = None
                     if not engine:
                         if not checkpoint_path or not os.path.exists(checkpoint_path):
                             error = f'Missing or invalid checkpoint_path: {checkpoint_path}'
@@ -366,12 +432,21 @@ class TTSUtils:
                             config.models_dir = os.path.join('models','tts')
                             config.load_json(config_path)
                             engine = Xtts.init_from_config(config)
-                            engine.load_checkpoint(
-                                config,
-                                checkpoint_path = checkpoint_path,
-                                vocab_path = vocab_path,
-                                eval = True
-                            )
+                            st_path = self._fast_checkpoint(engine, checkpoint_path)
+                            if st_path:
+                                # same filtered state dict as the .pth one, read from the mmap'ed safetensors file
+                                from safetensors.torch import load_file
+                                engine.get_compatible_checkpoint_state_dict = lambda _path: load_file(st_path)
+                            try:
+                                engine.load_checkpoint(
+                                    config,
+                                    checkpoint_path = checkpoint_path,
+                                    vocab_path = vocab_path,
+                                    eval = True
+                                )
+                            finally:
+                                if st_path:
+                                    del engine.get_compatible_checkpoint_state_dict
                         elif engine_name == TTS_ENGINES['VITS']:
                             from TTS.api import TTS as TTSEngine
                             engine = TTSEngine(model_path=checkpoint_path, config_path=config_path, progress_bar=False)
@@ -397,37 +472,23 @@ class TTSUtils:
                         else:
                             error = f'_load_checkpoint(): unsupported tts_engine {engine_name}'
                             raise ValueError(error)
+                        load_time = time.monotonic() - load_start
                     if engine:
-                        engine.to(device)
-                        engine.eval()
-                        ## Walk the actual weight-bearing module(s).
                         ## XTTS / fairseq shim: engine itself is an nn.Module that owns the params.
                         ## VITS via TTS API: weights live inside engine.synthesizer (TTS class doesn't register it as a submodule).
-                        walk_targets = []
                         syn = getattr(engine, 'synthesizer', None)
                         if syn is not None:
                             syn.use_cuda = is_accel
-                            walk_targets.append(syn)
+                            engine.to(device)
+                            self._move_to_device([syn], device)
                         else:
-                            walk_targets.append(engine)
-                        for tgt in walk_targets:
-                            for _, m in tgt.named_modules():
-                                m.to(device)
-                                m.eval()
-                                for pname, p in list(m.named_parameters(recurse=False)):
-                                    if p.device != target_dev:
-                                        with torch.no_grad():
-                                            new_p = nn.Parameter(p.data.to(device), requires_grad=p.requires_grad)
-                                        setattr(m, pname, new_p)
-                                for bname, b in list(m.named_buffers(recurse=False)):
-                                    if b.device != target_dev:
-                                        persistent = bname not in m._non_persistent_buffers_set
-                                        m.register_buffer(bname, b.to(device), persistent=persistent)
+                            self._move_to_device([engine], device)
+                        if load_time is not None:
+                            msg = f'{key} loaded in {load_time:.1f}s, on {device} in {time.monotonic() - load_start:.1f}s'
+                            print(msg)
+                        loaded_tts.add(key, engine, load_time=load_time)
                     vram_dict = VRAMDetector().detect_vram(self.session['device'], self.session['script_mode'])
                     self.session['free_vram_gb'] = vram_dict.get('free_vram_gb', 0)
-                    models_loaded_size_gb = self._loaded_tts_size_gb(loaded_tts)
-                    if self.session['free_vram_gb'] > models_loaded_size_gb:
-                        loaded_tts[key] = engine
                 return engine
         except Exception as e:
             error = f'_load_checkpoint() error: {e}'
@@ -450,6 +511,24 @@ class TTSUtils:
             error = f'_load_engine_zs() error: {e}'
             raise ValueError(error)
 
+    def _hub_file(self, repo_id:str, filename:str, cache_dir:str|None=None)->str:
+        # local path of a hub file, without any network round-trip when it is already downloaded
+        if getattr(self, 'model_manifest', None) is None:
+            self.model_manifest = ModelManifest()
+        return self.model_manifest.resolve(repo_id, filename, cache_dir)
+
+    def _get_conditioning_latents(self, engine:Any, voice_path:str, model_id:str)->tuple:
+        # xtts speaker latents only depend on the voice content and the checkpoint: look them up in the
+        # persistent store before running get_conditioning_latents() on the reference wav.
+        if getattr(self, 'latent_store', None) is None:
+            self.latent_store = LatentStore()
+        store_key = self.latent_store.key(voice_path, model_id)
+        latents = self.latent_store.get(store_key)
+        if latents is None:
+            latents = engine.get_conditioning_latents(audio_path=[voice_path], load_sr=24000, sound_norm_refs=True)
+            self.latent_store.put(store_key, *latents)
+        return latents
+
     def _check_xtts_builtin_speakers(self, current_voice:str, speaker:str)->str|bool:
         new_current_voice = ''
         proc_current_voice = ''
@@ -457,7 +536,6 @@ class TTSUtils:
             import torch
             import torchaudio
             import numpy as np
-            from huggingface_hub import hf_hub_download
             voice_parts = Path(current_voice).parts
             if (self.language in voice_parts or speaker in default_engine_settings[TTS_ENGINES['BARK']]['voices'] or self.language == 'eng'):
                 if os.path.exists(current_voice):
@@ -477,19 +555,19 @@ class TTSUtils:
                         self.session['free_vram_gb'] = vram_dict.get('free_vram_gb', 0)
                         models_loaded_size_gb = self._loaded_tts_size_gb(loaded_tts)
                         if self.session['free_vram_gb'] <= models_loaded_size_gb:
-                            del loaded_tts[self.tts_key]
+                            loaded_tts.offload(self.tts_key)
                         hf_repo = default_engine_settings[xtts]['repo']
                         hf_sub = ''
-                        config_path = hf_hub_download(repo_id=hf_repo, filename=f"{hf_sub}{default_engine_settings[xtts]['files'][0]}", cache_dir=self.cache_dir)
-                        checkpoint_path = hf_hub_download(repo_id=hf_repo, filename=f"{hf_sub}{default_engine_settings[xtts]['files'][1]}", cache_dir=self.cache_dir)
-                        vocab_path = hf_hub_download(repo_id=hf_repo, filename=f"{hf_sub}{default_engine_settings[xtts]['files'][2]}", cache_dir=self.cache_dir)
+                        config_path = self._hub_file(hf_repo, f"{hf_sub}{default_engine_settings[xtts]['files'][0]}", self.cache_dir)
+                        checkpoint_path = self._hub_file(hf_repo, f"{hf_sub}{default_engine_settings[xtts]['files'][1]}", self.cache_dir)
+                        vocab_path = self._hub_file(hf_repo, f"{hf_sub}{default_engine_settings[xtts]['files'][2]}", self.cache_dir)
                         engine = self._load_checkpoint(tts_engine=xtts, key=key, checkpoint_path=checkpoint_path, config_path=config_path, vocab_path=vocab_path)
                     if engine:
                         device = devices['CUDA']['proc'] if self.session['device'] in [devices['CUDA']['proc'], devices['ROCM']['proc'], devices['JETSON']['proc']] else self.session['device']
                         if speaker in default_engine_settings[xtts]['voices'].keys():
                             gpt_cond_latent, speaker_embedding = self.xtts_speakers[default_engine_settings[xtts]['voices'][speaker]].values()
                         else:
-                            gpt_cond_latent, speaker_embedding = engine.get_conditioning_latents(audio_path=[current_voice], load_sr=24000, sound_norm_refs=True)
+                            gpt_cond_latent, speaker_embedding = self._get_conditioning_latents(engine, current_voice, key)
                         fine_tuned_params = {
                             key.removeprefix('xtts_'): cast_type(self.session[key])
                             for key, cast_type in {
@@ -508,7 +586,7 @@ class TTSUtils:
                             }.items()
                             if self.session.get(key) is not None
                         }
-                        engine.to(device)
+                        loaded_tts.move(key, device)
                         with torch.no_grad():
                             with torch.autocast(device, dtype=self.amp_dtype, enabled=(self.amp_dtype != torch.float32)):
                                 result = engine.inference(
@@ -518,7 +596,7 @@ class TTSUtils:
                                     speaker_embedding=speaker_embedding,
                                     **fine_tuned_params,
                                 )
-                        engine.to(devices['CPU']['proc'])
+                        loaded_tts.offload(key)
                         audio_sentence = result.get('wav')
                         if torch.is_tensor(audio_sentence):
                             audio_sentence = audio_sentence.detach().cpu()
@@ -745,6 +823,9 @@ class TTSUtils:
                 except OSError:
                     pass
             raise RuntimeError(f'audio_save({path}): {e}') from e
+        db_path = self.session.get('blocks_current_db')
+        if db_path:
+            DurationManifest(db_path).record(path, audio_np.shape[0], samplerate)
         return True
 
     def log_exception(self,where:str, e:Exception)->str:
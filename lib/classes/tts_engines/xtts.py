@@ -68,7 +68,6 @@ class XTTS(TTSUtils, TTSRegistry, name='xtts'):
 
     def load_engine(self)->Any:
         try:
-            from huggingface_hub import hf_hub_download
             msg = f'Loading TTS {self.tts_key} model, it takes a while, please be patient…'
             print(msg)
             self.cleanup_memory()
@@ -92,12 +91,12 @@ class XTTS(TTSUtils, TTSRegistry, name='xtts'):
                         if self.session['fine_tuned'] == 'internal':
                             hf_sub = ''
                             if self.speakers_path is None:
-                                self.speakers_path = hf_hub_download(repo_id=hf_repo, filename='speakers_xtts.pth', cache_dir=self.cache_dir)
+                                self.speakers_path = self._hub_file(hf_repo, 'speakers_xtts.pth', self.cache_dir)
                         else:
                             hf_sub = self.models[self.session['fine_tuned']]['sub']
-                        config_path = hf_hub_download(repo_id=hf_repo, filename=f'{hf_sub}{self.models[self.session["fine_tuned"]]["files"][0]}', cache_dir=self.cache_dir)
-                        checkpoint_path = hf_hub_download(repo_id=hf_repo, filename=f'{hf_sub}{self.models[self.session["fine_tuned"]]["files"][1]}', cache_dir=self.cache_dir)
-                        vocab_path = hf_hub_download(repo_id=hf_repo, filename=f'{hf_sub}{self.models[self.session["fine_tuned"]]["files"][2]}', cache_dir=self.cache_dir)
+                        config_path = self._hub_file(hf_repo, f'{hf_sub}{self.models[self.session["fine_tuned"]]["files"][0]}', self.cache_dir)
+                        checkpoint_path = self._hub_file(hf_repo, f'{hf_sub}{self.models[self.session["fine_tuned"]]["files"][1]}', self.cache_dir)
+                        vocab_path = self._hub_file(hf_repo, f'{hf_sub}{self.models[self.session["fine_tuned"]]["files"][2]}', self.cache_dir)
                         engine = self._load_checkpoint(tts_engine=self.session['tts_engine'], key=self.tts_key, checkpoint_path=checkpoint_path, config_path=config_path, vocab_path=vocab_path, device=self.device)
                     except Exception as e:
                         error = f'load_engine(): HuggingFace checkpoint loading failed: {e}'
@@ -115,8 +114,6 @@ class XTTS(TTSUtils, TTSRegistry, name='xtts'):
     def convert(self, sentence_file:str, sentence:str, **kwargs)->tuple:
         try:
             import torch
-            import numpy as np
-            from lib.classes.tts_engines.common.audio import trim_audio, is_audio_data_valid
             if self.engine:
                 sentence_parts = self._split_sentence_on_sml(sentence)
                 self.params['block_voice'] = kwargs.get('block_voice', self.session['voice'])
@@ -139,20 +136,10 @@ class XTTS(TTSUtils, TTSRegistry, name='xtts'):
                     if not any(c.isalnum() for c in part):
                         continue
                     else:
-                        trim_audio_buffer = 0.006
                         if part.endswith("'"):
                             part = part[:-1]
                         part = part.replace('.', ' ;\n')
-                        if self.params['current_voice'] is not None and self.params['current_voice'] in self.params['latent_embedding'].keys():
-                            self.params['gpt_cond_latent'], self.params['speaker_embedding'] = self.params['latent_embedding'][self.params['current_voice']]
-                        else:
-                            msg = 'Computing speaker latents…'
-                            print(msg)
-                            if self.speaker in default_engine_settings[TTS_ENGINES['XTTS']]['voices'].keys():
-                                self.params['gpt_cond_latent'], self.params['speaker_embedding'] = self.xtts_speakers[default_engine_settings[TTS_ENGINES['XTTS']]['voices'][self.speaker]].values()
-                            else:
-                                self.params['gpt_cond_latent'], self.params['speaker_embedding'] = self.engine.get_conditioning_latents(audio_path=[self.params['current_voice']], load_sr=24000, sound_norm_refs=True)
-                            self.params['latent_embedding'][self.params['current_voice']] = self.params['gpt_cond_latent'], self.params['speaker_embedding']
+                        self.params['gpt_cond_latent'], self.params['speaker_embedding'] = self._get_latents(self.params['current_voice'])
                         result = False
                         try:
                             with torch.inference_mode():
@@ -165,26 +152,10 @@ class XTTS(TTSUtils, TTSRegistry, name='xtts'):
                                         **self.fine_tuned_params
                                     )
                             if result:
-                                audio_part = result.get('wav')
-                                if audio_part is not None and len(audio_part) > 0:
-                                    if torch.is_tensor(audio_part):
-                                        audio_part = audio_part.detach().cpu()
-                                    if not is_audio_data_valid(audio_part):
-                                        error = 'audio_part not valid'
-                                        return False, error
-                                    part_tensor = self._tensor_type(audio_part).unsqueeze(0)
-                                    if part_tensor.numel() == 0:
-                                        error = 'part_tensor not valid'
-                                        return False, error
-                                    if part[-1].isalnum() or part[-1] == '—':
-                                        part_tensor = trim_audio(part_tensor.squeeze(), self.params['samplerate'], 0.001, trim_audio_buffer).unsqueeze(0)
-                                    self.audio_segments.append(part_tensor)
-                                    if not re.search(r'\w$', part, flags=re.UNICODE) and part[-1] != '—':
-                                        silence_time = int(np.random.uniform(0.3, 0.6) * 100) / 100
-                                        self.audio_segments.append(torch.zeros(1, int(self.params['samplerate'] * silence_time)))
-                                else:
-                                    error = 'audio_part not valid'
+                                segments, error = self._part_segments(part, result.get('wav'))
+                                if segments is None:
                                     return False, error
+                                self.audio_segments.extend(segments)
                             else:
                                 error = 'audio_part not valid'
                                 return False, error
@@ -211,6 +182,187 @@ class XTTS(TTSUtils, TTSRegistry, name='xtts'):
             self.audio_segments = []
             return False, self.log_exception(f'{self.__class__.__name__}.convert()',e)
 
+    def get_batch_size(self)->int:
+        # beam search and xtts text splitting change the shape of the generation, keep them sequential
+        if self.fine_tuned_params.get('num_beams', 1) > 1 or self.fine_tuned_params.get('enable_text_splitting'):
+            return 1
+        xtts_settings = default_engine_settings[TTS_ENGINES['XTTS']]
+        return self._get_batch_size(xtts_settings['batch_size_max'], xtts_settings['batch_item_vram_gb'])
+
+    def convert_batch(self, batch:list[tuple[str, str]], **kwargs)->tuple:
+        # batch: [(sentence_file, sentence), ...] sharing the same block voice.
+        # sentences carrying SML tags or an open inline voice need the sequential state machine of convert().
+        def _convert_sequential()->tuple:
+            for sentence_file, sentence in batch:
+                success, error = self.convert(sentence_file, sentence, **kwargs)
+                if not success:
+                    return False, error
+            return True, None
+
+        try:
+            import torch
+            if not self.engine:
+                error = f"TTS engine {self.session['tts_engine']} failed to load!"
+                return False, error
+            if len(batch) < 2 or self.params.get('inline_voice') or any(SML_TAG_PATTERN.search(sentence) for _, sentence in batch):
+                return _convert_sequential()
+            self.params['block_voice'] = kwargs.get('block_voice', self.session['voice'])
+            self.params['current_voice'], error = self._set_voice(self.params['block_voice'])
+            if self.params['current_voice'] is None and error is not None:
+                return False, error
+            self.params['gpt_cond_latent'], self.params['speaker_embedding'] = self._get_latents(self.params['current_voice'])
+            items = []
+            for sentence_file, sentence in batch:
+                part = sentence.strip()
+                if not any(c.isalnum() for c in part):
+                    continue
+                if part.endswith("'"):
+                    part = part[:-1]
+                items.append((sentence_file, part.replace('.', ' ;\n')))
+            if not items:
+                return True, None
+            try:
+                with torch.inference_mode():
+                    with torch.autocast(self.device, dtype=self.amp_dtype, enabled=(self.amp_dtype != torch.float32)):
+                        wavs = self._inference_batch([part for _, part in items])
+            except Exception as e:
+                # most likely an OOM on a long batch: free what we can and let convert() do the job
+                print(f'{self.__class__.__name__}.convert_batch() falling back to sequential synthesis: {e}')
+                self.cleanup_memory()
+                return _convert_sequential()
+            if wavs is None:
+                return _convert_sequential()
+            for (sentence_file, part), wav in zip(items, wavs):
+                segments, error = self._part_segments(part, wav)
+                if segments is None:
+                    return False, error
+                segment_tensor = torch.cat(segments, dim=-1)
+                if not self.audio_save(sentence_file, segment_tensor, self.params['samplerate']):
+                    error = f'audio_save() error: cannot save {sentence_file}'
+                    return False, error
+                if not os.path.exists(sentence_file):
+                    error = f'Cannot create {sentence_file}'
+                    return False, error
+            return True, None
+        except Exception as e:
+            self.cleanup_memory()
+            return False, self.log_exception(f'{self.__class__.__name__}.convert_batch()', e)
+
+    def _inference_batch(self, texts:list[str])->list|None:
+        # batched equivalent of Xtts.inference(): one GPT generate() over the padded text batch,
+        # one GPT latent pass and one HiFiGAN pass, then each waveform is cut back to its own length.
+        # text is right padded with stop_text_token like the GPT training loop does.
+        # returns None when a text is too long to be batched.
+        import torch
+        import torch.nn.functional as F
+        model = self.engine
+        gpt = model.gpt
+        language = self.language_iso1.split('-')[0]
+        tokens = [torch.IntTensor(model.tokenizer.encode(text.strip().lower(), lang=language)) for text in texts]
+        if any(t.shape[-1] >= model.args.gpt_max_text_tokens for t in tokens):
+            return None
+        batch_len = len(tokens)
+        text_tokens = torch.nn.utils.rnn.pad_sequence(tokens, batch_first=True, padding_value=gpt.stop_text_token).to(model.device)
+        text_lens = torch.tensor([t.shape[-1] for t in tokens], device=model.device)
+        cond_latents = self.params['gpt_cond_latent'].to(model.device).expand(batch_len, -1, -1)
+        speaker_embedding = self.params['speaker_embedding'].to(model.device)
+        generate_kwargs = {
+            key: value for key, value in self.fine_tuned_params.items()
+            if key in ('temperature', 'length_penalty', 'repetition_penalty', 'top_k', 'top_p')
+        }
+        gpt_codes = gpt.generate(
+            cond_latents=cond_latents,
+            text_inputs=text_tokens,
+            input_tokens=None,
+            do_sample=True,
+            num_return_sequences=1,
+            num_beams=1,
+            output_attentions=False,
+            **generate_kwargs
+        )
+        # each row ends at its first stop token (kept, as in the single inference), the rest is padding
+        code_lens = []
+        for row in gpt_codes:
+            stops = (row == gpt.stop_audio_token).nonzero(as_tuple=True)[0]
+            code_lens.append(int(stops[0]) + 1 if stops.numel() > 0 else row.shape[-1])
+        wav_lens = torch.tensor([length * gpt.code_stride_len for length in code_lens], device=model.device)
+        gpt_latents = gpt(
+            text_tokens,
+            text_lens,
+            gpt_codes,
+            wav_lens,
+            cond_latents=cond_latents,
+            return_attentions=False,
+            return_latent=True
+        )
+        length_scale = 1.0 / max(self.fine_tuned_params.get('speed', 1.0), 0.05)
+        latents = []
+        for i, length in enumerate(code_lens):
+            latent = gpt_latents[i:i + 1, :length]
+            if length_scale != 1.0:
+                latent = F.interpolate(latent.transpose(1, 2), scale_factor=length_scale, mode='linear').transpose(1, 2)
+            latents.append(latent.squeeze(0))
+        latent_lens = [latent.shape[0] for latent in latents]
+        latents_padded = torch.nn.utils.rnn.pad_sequence(latents, batch_first=True)
+        wavs_padded = model.hifigan_decoder(latents_padded, g=speaker_embedding).detach().cpu()
+        wavs_padded = wavs_padded.reshape(batch_len, -1)
+        max_latent_len = latents_padded.shape[1]
+        wavs = []
+        for i, length in enumerate(latent_lens):
+            # HiFiGAN upsamples with a fixed ratio so the wav length is proportional to the latent length
+            wav_len = int(round(wavs_padded.shape[-1] * length / max_latent_len))
+            wavs.append(wavs_padded[i, :wav_len].float().numpy())
+        return wavs
+
+    def _get_latents(self, voice:str|None)->tuple:
+        if voice is not None and voice in self.params['latent_embedding'].keys():
+            return self.params['latent_embedding'][voice]
+        msg = 'Computing speaker latents…'
+        print(msg)
+        if self.speaker in default_engine_settings[TTS_ENGINES['XTTS']]['voices'].keys():
+            gpt_cond_latent, speaker_embedding = self.xtts_speakers[default_engine_settings[TTS_ENGINES['XTTS']]['voices'][self.speaker]].values()
+        else:
+            gpt_cond_latent, speaker_embedding = self._get_conditioning_latents(self.engine, voice, self._checkpoint_id())
+        self.params['latent_embedding'][voice] = gpt_cond_latent, speaker_embedding
+        return gpt_cond_latent, speaker_embedding
+
+    def _checkpoint_id(self)->str:
+        # identifies the weights the latents were computed with. custom models can be re-uploaded
+        # under the same name so their checkpoint size and mtime are part of the id.
+        if self.session['custom_model'] is not None:
+            checkpoint_path = os.path.join(self.session['custom_model'], default_engine_settings[TTS_ENGINES['XTTS']]['files'][1])
+            try:
+                st = os.stat(checkpoint_path)
+                return f"{self.session['tts_engine']}-{os.path.basename(os.path.normpath(self.session['custom_model']))}-{st.st_size}-{st.st_mtime_ns}"
+            except OSError:
+                pass
+        return f"{self.session['tts_engine']}-{self.session['fine_tuned']}"
+
+    def _part_segments(self, part:str, audio_part:Any)->tuple:
+        import torch
+        import numpy as np
+        from lib.classes.tts_engines.common.audio import trim_audio, is_audio_data_valid
+        trim_audio_buffer = 0.006
+        if audio_part is None or len(audio_part) == 0:
+            error = 'audio_part not valid'
+            return None, error
+        if torch.is_tensor(audio_part):
+            audio_part = audio_part.detach().cpu()
+        if not is_audio_data_valid(audio_part):
+            error = 'audio_part not valid'
+            return None, error
+        part_tensor = self._tensor_type(audio_part).unsqueeze(0)
+        if part_tensor.numel() == 0:
+            error = 'part_tensor not valid'
+            return None, error
+        if part[-1].isalnum() or part[-1] == '—':
+            part_tensor = trim_audio(part_tensor.squeeze(), self.params['samplerate'], 0.001, trim_audio_buffer).unsqueeze(0)
+        segments = [part_tensor]
+        if not re.search(r'\w$', part, flags=re.UNICODE) and part[-1] != '—':
+            silence_time = int(np.random.uniform(0.3, 0.6) * 100) / 100
+            segments.append(torch.zeros(1, int(self.params['samplerate'] * silence_time)))
+        return segments, None
+
     def create_vtt(self, all_sentences:list)->bool:
         if self._build_vtt_file(all_sentences):
             return True
@@ -1,5 +1,7 @@
 from typing import Any
 from lib.classes.tts_registry import TTSRegistry
+from lib.classes.sentence_cache import SentenceCache
+from lib.conf_models import SML_TAG_PATTERN
 
 class TTSManager:
 
@@ -16,9 +18,55 @@ class TTSManager:
                 f"Expected one of: {', '.join(TTSRegistry.ENGINES)}"
             )
         self.engine = engine_cls(session)
+        self.sentence_cache = SentenceCache(session)
     
     def set_voice(self, block_voice:str|None)->tuple:
         return self.engine._set_voice(block_voice)
 
+    def _cache_key(self, sentence:str, **kwargs)->str|None:
+        # an inline voice left open by a previous sentence changes the audio of this one
+        if getattr(self.engine, 'params', {}).get('inline_voice'):
+            return None
+        return self.sentence_cache.key(sentence, kwargs.get('block_voice', self.session['voice']))
+
     def convert_sentence2audio(self, sentence_file:str, sentence:str, **kwargs)->tuple:
-        return self.engine.convert(sentence_file, sentence, **kwargs)
\ No newline at end of file
+        cache_key = self._cache_key(sentence, **kwargs)
+        if self.sentence_cache.fetch(cache_key, sentence_file):
+            return True, None
+        self.sentence_cache.release(sentence_file)
+        success, error = self.engine.convert(sentence_file, sentence, **kwargs)
+        if success:
+            self.sentence_cache.store(cache_key, sentence_file)
+        return success, error
+
+    def get_batch_size(self)->int:
+        if hasattr(self.engine, 'get_batch_size'):
+            return self.engine.get_batch_size()
+        return 1
+
+    def convert_sentences2audio(self, batch:list[tuple[str, str]], **kwargs)->tuple:
+        if not hasattr(self.engine, 'convert_batch'):
+            for sentence_file, sentence in batch:
+                success, error = self.convert_sentence2audio(sentence_file, sentence, **kwargs)
+                if not success:
+                    return False, error
+            return True, None
+        misses = []
+        voice_tagged = False
+        for sentence_file, sentence in batch:
+            # once a sentence of the batch carries a voice tag the following ones may run under an inline voice
+            voice_tagged = voice_tagged or any(m.group('tag') == 'voice' for m in SML_TAG_PATTERN.finditer(sentence))
+            cache_key = None if voice_tagged else self._cache_key(sentence, **kwargs)
+            if not self.sentence_cache.fetch(cache_key, sentence_file):
+                self.sentence_cache.release(sentence_file)
+                misses.append((sentence_file, sentence, cache_key))
+        if not misses:
+            return True, None
+        success, error = self.engine.convert_batch([(f, s) for f, s, _ in misses], **kwargs)
+        if success:
+            for sentence_file, _, cache_key in misses:
+                self.sentence_cache.store(cache_key, sentence_file)
+        return success, error
+
+    def cache_stats(self)->str:
+        return self.sentence_cache.stats()
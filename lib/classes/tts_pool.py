@@ -0,0 +1,140 @@
+import math, multiprocessing, queue
+
+from typing import Any, Generator
+from multiprocessing.managers import DictProxy
+
+from lib.conf_models import SML_TAG_PATTERN
+
+def _tts_worker(session:DictProxy, tasks:Any, results:Any)->None:
+    # one TTSManager (and so one engine from TTSRegistry.ENGINES) per process.
+    # sentences of a range are converted in order so the SML inline voice state stays valid.
+    # results are (key, sentence_idx, run, error), key being the one the range was submitted with.
+    # a ('voice', block_voice) task runs set_voice() and returns ('voice', None, new_voice, error).
+    from lib.classes.tts_manager import TTSManager
+    try:
+        tts_manager = TTSManager(session)
+    except Exception as e:
+        results.put((None, None, False, f'TTSPool worker init error: {e}'))
+        return
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        if task[0] == 'voice':
+            try:
+                new_voice, error = tts_manager.set_voice(task[1])
+            except Exception as e:
+                new_voice, error = None, f'TTSPool worker set_voice() error: {e}'
+            results.put(('voice', None, new_voice, error))
+            continue
+        key, block_voice, items = task[1:]
+        for j, sentence_file, sentence in items:
+            try:
+                run, error = tts_manager.convert_sentence2audio(sentence_file, sentence, block_voice=block_voice)
+            except Exception as e:
+                run, error = False, f'TTSPool worker error: {e}'
+            results.put((key, j, run, error))
+            if not run:
+                break
+    print(tts_manager.cache_stats())
+
+class TTSPool:
+
+    def __init__(self, session:DictProxy, workers:int)->None:
+        self.session = session
+        self.workers = workers
+        # results read for a key other than the one being converted, by key
+        self.buffered = {}
+        mp_context = multiprocessing.get_context('spawn')
+        self.tasks = mp_context.Queue()
+        self.results = mp_context.Queue()
+        self.processes = []
+        for _ in range(workers):
+            p = mp_context.Process(target=_tts_worker, args=(session, self.tasks, self.results), daemon=True)
+            p.start()
+            self.processes.append(p)
+
+    def _split_ranges(self, items:list)->list[list]:
+        # an open [voice:...] tag can span several sentences: a [voice:...]...[/voice] span stays in one range,
+        # the other sentences ([break], [pause] included) are sharded freely
+        units = []
+        in_voice = False
+        for item in items:
+            if not in_voice:
+                units.append([])
+            units[-1].append(item)
+            for m in SML_TAG_PATTERN.finditer(item[2]):
+                if m.group('tag') == 'voice':
+                    in_voice = not m.group('close')
+        range_size = max(1, math.ceil(len(items) / (self.workers * 2)))
+        ranges = []
+        for unit in units:
+            if not ranges or len(ranges[-1]) >= range_size:
+                ranges.append([])
+            ranges[-1].extend(unit)
+        return ranges
+
+    def submitted(self, key:Any)->bool:
+        return key in self.buffered
+
+    def submit(self, key:Any, items:list[tuple[int, str, str]], block_voice:str|None)->None:
+        # queues the ranges without waiting: the next block can be queued while the current one drains
+        self.buffered[key] = []
+        for sentence_range in self._split_ranges(items):
+            self.tasks.put(('convert', key, block_voice, sentence_range))
+
+    def convert(self, key:Any, items:list[tuple[int, str, str]], block_voice:str|None)->Generator[tuple[int|None, bool, str|None], None, None]:
+        # items: [(sentence_idx, sentence_file, sentence), ...] of one block, submitted here unless it already was.
+        # yields (sentence_idx, run, error) in completion order, not in sentence order.
+        if not self.submitted(key):
+            self.submit(key, items, block_voice)
+        remaining = len(items)
+        while remaining > 0:
+            if self.session['cancellation_requested']:
+                yield None, False, 'Conversion Cancelled'
+                return
+            if self.buffered[key]:
+                j, run, error = self.buffered[key].pop(0)
+            else:
+                try:
+                    result_key, j, run, error = self.results.get(timeout=1)
+                except queue.Empty:
+                    if not any(p.is_alive() for p in self.processes):
+                        yield None, False, 'TTSPool: all workers exited unexpectedly'
+                        return
+                    continue
+                if result_key is not None and result_key != key:
+                    if result_key in self.buffered:
+                        self.buffered[result_key].append((j, run, error))
+                    continue
+            yield j, run, error
+            if not run:
+                return
+            remaining -= 1
+        del self.buffered[key]
+
+    def set_voice(self, block_voice:str|None)->tuple:
+        # same contract as TTSManager.set_voice(), run by whichever worker is idle
+        self.tasks.put(('voice', block_voice))
+        while True:
+            try:
+                tag, _, new_voice, error = self.results.get(timeout=1)
+            except queue.Empty:
+                if not any(p.is_alive() for p in self.processes):
+                    return None, 'TTSPool: all workers exited unexpectedly'
+                continue
+            if tag == 'voice':
+                return new_voice, error
+            if tag is None:
+                # a worker that failed its engine init
+                return None, error
+
+    def close(self)->None:
+        for p in self.processes:
+            if p.is_alive():
+                self.tasks.put(None)
+        for p in self.processes:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+        self.processes = []
@@ -0,0 +1,67 @@
+import os, threading
+
+from lib.conf import models_dir
+
+class WordSegmenter:
+
+    '''Word segmentation for the languages written without spaces (CJK and South-East Asian).
+    The tokenizer is imported and set up once per process on first use, or ahead by warm().
+    segment_many() takes all the fragments of a text at once: jieba cuts them in a single pass,
+    the others reuse the same tokenizer instance fragment after fragment.
+    '''
+
+    CANTONESE = ['yue', 'yue-Hant', 'yue-Hans', 'zh-yue', 'cantonese']
+    LANGS = CANTONESE + ['zho', 'jpn', 'kor', 'tha', 'lao', 'mya', 'khm']
+
+    def __init__(self, lang:str)->None:
+        self.lang = lang
+        self.tokenize = None
+        self.batch = None
+        self.lock = threading.Lock()
+
+    def _load(self)->None:
+        lang = self.lang
+        if lang in self.CANTONESE:
+            import pycantonese as pc
+            self.tokenize = pc.segment
+        elif lang == 'zho':
+            import jieba
+            jieba.dt.cache_file = os.path.join(models_dir, 'jieba.cache')
+            jieba.initialize()
+            self.tokenize = jieba.lcut
+            self.batch = self._jieba_batch
+        elif lang == 'jpn':
+            import nagisa
+            self.tokenize = lambda text: nagisa.tagging(text).words
+        elif lang == 'kor':
+            from soynlp.tokenizer import LTokenizer
+            self.tokenize = LTokenizer().tokenize
+        elif lang in ['tha', 'lao', 'mya', 'khm']:
+            from pythainlp.tokenize import word_tokenize
+            self.tokenize = lambda text: word_tokenize(text, engine='newmm')
+        else:
+            self.tokenize = lambda text: [text.strip()]
+
+    def warm(self)->None:
+        with self.lock:
+            if self.tokenize is None:
+                self._load()
+
+    def _jieba_batch(self, fragments:list[str])->list[list[str]]:
+        # jieba never merges across a newline, so one cut over the joined fragments
+        # gives the same tokens as one cut per fragment
+        result = [[]]
+        for token in self.tokenize('\n'.join(fragments)):
+            if token == '\n':
+                result.append([])
+            else:
+                result[-1].append(token)
+        return result
+
+    def segment_many(self, fragments:list[str])->list[list[str]]:
+        self.warm()
+        if self.batch is not None and fragments and not any('\n' in f for f in fragments):
+            tokens = self.batch(fragments)
+            if len(tokens) == len(fragments):
+                return [[t for t in toks if t.strip()] for toks in tokens]
+        return [[t for t in self.tokenize(f) if t.strip()] for f in fragments]
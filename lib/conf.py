@@ -30,7 +30,7 @@ cli_options = [
     '--waveform_temp', '--output_dir', '--version', 
     '--docker_device', '--workflow', '--help',
     '--abs_enabled', '--abs_server_url', '--abs_api_token', '--abs_library_id',
-    '--abs_auto_upload'
+    '--abs_auto_upload', '--workers'
 ]
 
 workflow_id = 'ba800d22-ee51-11ef-ac34-d4ae52cfd9ce'
@@ -130,6 +130,11 @@ ebooks_dir = os.path.abspath('ebooks')
 voices_dir = os.path.abspath('voices')
 voices_url = 'https://huggingface.co/datasets/ebook2audiobook/E2A-Voices/resolve/main/voices.zip?download=true'
 tts_dir = os.path.join(models_dir, 'tts')
+safetensors_dir = os.path.join(tts_dir, '__safetensors')
+models_manifest = os.path.join(models_dir, 'manifest.json')
+latents_dir = os.path.join(models_dir, 'latents')
+sentences_cache_dir = os.path.join(tmp_dir, '__sentences_cache')
+ocr_cache_dir = os.path.join(tmp_dir, '__ocr_cache')
 components_dir = os.path.abspath('components')
 tempfile.tempdir = run_dir
 
@@ -189,6 +194,24 @@ if DEVICE_SYSTEM == systems['WINDOWS']:
 max_upload_size = '6GB' # MB or GB
 tmp_expire = 60 # days
 max_ebook_textarea_length = 1024 # chars
+max_latents_cache = 500 # speaker latents kept on disk, least recently used are evicted first
+max_sentences_cache_gb = 2 # sentence audio shared across books and sessions, 0 to disable
+max_romanize_cache = 100000 # foreign words romanizations kept in memory, least recently used are evicted first
+models_reserve_vram_gb = 1 # free VRAM kept aside, least recently used models are offloaded to RAM below it
+models_reserve_ram_gb = 2 # free RAM kept aside, least recently used offloaded models are dropped below it
+fast_model_load = True # convert checkpoints once to safetensors and load them memory mapped
+sentences_split_ahead = 8 # blocks split into sentences ahead of the one being synthesized
+parse_workers = 0 # processes parsing the ebook documents, 0 = one per CPU core (max 8), 1 = sequential
+parse_pool_idle = 300 # seconds the parse processes are kept after a book for the next one to reuse their NLP pipelines, 0 = closed after each book
+date_ner_window = 300 # max chars around a year or ordinal day given to the date NER, up to the sentence ends
+date_ner_batch = 32 # date NER windows per stanza bulk_process() call
+profile_text = os.environ.get('PROFILE_TEXT', '0') == '1' # per document timings of the text preparation stages, written to text_profile.json/.csv in the process dir
+native_conversion = True # epub, txt, md, html and docx inputs (and the OCR xhtml of pdf, pptx and images) are converted in-process, calibre only for the other formats or on failure
+ocr_workers = 0 # OCR processes for image-based pages, 0 = one per CPU core (max 8), 1 = sequential
+ocr_inflight = 2 # OCR jobs queued ahead per process, bounds the page images held in memory
+max_ocr_cache_mb = 500 # OCR xhtml of the page images shared across books and sessions, 0 to disable
+ocr_output_format = 'dataframe' # tesseract output read by ocr2xhtml(): dataframe (pandas groupby), tsv or hocr (both parsed without pandas)
+ocr_debug = False # print the paragraphs and headings rebuilt from each OCR page
 
 # ---------------------------------------------------------------------
 # Interface configuration
@@ -219,7 +242,7 @@ audiobooks_cli_dir = os.path.abspath(os.path.join('audiobooks','cli'))
 ebook_formats = [
     ".epub", ".mobi", ".azw3", ".fb2", ".lrf", ".rb", ".snb", ".tcr", ".pdf",
     ".txt", ".rtf", ".doc", ".docx", ".html", ".odt", ".azw", ".tiff", ".tif",
-    ".png", ".jpg", ".jpeg", ".bmp", ".pptx", ".zip"
+    ".png", ".jpg", ".jpeg", ".bmp", ".pptx", ".zip", ".md"
 ]
 voice_formats = [
     ".mp4", ".m4b", ".m4a", ".mp3", ".wav", ".aac", ".flac", ".alac", ".ogg",
@@ -1,7 +1,8 @@
 import os, re
 from lib.conf import tts_dir, voices_dir
+from lib.classes.model_residency import ModelResidency
 
-loaded_tts = {}
+loaded_tts = ModelResidency()
 xtts_builtin_speakers_list = {}
 
 TTS_ENGINES = {
@@ -89,6 +90,8 @@ default_engine_settings = {
         #"gpt_cond_len": 512,
         #"gpt_batch_size": 1,
         "enable_text_splitting": False,
+        "batch_size_max": 16, # max sentences synthesized in one GPT/HiFiGAN pass (GPU only)
+        "batch_item_vram_gb": 0.5, # estimated free VRAM needed per batched sentence
         "files": ['config.json', 'model.pth', 'vocab.json', 'ref.wav'],
         "voice": default_speaker,
         "voices": {
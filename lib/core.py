@@ -8,20 +8,20 @@
 import argparse, asyncio, csv, difflib, fnmatch, sqlite3, hashlib, io, json, math, os, pytesseract, gc
 import random, shutil, subprocess, sys, tempfile, threading, time, uvicorn, copy
 import traceback, socket, unicodedata, urllib.request, uuid, zipfile, fitz, multiprocessing
-import ebooklib, psutil, requests, stanza, importlib, queue, pykakasi
+import ebooklib, psutil, requests, stanza, importlib, queue
 import regex as re, gradio as gr
 
 from typing import Any, Generator, Dict
-from PIL import Image, ImageSequence
+from PIL import Image
 from tqdm import tqdm
 from bs4 import BeautifulSoup, NavigableString, Tag
 from collections import Counter
 from collections.abc import Mapping, MutableMapping
 from datetime import datetime
 from ebooklib import epub
-from ebooklib.epub import EpubBook
 from ebooklib.epub import EpubHtml
 from glob import glob
+from html import escape as html_escape
 from iso639 import Lang
 from markdown import markdown
 from multiprocessing import Pool, cpu_count
@@ -31,23 +31,29 @@ from stanza.pipeline.core import Pipeline, DownloadMethod
 from num2words2 import num2words
 from pathlib import Path
 from PIL import Image
-from pydub import AudioSegment
 from pydub.utils import mediainfo
 from queue import Queue, Empty
-from types import MappingProxyType
+from types import MappingProxyType, SimpleNamespace
 from langdetect import detect
-from unidecode import unidecode
-from phonemizer import phonemize
-from pypinyin import pinyin, Style
 
 from lib.classes.subprocess_pipe import SubprocessPipe
 from lib.classes.vram_detector import VRAMDetector
 from lib.classes.voice_extractor import VoiceExtractor
 from lib.classes.non_text_filter import NonTextFilter
+from lib.classes.text_normalizer import TextNormalizer
+from lib.classes.romanizer import Romanizer
+from lib.classes.word_segmenter import WordSegmenter
+from lib.classes.date_entities import DateEntities
+from lib.classes.text_profiler import StageTimer, TextProfiler
+from lib.classes.epub_reader import EpubReader
+from lib.classes.epub_builder import EpubBuilder
+from lib.classes.ocr_cache import OcrCache
+from lib.classes.duration_manifest import DurationManifest
 #from lib.classes.redirect_console import RedirectConsole
 from lib.classes.argos_translator import ArgosTranslator
 from lib.classes.tts_manager import TTSManager
-from lib.classes.tts_engines.common.audio import get_audiolist_duration, get_audio_duration
+from lib.classes.tts_pool import TTSPool
+from lib.classes.tts_engines.common.audio import get_audiolist_duration, concat_audio_files
 from lib.classes.tts_engines.common.utils import build_vtt_file
 
 from lib import *
@@ -62,6 +68,17 @@ context = None
 context_tracker = None
 active_sessions = None
 progress_bar = None
+tts_preloads = {}
+text_normalizers = {}
+word_segmenters = {}
+text_profilers = {}
+romanizer = Romanizer()
+sml_escape_re = re.compile(f'[{chr(sml_escape_tag)}-{chr(0x10FFFF)}]+')
+sml_escape_last_re = re.compile(f'[{chr(sml_escape_tag)}-{chr(0x10FFFF)}]+', flags=re.REVERSE)
+filter_worker = {}
+filter_pool = {}
+filter_pool_lock = threading.Lock()
+ocr_worker = {}
 
 status_tags = {
     "OVERRIDE": "override",
@@ -165,6 +182,7 @@ class SessionContext:
             "session_dir": None,
             "is_gui_process": False,
             "free_vram_gb": 0,
+            "workers": 1,
             "status": None,
             "ticker": 0,
             "cancellation_requested": False,
@@ -514,13 +532,61 @@ def compare_dict_keys(d1, d2):
             return {key: nested_result}
     return None
 
+def _ocr_lines(img:Image.Image, lang:str)->list[tuple[int, int, str]]:
+    # (block, paragraph, text) of each text line in reading order, from the tesseract output set by ocr_output_format
+    if ocr_output_format == 'hocr':
+        return _ocr_lines_hocr(pytesseract.image_to_pdf_or_hocr(img, lang=lang, extension='hocr'))
+    if ocr_output_format == 'tsv':
+        return _ocr_lines_tsv(pytesseract.image_to_data(img, lang=lang))
+    data = pytesseract.image_to_data(img, lang=lang, output_type=pytesseract.Output.DATAFRAME)
+    if data is None or data.empty:
+        return []
+    words = data.dropna(subset=['text'])
+    words = words.assign(text=words['text'].astype(str).str.strip())
+    words = words[words['text'] != '']
+    lines = words.groupby(['block_num', 'par_num', 'line_num'], sort=False)['text'].agg(' '.join)
+    return [(block, par, text) for (block, par, _), text in lines.items()]
+
+def _ocr_lines_tsv(tsv:str)->list[tuple[int, int, str]]:
+    rows = tsv.splitlines()
+    if not rows:
+        return []
+    col = {name: i for i, name in enumerate(rows[0].split('\t'))}
+    lines = {}
+    for row in rows[1:]:
+        fields = row.split('\t')
+        if len(fields) < len(col):
+            continue
+        text = fields[col['text']].strip()
+        if text:
+            key = (int(fields[col['block_num']]), int(fields[col['par_num']]), int(fields[col['line_num']]))
+            lines.setdefault(key, []).append(text)
+    return [(block, par, ' '.join(words)) for (block, par, _), words in lines.items()]
+
+def _ocr_lines_hocr(hocr:bytes)->list[tuple[int, int, str]]:
+    import xml.etree.ElementTree as ET
+    line_classes = ('ocr_line', 'ocr_caption', 'ocr_header', 'ocr_textfloat')
+    lines = []
+    root = ET.fromstring(hocr)
+    areas = [el for el in root.iter() if el.get('class') == 'ocr_carea']
+    for block, area in enumerate(areas):
+        pars = [el for el in area.iter() if el.get('class') == 'ocr_par']
+        for par, par_el in enumerate(pars):
+            for line in par_el.iter():
+                if line.get('class') not in line_classes:
+                    continue
+                words = [''.join(w.itertext()).strip() for w in line.iter() if w.get('class') == 'ocrx_word']
+                text = ' '.join(w for w in words if w)
+                if text:
+                    lines.append((block, par, text))
+    return lines
+
 def ocr2xhtml(img: Image.Image, lang:str)->tuple[str|bool, str|None]:
     try:
-        debug = True
         try:
-            data = pytesseract.image_to_data(img, lang=lang, output_type=pytesseract.Output.DATAFRAME)
+            lines = _ocr_lines(img, lang)
             # Handle silent OCR failures (empty or None result)
-            if data is None or data.empty:
+            if not lines:
                 error = f'Tesseract returned empty OCR data for language "{lang}".'
                 return False, error
         except (pytesseract.TesseractError, Exception) as e:
@@ -538,8 +604,8 @@ def ocr2xhtml(img: Image.Image, lang:str)->tuple[str|bool, str|None]:
                         f.write(response.content)
                     msg = f'Downloaded and installed {lang}.traineddata successfully.'
                     print(msg)
-                    data = pytesseract.image_to_data(img, lang=lang, output_type=pytesseract.Output.DATAFRAME)
-                    if data is None or data.empty:
+                    lines = _ocr_lines(img, lang)
+                    if not lines:
                         error = f'Tesseract returned empty OCR data even after downloading {lang}.traineddata.'
                         return False, error
                 else:
@@ -548,58 +614,29 @@ def ocr2xhtml(img: Image.Image, lang:str)->tuple[str|bool, str|None]:
             except Exception as e:
                 error = f'Automatic download failed: {e}'
                 return False, error
-        data = data.dropna(subset=['text'])
-        lines = []
-        last_block = None
-        for _, row in data.iterrows():
-            text = row['text'].strip()
-            if not text:
-                continue
-            block = row['block_num']
-            if last_block is not None and block != last_block:
-                lines.append('')  # blank line between blocks
-            lines.append(text)
-            last_block = block
-        joined = '\n'.join(lines)
-        raw_lines = [l.strip() for l in joined.split('\n')]
-        # Normalize line breaks
-        merged_lines = []
-        buffer = ''
-        for i, line in enumerate(raw_lines):
-            if not line:
-                if buffer:
-                    merged_lines.append(buffer.strip())
-                    buffer = ''
-                continue
-            if buffer and not buffer.endswith(('.', '?', '!', ':')) and not line[0].isupper():
-                buffer += ' ' + line
+        # paragraphs: the lines of a tesseract paragraph, and the next paragraph of the same block
+        # when the sentence goes on (no end punctuation, no capital)
+        paragraphs = []
+        prev_key = None
+        for block, par, text in lines:
+            if prev_key == (block, par):
+                paragraphs[-1][1] += ' ' + text
+            elif paragraphs and paragraphs[-1][0] == block and not paragraphs[-1][1].endswith(('.', '?', '!', ':')) and not text[0].isupper():
+                paragraphs[-1][1] += ' ' + text
             else:
-                if buffer:
-                    merged_lines.append(buffer.strip())
-                buffer = line
-        if buffer:
-            merged_lines.append(buffer.strip())
+                paragraphs.append([block, text])
+            prev_key = (block, par)
         # Detect heading-like lines
         xhtml_parts = []
-        debug_dump = []
-        for i, p in enumerate(merged_lines):
-            is_heading = False
-            if p.isupper() and len(p.split()) <= 8:
-                is_heading = True
-            elif len(p.split()) <= 5 and p.istitle():
-                is_heading = True
-            elif (i == 0 or (i > 0 and merged_lines[i-1] == '')) and len(p.split()) <= 10:
-                is_heading = True
-            if is_heading:
-                xhtml_parts.append(f'<h2>{p}</h2>')
-                debug_dump.append(f'[H2] {p}')
-            else:
-                xhtml_parts.append(f'<p>{p}</p>')
-                debug_dump.append(f'[P ] {p}')
-        if debug:
+        for i, (_, p) in enumerate(paragraphs):
+            words = len(p.split())
+            is_heading = (p.isupper() and words <= 8) or (words <= 5 and p.istitle()) or (i == 0 and words <= 10)
+            tag = 'h2' if is_heading else 'p'
+            xhtml_parts.append(f'<{tag}>{html_escape(p)}</{tag}>')
+        if ocr_debug:
             print('=== OCR DEBUG OUTPUT ===')
-            for line in debug_dump:
-                print(line)
+            for i, part in enumerate(xhtml_parts):
+                print(f"[{'H2' if part.startswith('<h2>') else 'P '}] {paragraphs[i][1]}")
             print('========================')
         return '\n'.join(xhtml_parts), None
     except Exception as e:
@@ -607,6 +644,108 @@ def ocr2xhtml(img: Image.Image, lang:str)->tuple[str|bool, str|None]:
         error = f'ocr2xhtml error: {e}'
         return False, error
 
+def load_ocr_image(job:tuple)->tuple[Image.Image, str]:
+    # OCR job: ('pdf', path, page, dpi), ('zip', path, member), ('image', path, frame) or ('bytes', blob).
+    # returns the image and the hash of its content (pixmap samples or embedded bytes as stored).
+    # OCR workers keep their pdf/zip handles open for the next jobs
+    kind = job[0]
+    handles = ocr_worker.get('handles')
+    if kind in ('pdf', 'zip'):
+        handle = handles.get(job[1]) if handles is not None else None
+        if handle is None:
+            handle = fitz.open(job[1]) if kind == 'pdf' else zipfile.ZipFile(job[1], 'r')
+        try:
+            if kind == 'pdf':
+                pix = handle[job[2]].get_pixmap(dpi=job[3])
+                image_hash = hashlib.sha256(f'{pix.width}x{pix.height}x{pix.n}'.encode() + pix.samples).hexdigest()
+                return Image.open(io.BytesIO(pix.tobytes('png'))), image_hash
+            data = handle.read(job[2])
+            return Image.open(io.BytesIO(data)).convert('RGB'), hashlib.sha256(data).hexdigest()
+        finally:
+            if handles is not None:
+                handles[job[1]] = handle
+            else:
+                handle.close()
+    if kind == 'image':
+        img = Image.open(job[1])
+        img.seek(job[2])
+        img = img.convert('RGB')
+        return img, hashlib.sha256(f'{img.width}x{img.height}'.encode() + img.tobytes()).hexdigest()
+    return Image.open(io.BytesIO(job[1])), hashlib.sha256(job[1]).hexdigest()
+
+def _ocr_init(threads:int)->None:
+    # tesseract runs as a subprocess of each worker: cap its OpenMP threads so workers x threads fits the cores
+    os.environ['OMP_THREAD_LIMIT'] = str(threads)
+    ocr_worker['handles'] = {}
+
+def _ocr_task(task:tuple)->tuple[str|bool, str|None, bool]:
+    # (xhtml, error, cache hit)
+    job, lang = task
+    try:
+        cache = ocr_worker.get('cache')
+        if cache is None:
+            cache = ocr_worker['cache'] = OcrCache()
+        img, image_hash = load_ocr_image(job)
+        key = cache.key(image_hash, lang)
+        xhtml_content = cache.get(key)
+        if xhtml_content is not None:
+            return xhtml_content, None, True
+        xhtml_content, error = ocr2xhtml(img, lang)
+        if xhtml_content:
+            cache.put(key, xhtml_content)
+        return xhtml_content, error, False
+    except Exception as e:
+        return False, f'OCR error on {job[0]} {job[2] if len(job) > 2 else ""}: {e}', False
+
+def ocr_images(session_id:str, jobs:list[tuple], lang:str)->Generator[tuple[str|bool, str|None], None, None]:
+    # ocr2xhtml() of each job, results yielded in job order.
+    # pages already recognized (same image, same language) come from the OcrCache
+    session = context.get_session(session_id)
+    if not jobs:
+        return
+    hits = 0
+    for result in _ocr_results(session, jobs, lang):
+        hits += result[2]
+        yield result[:2]
+    msg = f'OCR cache: {hits} hits, {len(jobs) - hits} misses of {len(jobs)} images'
+    print(msg)
+
+def _ocr_results(session:Any, jobs:list[tuple], lang:str)->Generator[tuple[str|bool, str|None, bool], None, None]:
+    # workers rasterize/decode the images themselves and at most ocr_inflight jobs per worker are
+    # submitted ahead, so the pages in memory stay bounded whatever the book size.
+    # the first job runs here: it fetches the traineddata once before the workers start
+    yield _ocr_task((jobs[0], lang))
+    cores = cpu_count()
+    workers = min(ocr_workers or min(8, max(1, cores - 1)), len(jobs) - 1)
+    # no child processes from a daemonic parse worker, its documents are already spread over the cores
+    if workers <= 1 or multiprocessing.current_process().daemon:
+        for job in jobs[1:]:
+            if session['cancellation_requested']:
+                return
+            yield _ocr_task((job, lang))
+        return
+    msg = f'OCR of {len(jobs) - 1} images with {workers} processes…'
+    print(msg)
+    pool = multiprocessing.get_context('spawn').Pool(workers, initializer=_ocr_init, initargs=(max(1, cores // workers),))
+    try:
+        pending = []
+        remaining = iter(jobs[1:])
+        for job in remaining:
+            pending.append(pool.apply_async(_ocr_task, ((job, lang),)))
+            if len(pending) >= workers * ocr_inflight:
+                break
+        while pending:
+            result = pending.pop(0).get()
+            job = next(remaining, None)
+            if job is not None:
+                pending.append(pool.apply_async(_ocr_task, ((job, lang),)))
+            yield result
+            if session['cancellation_requested']:
+                return
+    finally:
+        pool.terminate()
+        pool.join()
+
 def create_db_blocks(db_path:str)->None:
     os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
     with sqlite3.connect(db_path) as conn:
@@ -889,11 +1028,6 @@ def convert2epub(session_id:str)->bool:
         try:
             title = False
             author = False
-            ebook_convert = shutil.which('ebook-convert')
-            if not ebook_convert:
-                error = 'ebook-convert utility is not installed or not found.'
-                print(error)
-                return False
             file_input = session['ebook']
             if os.path.getsize(file_input) == 0:
                 error = f'Input file is empty: {file_input}'
@@ -925,6 +1059,7 @@ def convert2epub(session_id:str)->bool:
                 title = file_meta.get('title') or filename_noext
                 author = file_meta.get('author') or False
                 xhtml_pages = []
+                ocr_jobs = []
                 for i, page in enumerate(doc):
                     has_text = page.get_text('text').strip()
                     if has_text:
@@ -933,20 +1068,24 @@ def convert2epub(session_id:str)->bool:
                         except Exception as e:
                             print(f'Error extracting text from page {i+1}: {e}')
                             xhtml_content = ''
-                        error = None
                     else:
                         xhtml_content = ''
-                        error = None
                     if not xhtml_content:
                         msg = f'The page {i+1} seems to be image-based. Using OCR…'
                         show_alert(session_id, {"type": "warning", "msg": msg})
-                        pix = page.get_pixmap(dpi=300)
-                        img = Image.open(io.BytesIO(pix.tobytes('png')))
-                        xhtml_content, error = ocr2xhtml(img, session['language'])
+                        # placeholder filled in page order by the OCR below
+                        ocr_jobs.append((len(xhtml_pages), ('pdf', file_input, i, 300)))
+                    xhtml_pages.append(xhtml_content)
+                doc.close()
+                ocr_results = ocr_images(session_id, [job for _, job in ocr_jobs], session['language'])
+                for (pos, _), (xhtml_content, error) in zip(ocr_jobs, ocr_results):
                     if xhtml_content:
-                        xhtml_pages.append(xhtml_content)
+                        xhtml_pages[pos] = xhtml_content
                     else:
                         show_alert(session_id, {"type": "warning", "msg": error})
+                if session['cancellation_requested']:
+                    return False
+                xhtml_pages = [p for p in xhtml_pages if p]
                 if xhtml_pages:
                     xhtml_body = '\n'.join(xhtml_pages)
                     xhtml_text = (
@@ -966,7 +1105,6 @@ def convert2epub(session_id:str)->bool:
                 else:
                     return False
             elif file_ext == '.pptx':
-                from html import escape as html_escape
                 from pptx import Presentation as PptxPresentation
                 filename_noext = os.path.splitext(os.path.basename(session['ebook']))[0]
                 msg = f'File input is a presentation ({file_ext}). Extracting content…'
@@ -975,6 +1113,7 @@ def convert2epub(session_id:str)->bool:
                 title = prs.core_properties.title or filename_noext
                 author = prs.core_properties.author or False
                 xhtml_pages = []
+                ocr_jobs = []
                 for i, slide in enumerate(prs.slides):
                     slide_texts = []
                     slide_images = []
@@ -994,23 +1133,23 @@ def convert2epub(session_id:str)->bool:
                         except (AttributeError, ValueError):
                             pass
                     if slide_texts:
-                        xhtml_content = '\n'.join(f'<p>{html_escape(t)}</p>' for t in slide_texts)
+                        xhtml_pages.append('\n'.join(f'<p>{html_escape(t)}</p>' for t in slide_texts))
                     elif slide_images:
                         msg = f'Slide {i+1} seems to be image-based. Using OCR…'
                         show_alert(session_id, {"type": "warning", "msg": msg})
-                        xhtml_parts = []
+                        # one placeholder per image, filled in slide order by the OCR below
                         for blob in slide_images:
-                            img = Image.open(io.BytesIO(blob))
-                            xhtml_content, error = ocr2xhtml(img, session['language'])
-                            if xhtml_content:
-                                xhtml_parts.append(xhtml_content)
-                            else:
-                                show_alert(session_id, {"type": "warning", "msg": error})
-                        xhtml_content = '\n'.join(xhtml_parts) if xhtml_parts else ''
-                    else:
-                        xhtml_content = ''
+                            ocr_jobs.append((len(xhtml_pages), ('bytes', blob)))
+                            xhtml_pages.append('')
+                ocr_results = ocr_images(session_id, [job for _, job in ocr_jobs], session['language'])
+                for (pos, _), (xhtml_content, error) in zip(ocr_jobs, ocr_results):
                     if xhtml_content:
-                        xhtml_pages.append(xhtml_content)
+                        xhtml_pages[pos] = xhtml_content
+                    else:
+                        show_alert(session_id, {"type": "warning", "msg": error})
+                if session['cancellation_requested']:
+                    return False
+                xhtml_pages = [p for p in xhtml_pages if p]
                 if xhtml_pages:
                     xhtml_body = '\n'.join(xhtml_pages)
                     xhtml_text = (
@@ -1051,17 +1190,14 @@ def convert2epub(session_id:str)->bool:
                     title = docx_doc.core_properties.title or filename_noext
                     author = docx_doc.core_properties.author or False
                     xhtml_pages = []
-                    for rel in docx_doc.part.rels.values():
-                        if 'image' in rel.reltype:
-                            try:
-                                img = Image.open(io.BytesIO(rel.target_part.blob))
-                                xhtml_content, error = ocr2xhtml(img, session['language'])
-                                if xhtml_content:
-                                    xhtml_pages.append(xhtml_content)
-                                else:
-                                    show_alert(session_id, {"type": "warning", "msg": error})
-                            except Exception as e:
-                                print(f'Error processing embedded image: {e}')
+                    ocr_jobs = [('bytes', rel.target_part.blob) for rel in docx_doc.part.rels.values() if 'image' in rel.reltype]
+                    for xhtml_content, error in ocr_images(session_id, ocr_jobs, session['language']):
+                        if xhtml_content:
+                            xhtml_pages.append(xhtml_content)
+                        else:
+                            show_alert(session_id, {"type": "warning", "msg": error})
+                    if session['cancellation_requested']:
+                        return False
                     if xhtml_pages:
                         xhtml_body = '\n'.join(xhtml_pages)
                         xhtml_text = (
@@ -1084,17 +1220,17 @@ def convert2epub(session_id:str)->bool:
                 filename_noext = os.path.splitext(os.path.basename(session['ebook']))[0]
                 msg = f'File input is an image ({file_ext}). Running OCR…'
                 print(msg)
-                img = Image.open(file_input)
+                with Image.open(file_input) as img:
+                    page_count = getattr(img, 'n_frames', 1)
                 xhtml_pages = []
-                page_count = 0
-                for i, frame in enumerate(ImageSequence.Iterator(img)):
-                    page_count += 1
-                    frame = frame.convert('RGB')
-                    xhtml_content, error = ocr2xhtml(frame, session['language'])
+                ocr_jobs = [('image', file_input, i) for i in range(page_count)]
+                for xhtml_content, error in ocr_images(session_id, ocr_jobs, session['language']):
                     if xhtml_content:
                         xhtml_pages.append(xhtml_content)
                     else:
                         show_alert(session_id, {"type": "warning", "msg": error})
+                if session['cancellation_requested']:
+                    return False
                 if xhtml_pages:
                     xhtml_body = '\n'.join(xhtml_pages)
                     xhtml_text = (
@@ -1114,6 +1250,18 @@ def convert2epub(session_id:str)->bool:
                     print(f'OCR completed for {page_count} image page(s).')
                 else:
                     return False
+            if native_conversion and os.path.splitext(file_input)[1].lower() in EpubBuilder.FORMATS:
+                msg = f"Building {session['epub_path']} in-process…"
+                print(msg)
+                result, error = EpubBuilder(session['language']).build(file_input, session['epub_path'], title or None, author or None)
+                if result:
+                    return True
+                print(f'{error}. Falling back to calibre…')
+            ebook_convert = shutil.which('ebook-convert')
+            if not ebook_convert:
+                error = 'ebook-convert utility is not installed or not found.'
+                print(error)
+                return False
             msg = f"Running command: {ebook_convert} {file_input} {session['epub_path']}"
             print(msg)
             cmd = [
@@ -1158,7 +1306,7 @@ def convert2epub(session_id:str)->bool:
             print(error)
             return False
 
-def get_ebook_title(epubBook:EpubBook, all_docs:list[Any])->str|None:
+def get_ebook_title(epubBook:EpubReader, all_docs:list[Any])->str|None:
     # 1. Try metadata (official EPUB title)
     meta_title = epubBook.get_metadata('DC','title')
     if meta_title and meta_title[0][0].strip():
@@ -1178,7 +1326,7 @@ def get_ebook_title(epubBook:EpubBook, all_docs:list[Any])->str|None:
                 return alt
     return None
 
-def get_cover(epubBook:EpubBook, session_id:str)->bool|str:
+def get_cover(epubBook:EpubReader, session_id:str)->bool|str:
     try:
         session = context.get_session(session_id)
         if session and session.get('id', False):
@@ -1207,7 +1355,7 @@ def get_cover(epubBook:EpubBook, session_id:str)->bool|str:
         DependencyError(e)
         return False
 
-def get_blocks(session_id:str, epubBook:EpubBook)->list:
+def get_blocks(session_id:str, epubBook:EpubReader)->list:
     try:
         msg = r'''
 *******************************************************************************
@@ -1248,72 +1396,42 @@ INTO A NEW TRAINING MODEL. YOU CAN IMPROVE IT OR ASK TO A TRAINING MODEL EXPERT.
                 return []
             title = get_ebook_title(epubBook, all_docs)
             blocks = []
-            stanza_nlp = False
-            if session['language'] in year_to_decades_languages:
-                try:
-                    stanza_model = f"stanza-{session['language_iso1']}"
-                    stanza_nlp = loaded_tts.get(stanza_model, False)
-                    if stanza_nlp:
-                        msg = f"NLP model {stanza_model} loaded."
-                        print(msg)
-                    else:
-                        use_gpu = True if (
-                            (session['device'] == devices['CUDA']['proc'] and devices['CUDA']['found']) or
-                            (session['device'] == devices['ROCM']['proc'] and devices['ROCM']['found']) or
-                            (session['device'] == devices['XPU']['proc'] and devices['XPU']['found']) or
-                            (session['device'] == devices['JETSON']['proc'] and devices['JETSON']['found'])
-                        ) else False
-                        # only use mwt if the language supports it
-                        stanza_lang = session['language_iso1']
-                        stanza_has_mwt = False
-                        try:
-                            stanza_resources = stanza.resources.common.load_resources_json(os.getenv('STANZA_RESOURCES_DIR', stanza.resources.common.DEFAULT_MODEL_DIR))
-                            stanza_has_mwt = 'mwt' in stanza_resources.get(stanza_lang, {})
-                        except Exception:
-                            pass
-                        stanza_processors = 'tokenize,mwt,ner' if stanza_has_mwt else 'tokenize,ner'
-                        stanza_nlp = stanza.Pipeline(stanza_lang, processors=stanza_processors, use_gpu=use_gpu, download_method=DownloadMethod.REUSE_RESOURCES, dir=os.getenv('STANZA_RESOURCES_DIR'))
-                        if stanza_nlp:
-                            session['stanza_cache'] = stanza_model
-                            loaded_tts[stanza_model] = stanza_nlp
-                            msg = f"NLP model {stanza_model} loaded!"
-                            print(msg)
-                except (ConnectionError, TimeoutError) as e:
-                    error = f'Stanza model download connection error: {e}. Retry later'
-                    print(error)
-                    return []
-                except Exception as e:
-                    error = f'Stanza model initialization error: {e}'
-                    print(error)
-                    return []
+            date_entities = None
+            # spine documents are independent: parse them in a process pool when there are several
+            workers = min(parse_workers or min(8, max(1, cpu_count() - 1)), len(all_docs))
+            if session['language'] in year_to_decades_languages and workers <= 1:
+                stanza_model = f"stanza-{session['language_iso1']}"
+                session['stanza_cache'] = stanza_model
+                date_entities = DateEntities(lambda: get_stanza_pipeline(session['language_iso1']), session['language'])
             is_num2words_compat = get_num2words_compat(session['language_iso1'])
             non_text_filter = NonTextFilter(sml_pattern=SML_TAG_PATTERN, lang=session['language'])
+            profiler = get_text_profiler(session_id, new=True)
             try:
-                with zipfile.ZipFile(session['epub_path'], 'r') as zf:
-                    zip_names = set(zf.namelist())
+                if workers > 1:
+                    blocks = filter_blocks_parallel(session_id, all_docs, workers)
+                    if blocks is None:
+                        error = 'Error extracting content from the documents; aborting conversion to avoid partial output.'
+                        show_alert(session_id, {"type": "warning", "msg": error})
+                        return []
+                else:
+                    # documents and OCR images are read from the zip handle of the reader, one at a time
+                    zf = epubBook.zf
+                    zip_names = epubBook.zip_names
                     zip_basenames = {os.path.basename(n): n for n in zip_names}
                     for doc_idx, doc in enumerate(all_docs):
-                        text = filter_blocks(session_id, doc_idx, doc, stanza_nlp, is_num2words_compat, non_text_filter, zf, zip_names, zip_basenames)
+                        timer = StageTimer(f'doc {doc_idx}', enabled=profiler is not None)
+                        text = filter_blocks(session_id, doc_idx, doc, date_entities, is_num2words_compat, non_text_filter, zf, zip_names, zip_basenames, timer)
+                        if profiler is not None:
+                            profiler.add(timer.rows)
                         if text is None:
                             error = f'Error extracting content from document #{doc_idx + 1}; aborting conversion to avoid partial output.'
                             show_alert(session_id, {"type": "warning", "msg": error})
                             return []
                         blocks.append(text)
             finally:
-                if stanza_nlp:
-                    import gc, torch
-                    try:
-                        cache_key = session.get('stanza_cache')
-                        if cache_key:
-                            loaded_tts.pop(cache_key, None)
-                        session['stanza_cache'] = None
-                    except Exception:
-                        pass
-                    stanza_nlp = None
-                    gc.collect()
-                    if torch.cuda.is_available():
-                        torch.cuda.empty_cache()
-                        torch.cuda.ipc_collect()
+                # the stanza pipeline stays in loaded_tts for the next book, on CPU it does not compete with the TTS
+                session['stanza_cache'] = None
+            write_text_profile(session_id)
             if len(blocks) == 0:
                 error = 'No blocks found! possible reason: file corrupted or need to convert images to text with OCR'
                 print(error)
@@ -1325,7 +1443,170 @@ INTO A NEW TRAINING MODEL. YOU CAN IMPROVE IT OR ASK TO A TRAINING MODEL EXPERT.
         DependencyError(error)
         return []
 
-def filter_blocks(session_id:str, idx:int, doc:EpubHtml, stanza_nlp:Pipeline, is_num2words_compat:bool, non_text_filter:NonTextFilter, zf:zipfile.ZipFile=None, zip_names:set=None, zip_basenames:dict=None)->str|None:
+def get_stanza_pipeline(lang_iso1:str)->Pipeline:
+    # date NER only sees short windows around years, the CPU pipeline is fast enough and is kept resident
+    stanza_model = f'stanza-{lang_iso1}'
+    stanza_nlp = loaded_tts.get(stanza_model, False)
+    if stanza_nlp:
+        msg = f'NLP model {stanza_model} loaded.'
+        print(msg)
+        return stanza_nlp
+    try:
+        stanza_nlp = new_stanza_pipeline(lang_iso1, False)
+    except (ConnectionError, TimeoutError) as e:
+        error = f'Stanza model download connection error: {e}. Retry later'
+        print(error)
+        raise
+    loaded_tts[stanza_model] = stanza_nlp
+    msg = f'NLP model {stanza_model} loaded!'
+    print(msg)
+    return stanza_nlp
+
+def new_stanza_pipeline(lang_iso1:str, use_gpu:bool)->Pipeline:
+    # only use mwt if the language supports it
+    stanza_has_mwt = False
+    try:
+        stanza_resources = stanza.resources.common.load_resources_json(os.getenv('STANZA_RESOURCES_DIR', stanza.resources.common.DEFAULT_MODEL_DIR))
+        stanza_has_mwt = 'mwt' in stanza_resources.get(lang_iso1, {})
+    except Exception:
+        pass
+    stanza_processors = 'tokenize,mwt,ner' if stanza_has_mwt else 'tokenize,ner'
+    return stanza.Pipeline(lang_iso1, processors=stanza_processors, use_gpu=use_gpu, download_method=DownloadMethod.REUSE_RESOURCES, dir=os.getenv('STANZA_RESOURCES_DIR'))
+
+def _filter_blocks_init(session:dict, ocr_threads:int)->None:
+    # spawned get_blocks() worker, kept between books of the same language: a one-session context,
+    # its own stanza pipeline (loaded on the first date candidate) and NonTextFilter built once for
+    # all the books it parses.
+    global context
+    os.environ['OMP_THREAD_LIMIT'] = str(ocr_threads)
+    context = SimpleNamespace(get_session=lambda _id: session)
+    filter_worker['session'] = session
+    filter_worker['error'] = None
+    try:
+        filter_worker['date_entities'] = DateEntities(lambda: new_stanza_pipeline(session['language_iso1'], False), session['language']) if session['language'] in year_to_decades_languages else None
+        filter_worker['is_num2words_compat'] = get_num2words_compat(session['language_iso1'])
+        filter_worker['non_text_filter'] = NonTextFilter(sml_pattern=SML_TAG_PATTERN, lang=session['language'])
+    except Exception as e:
+        filter_worker['error'] = f'filter_blocks worker init error: {e}'
+
+def _filter_blocks_task(task:tuple)->tuple:
+    session_id, epub_path, doc_idx, doc_id, file_name, zip_path = task
+    if filter_worker['error'] is not None:
+        print(filter_worker['error'])
+        return doc_idx, None, []
+    session = filter_worker['session']
+    session['id'] = session_id
+    session['epub_path'] = epub_path
+    # the zip is opened per document: an idle worker must not hold the epub of a finished book
+    try:
+        with zipfile.ZipFile(epub_path, 'r') as zf:
+            zip_names = set(zf.namelist())
+            zip_basenames = {os.path.basename(n): n for n in zip_names}
+            doc = epub.EpubHtml(uid=doc_id, file_name=file_name)
+            doc.content = zf.read(zip_path)
+            timer = StageTimer(f'doc {doc_idx}', enabled=profile_text)
+            text = filter_blocks(
+                session_id, doc_idx, doc, filter_worker['date_entities'], filter_worker['is_num2words_compat'],
+                filter_worker['non_text_filter'], zf, zip_names, zip_basenames, timer
+            )
+    except Exception as e:
+        print(f'filter_blocks worker error: {e}')
+        return doc_idx, None, []
+    return doc_idx, text, timer.rows
+
+def _acquire_filter_pool(snapshot:dict, workers:int)->tuple[Any, bool]:
+    # the pool is kept between books so its workers keep their stanza pipeline loaded.
+    # it is reused for a book of the same language needing at most as many workers, rebuilt
+    # otherwise; a parse running while another session holds it gets a throwaway pool.
+    key = (snapshot['language'], snapshot['language_iso1'], snapshot['tts_engine'])
+    initargs = (snapshot, max(1, cpu_count() // workers))
+    with filter_pool_lock:
+        if not filter_pool.get('busy'):
+            if filter_pool.get('timer') is not None:
+                filter_pool['timer'].cancel()
+                filter_pool['timer'] = None
+            if filter_pool.get('key') != key or filter_pool.get('workers', 0) < workers:
+                _close_filter_pool()
+                filter_pool['pool'] = multiprocessing.get_context('spawn').Pool(workers, initializer=_filter_blocks_init, initargs=initargs)
+                filter_pool['key'] = key
+                filter_pool['workers'] = workers
+            filter_pool['busy'] = True
+            return filter_pool['pool'], True
+    return multiprocessing.get_context('spawn').Pool(workers, initializer=_filter_blocks_init, initargs=initargs), False
+
+def _close_filter_pool()->None:
+    # filter_pool_lock held by the caller
+    if filter_pool.get('timer') is not None:
+        filter_pool['timer'].cancel()
+    if filter_pool.get('pool') is not None:
+        filter_pool['pool'].terminate()
+        filter_pool['pool'].join()
+    filter_pool.clear()
+
+def _close_idle_filter_pool(pool:Any)->None:
+    with filter_pool_lock:
+        if filter_pool.get('pool') is pool and not filter_pool.get('busy'):
+            msg = 'Closing the idle parse processes…'
+            print(msg)
+            _close_filter_pool()
+
+def _release_filter_pool(pool:Any, shared:bool, completed:bool)->None:
+    # tasks of a cancelled or failed parse may still be queued: that pool is not reused.
+    # an idle pool is closed after parse_pool_idle seconds so its processes do not stay resident
+    if shared and completed and parse_pool_idle > 0:
+        with filter_pool_lock:
+            filter_pool['busy'] = False
+            timer = threading.Timer(parse_pool_idle, _close_idle_filter_pool, args=(pool,))
+            timer.daemon = True
+            filter_pool['timer'] = timer
+            timer.start()
+        return
+    if shared:
+        with filter_pool_lock:
+            _close_filter_pool()
+        return
+    pool.terminate()
+    pool.join()
+
+def filter_blocks_parallel(session_id:str, all_docs:list, workers:int)->list|None:
+    # filter_blocks() over a spawn process pool, results come back in spine order.
+    # workers get a plain snapshot of the session keys filter_blocks() reads: cancellation is
+    # checked here between results and the pool is terminated on the first failed document.
+    session = context.get_session(session_id)
+    snapshot = {
+        "id": session_id,
+        "language": session['language'],
+        "language_iso1": session['language_iso1'],
+        "tts_engine": session['tts_engine'],
+        "epub_path": session['epub_path'],
+        "is_gui_process": False,
+        "cancellation_requested": False
+    }
+    # workers read the documents from their own zip handle
+    tasks = [(session_id, session['epub_path'], doc_idx, doc.id, doc.get_name(), doc.zip_path) for doc_idx, doc in enumerate(all_docs)]
+    msg = f'Parsing {len(tasks)} documents with {workers} processes…'
+    print(msg)
+    blocks = []
+    completed = False
+    pool, shared = _acquire_filter_pool(snapshot, workers)
+    try:
+        profiler = get_text_profiler(session_id)
+        for doc_idx, text, rows in pool.imap(_filter_blocks_task, tasks):
+            if profiler is not None:
+                profiler.add(rows)
+            if session['cancellation_requested']:
+                return None
+            if text is None:
+                error = f'Error extracting content from document #{doc_idx + 1}'
+                print(error)
+                return None
+            blocks.append(text)
+        completed = True
+        return blocks
+    finally:
+        _release_filter_pool(pool, shared, completed)
+
+def filter_blocks(session_id:str, idx:int, doc:EpubHtml, date_entities:DateEntities|None, is_num2words_compat:bool, non_text_filter:NonTextFilter, zf:zipfile.ZipFile=None, zip_names:set=None, zip_basenames:dict=None, timer:StageTimer|None=None)->str|None:
 
     def _tuple_row(node:Any, last_text_char:str|None=None, in_heading:bool=False)->Generator[tuple[str, Any], None, None]|None:
         try:
@@ -1408,6 +1689,7 @@ def filter_blocks(session_id:str, idx:int, doc:EpubHtml, stanza_nlp:Pipeline, is
     try:
         msg = f'----------\nParsing doc {idx}'
         print(msg)
+        timer = timer or StageTimer(f'doc {idx}', enabled=False)
         session = context.get_session(session_id)
         if session and session.get('id', False):
             lang, lang_iso1, tts_engine = session['language'], session['language_iso1'], session['tts_engine']
@@ -1419,6 +1701,7 @@ def filter_blocks(session_id:str, idx:int, doc:EpubHtml, stanza_nlp:Pipeline, is
             raw_html = doc_body.decode('utf-8') if isinstance(doc_body, bytes) else doc_body
             soup = BeautifulSoup(raw_html, 'html.parser')
             body = soup.body
+            timer.lap('html_parse', raw_html)
             if not body:
                 msg = 'No body found. Skip to next doc…'
                 print(msg)
@@ -1446,7 +1729,7 @@ def filter_blocks(session_id:str, idx:int, doc:EpubHtml, stanza_nlp:Pipeline, is
                 if images and zf:
                     msg = f'Doc {idx}: no text but {len(images)} image(s) detected. Running OCR…'
                     show_alert(session_id, {"type": "info", "msg": msg})
-                    ocr_parts = []
+                    ocr_jobs = []
                     doc_dir = os.path.dirname(doc.get_name())
                     for img_tag in images:
                         img_ref = (
@@ -1463,18 +1746,22 @@ def filter_blocks(session_id:str, idx:int, doc:EpubHtml, stanza_nlp:Pipeline, is
                         if not img_zip_path:
                             print(f'Could not resolve image in EPUB: {img_ref}')
                             continue
-                        try:
-                            img_data = zf.read(img_zip_path)
-                            img = Image.open(io.BytesIO(img_data))
-                            img = img.convert('RGB')
-                            xhtml_content, error = ocr2xhtml(img, lang)
-                            if xhtml_content:
-                                ocr_parts.append(xhtml_content)
-                            else:
-                                show_alert(session_id, {"type": "warning", "msg": error})
-                        except Exception as ocr_err:
-                            print(f'OCR error on {img_zip_path}: {ocr_err}')
+                        ocr_jobs.append(('zip', zf.filename, img_zip_path))
+                    ocr_parts = []
+                    for xhtml_content, error in ocr_images(session_id, ocr_jobs, lang):
+                        if xhtml_content:
+                            ocr_parts.append(xhtml_content)
+                        else:
+                            show_alert(session_id, {"type": "warning", "msg": error})
+                    if session['cancellation_requested']:
+                        return None
+                    # the recognized text replaces the images in the body parsed below
+                    if ocr_parts:
+                        body.clear()
+                        body.append(BeautifulSoup('\n'.join(ocr_parts), 'html.parser'))
+                    timer.lap('ocr', ''.join(ocr_parts))
             tuples_list = list(_tuple_row(body))
+            timer.lap('tuple_row', tuples_list)
             if not tuples_list:
                 msg = 'No body text and no images found. Skip to next doc…'
                 print(msg)
@@ -1541,6 +1828,7 @@ def filter_blocks(session_id:str, idx:int, doc:EpubHtml, stanza_nlp:Pipeline, is
                 clean_list.append(current)
                 i += 1
             text = ' '.join(clean_list)
+            timer.lap('flatten', text)
             if not re.search(r"[^\W_]", text):
                 error = 'No valid text found!'
                 print(error)
@@ -1550,17 +1838,21 @@ def filter_blocks(session_id:str, idx:int, doc:EpubHtml, stanza_nlp:Pipeline, is
             if res is False:
                 show_alert(session_id, {"type": "warning", "msg": text})
                 return None
+            timer.lap('normalize_sml_tags', text)
             # remove any [break] between words or cutting words
             break_token = re.escape(sml_token('break'))
             strip_break_spaces_re = re.compile(rf'\s*{break_token}\s*')
             break_between_alnum_re = re.compile(rf'(?<=[\w]){break_token}(?=[\w])', flags=re.UNICODE)
             text = strip_break_spaces_re.sub(sml_token('break'), text)
             text = break_between_alnum_re.sub(' ', text)
+            timer.lap('breaks', text)
             # strip non-prose content; preserves math signs for math2words
             text = non_text_filter(text)
+            timer.lap('non_text_filter', text)
             # escape all SML tags to not be touched by any text treatment
             text, sml_blocks = escape_sml(text)
-            if stanza_nlp:
+            timer.lap('escape_sml', text)
+            if date_entities:
                 msg = 'Converting dates and years to words…'
                 print(msg)
                 re_ordinal = re.compile(
@@ -1571,7 +1863,7 @@ def filter_blocks(session_id:str, idx:int, doc:EpubHtml, stanza_nlp:Pipeline, is
                 text = unicodedata.normalize('NFKC', text).replace('\u00A0', ' ')
                 re_year = re.compile(r'\b(?:1[0-9]|20)\d{2}\b')
                 if re_num.search(text) and (re_ordinal.search(text) or re_year.search(text)):
-                    date_spans = get_date_entities(text, stanza_nlp)
+                    date_spans = get_date_entities(text, date_entities)
                     if date_spans:
                         result = []
                         last_pos = 0
@@ -1616,19 +1908,26 @@ def filter_blocks(session_id:str, idx:int, doc:EpubHtml, stanza_nlp:Pipeline, is
                             lambda m: year2words(m.group(), lang, lang_iso1, is_num2words_compat),
                             text
                         )
+            if date_entities:
+                timer.lap('dates', text)
             msg = 'Convert romans to numbers…'
             print(msg)
             text = roman2number(text)
+            timer.lap('roman2number', text)
             msg = 'Convert time to words…'
             print(msg)
             text = clock2words(text, lang, lang_iso1, tts_engine, is_num2words_compat)
+            timer.lap('clock2words', text)
             msg = 'Convert numbers, maths signs to words…'
             print(msg)
             text = math2words(text, lang, lang_iso1, tts_engine, is_num2words_compat)
+            timer.lap('math2words', text)
             msg = 'Normalize text…'
             print(msg)
             text = normalize_text(text, lang, lang_iso1, tts_engine)
+            timer.lap('normalize_text', text)
             text = restore_sml(text, sml_blocks)
+            timer.lap('restore_sml', text)
             return text
         return None
     except Exception as e:
@@ -1680,10 +1979,10 @@ def get_sentences(session_id:str, text:str)->list|None:
         return parts
 
     def _strip_escaped_sml(s:str)->str:
-        return ''.join(c for c in s if ord(c) < sml_escape_tag)
+        return sml_escape_re.sub('', s)
 
     def _clean_len(s:str)->int:
-        return len(_strip_escaped_sml(s))
+        return len(sml_escape_re.sub('', s))
 
     def _is_latin_only(s:str)->bool:
         s = _strip_escaped_sml(s)
@@ -1692,32 +1991,12 @@ def get_sentences(session_id:str, text:str)->list|None:
         has_nonlatin = bool(re.search(r'[^\x00-\x7F]', s))
         return has_latin and not has_nonlatin
 
-    def _segment_ideogramms(text:str)->list[str]:
-        result = []
+    def _segment_ideogramms(parts:list[str])->list[list[str]]:
         try:
-            if lang in ['yue','yue-Hant','yue-Hans','zh-yue','cantonese']:
-                import pycantonese as pc
-                result.extend([t for t in pc.segment(text) if t.strip()])
-            elif lang == 'zho':
-                import jieba
-                jieba.dt.cache_file = os.path.join(models_dir, 'jieba.cache')
-                result.extend([t for t in jieba.cut(text) if t.strip()])
-            elif lang == 'jpn':
-                import nagisa
-                result.extend(nagisa.tagging(text).words)
-            elif lang == 'kor':
-                from soynlp.tokenizer import LTokenizer
-                ltokenizer = LTokenizer()
-                result.extend([t for t in ltokenizer.tokenize(text) if t.strip()])
-            elif lang in ['tha','lao','mya','khm']:
-                from pythainlp.tokenize import word_tokenize
-                result.extend([t for t in word_tokenize(text, engine='newmm') if t.strip()])
-            else:
-                result.append(text.strip())
-            return result
+            return get_word_segmenter(lang).segment_many(parts)
         except Exception as e:
             DependencyError(e)
-            return [text]
+            return [[part] for part in parts]
 
     def _join_ideogramms(idg_list:list[str])->str:
         try:
@@ -1757,45 +2036,51 @@ def get_sentences(session_id:str, text:str)->list|None:
         return s[i:].lstrip()
 
     def _force_split_segment(segment:str)->list[str]:
+        # segment[a:b] is the remainder still to split and esc the number of escaped SML chars in it:
+        # cursors move forward only, nothing is copied or rescanned beyond the current window.
         results = []
-        rest = segment
-        hard_set = tuple(punctuation_split_hard_set)
-        soft_set = tuple(punctuation_split_soft_set)
-        while rest:
-            if _clean_len(rest) <= max_chars:
-                results.append(rest.strip())
+        a, b = 0, len(segment)
+        esc = len(segment) - _clean_len(segment)
+        while a < b:
+            if (b - a) - esc <= max_chars:
+                results.append(segment[a:b].strip())
                 break
-            cut = rest[:max_chars + 1]
+            cut_end = min(a + max_chars + 1, b)
             best_idx = -1
             # 1) regress to the last hard punctuation in the window
-            for i in range(len(cut) - 1, -1, -1):
-                if cut[i] in hard_set:
-                    best_idx = i + 1
+            for i in range(cut_end - 1, a - 1, -1):
+                if segment[i] in hard_set:
+                    best_idx = i + 1 - a
                     break
             # 2) no hard punct -> regress to the last soft punctuation
             if best_idx == -1:
-                for i in range(len(cut) - 1, -1, -1):
-                    if cut[i] in soft_set:
-                        best_idx = i + 1
+                for i in range(cut_end - 1, a - 1, -1):
+                    if segment[i] in soft_set:
+                        best_idx = i + 1 - a
                         break
             # 3) no punctuation at all -> fall back to last space
             if best_idx == -1:
-                idx = cut.rfind(' ')
-                if idx > 0:
-                    best_idx = idx
+                idx = segment.rfind(' ', a, cut_end)
+                if idx > a:
+                    best_idx = idx - a
             # 4) last resort -> hard cut at max_chars
             if best_idx <= 0:
                 best_idx = max_chars
             # Safety: never cut inside an SML group
-            while best_idx < len(rest) and ord(rest[best_idx]) >= sml_escape_tag:
+            while a + best_idx < b and ord(segment[a + best_idx]) >= sml_escape_tag:
                 best_idx += 1
-            left = rest[:best_idx].strip()
-            right = rest[best_idx:].strip()
-            if not left or right == rest:
-                results.append(rest.strip())
+            left = segment[a:a + best_idx].strip()
+            next_a, next_b = a + best_idx, b
+            while next_a < next_b and segment[next_a].isspace():
+                next_a += 1
+            while next_b > next_a and segment[next_b - 1].isspace():
+                next_b -= 1
+            if not left or (next_a == a and next_b == b):
+                results.append(segment[a:b].strip())
                 break
             results.append(left)
-            rest = right
+            esc -= (next_a - a) - _clean_len(segment[a:next_a])
+            a, b = next_a, next_b
         return results
 
     try:
@@ -1807,30 +2092,23 @@ def get_sentences(session_id:str, text:str)->list|None:
             lang = session['translate']
         tts_engine = session['tts_engine']
         max_chars = int(language_mapping[lang]['max_chars'] / 2)
+        hard_set = frozenset(punctuation_split_hard_set)
+        soft_set = frozenset(punctuation_split_soft_set)
 
         text, sml_blocks = escape_sml(text)
         assert not SML_TAG_PATTERN.search(text)
+        sml_table = sml_restore_table(sml_blocks)
 
         # Tokenize into content and SML runs
         segments = []
         idx = 0
-        tlen = len(text)
-        current_text = []
-        while idx < tlen:
-            c = text[idx]
-            if ord(c) >= sml_escape_tag:
-                if current_text:
-                    segments.append(('text', ''.join(current_text)))
-                    current_text = []
-                start = idx
-                while idx < tlen and ord(text[idx]) >= sml_escape_tag:
-                    idx += 1
-                segments.append(('sml', text[start:idx]))
-            else:
-                current_text.append(c)
-                idx += 1
-        if current_text:
-            segments.append(('text', ''.join(current_text)))
+        for m in sml_escape_re.finditer(text):
+            if m.start() > idx:
+                segments.append(('text', text[idx:m.start()]))
+            segments.append(('sml', m.group(0)))
+            idx = m.end()
+        if idx < len(text):
+            segments.append(('text', text[idx:]))
 
         # SINGLE inline buffer — SML stays in position next to its surrounding text.
         # On overflow, cut at the LAST SML position in the buffer (a natural pause point).
@@ -1853,13 +2131,8 @@ def get_sentences(session_id:str, text:str)->list|None:
 
             # Doesn't fit. Try to cut at the rightmost SML run in the buffer.
             combined = ''.join(buffer)
-            cut_idx = -1
-            j = len(combined) - 1
-            while j >= 0:
-                if ord(combined[j]) >= sml_escape_tag:
-                    cut_idx = j + 1
-                    break
-                j -= 1
+            last_sml = sml_escape_last_re.search(combined)
+            cut_idx = last_sml.end() if last_sml else -1
 
             cut_done = False
             if 0 < cut_idx <= len(combined):
@@ -1958,7 +2231,9 @@ def get_sentences(session_id:str, text:str)->list|None:
         final_list = merged_list
 
         if lang in ['zho', 'jpn', 'kor', 'tha', 'lao', 'mya', 'khm']:
-            result = []
+            # SML parts are kept as is, the text parts are segmented in one batch
+            pieces = []
+            text_parts = []
             for s in final_list:
                 parts = _split_sentence_on_sml(s)
                 for part in parts:
@@ -1966,25 +2241,27 @@ def get_sentences(session_id:str, text:str)->list|None:
                     if not part:
                         continue
                     if _is_pure_escaped_sml(part) or SML_TAG_PATTERN.fullmatch(part):
-                        result.append(part)
-                        continue
-                    tokens = _segment_ideogramms(part)
-                    if isinstance(tokens, list):
-                        result.extend([t for t in tokens if t.strip()])
+                        pieces.append(part)
                     else:
-                        tokens = tokens.strip()
-                        if tokens:
-                            result.append(tokens)
+                        pieces.append(len(text_parts))
+                        text_parts.append(part)
+            segmented = _segment_ideogramms(text_parts) if text_parts else []
+            result = []
+            for piece in pieces:
+                if isinstance(piece, str):
+                    result.append(piece)
+                else:
+                    result.extend([t for t in segmented[piece] if t.strip()])
             ideogram_list = []
             for s in _join_ideogramms(result):
                 if not _is_latin_only(s):
                     ideogram_list.append(s)
             if ideogram_list:
-                ideogram_list = [restore_sml(s, sml_blocks) for s in ideogram_list]
+                ideogram_list = [s.translate(sml_table) for s in ideogram_list]
             return ideogram_list
 
         if final_list:
-            final_list = [restore_sml(s, sml_blocks) for s in final_list]
+            final_list = [s.translate(sml_table) for s in final_list]
         return final_list
     except Exception as e:
         print(f'get_sentences() error: {e}')
@@ -1998,14 +2275,13 @@ def get_sanitized(str:str, replacement:str='_')->str:
     sanitized = sanitized.strip('_')
     return sanitized
     
-def get_date_entities(text:str, stanza_nlp:Pipeline)->list[tuple[int,int,str]]|bool:
+def get_date_entities(text:str, date_entities:DateEntities)->list[tuple[int,int,str]]|bool:
+    # a pipeline that cannot load aborts the document, as the former upfront load did
+    windows = date_entities.candidates(text)
+    if windows:
+        date_entities.load()
     try:
-        doc = stanza_nlp(text)
-        date_spans = []
-        for ent in doc.ents:
-            if ent.type == 'DATE':
-                date_spans.append((ent.start_char, ent.end_char, ent.text))
-        return date_spans
+        return date_entities(text, windows)
     except Exception as e:
         error = f'get_date_entities() error: {e}'
         print(error)
@@ -2308,48 +2584,6 @@ def is_latin(s:str)->bool:
 
 def foreign2latin(text:str, base_lang:str)->str:
 
-    def _script_of(word:str)->str:
-        for ch in word:
-            if ch.isalpha():
-                name = unicodedata.name(ch, '')
-                if 'CYRILLIC' in name:
-                    return 'cyrillic'
-                if 'LATIN' in name:
-                    return 'latin'
-                if 'ARABIC' in name:
-                    return 'arabic'
-                if 'HANGUL' in name:
-                    return 'hangul'
-                if 'HIRAGANA' in name or 'KATAKANA' in name:
-                    return 'japanese'
-                if 'CJK' in name or 'IDEOGRAPH' in name:
-                    return 'chinese'
-        return 'unknown'
-
-    def _romanize(word:str)->str:
-        scr = _script_of(word)
-        if scr == 'latin':
-            return word
-        try:
-            if scr == 'chinese':
-                return ''.join(x[0] for x in pinyin(word, style=Style.NORMAL))
-            if scr == 'japanese':
-                k = pykakasi.kakasi()
-                k.setMode('H', 'a')
-                k.setMode('K', 'a')
-                k.setMode('J', 'a')
-                k.setMode('r', 'Hepburn')
-                return k.getConverter().do(word)
-            if scr == 'hangul':
-                return unidecode(word)
-            if scr == 'arabic':
-                return unidecode(phonemize(word, language='ar', backend='espeak'))
-            if scr == 'cyrillic':
-                return unidecode(phonemize(word, language='ru', backend='espeak'))
-            return unidecode(word)
-        except Exception:
-            return unidecode(word)
-
     # Protect ALL SML tags using the global grammar
     protected:dict[str, str] = {}
     for i, m in enumerate(SML_TAG_PATTERN.finditer(text)):
@@ -2357,14 +2591,9 @@ def foreign2latin(text:str, base_lang:str)->str:
         protected[key] = m.group(0)
         text = text.replace(m.group(0), key)
     tokens:list[str] = re.findall(r"\w+|[^\w\s]", text, re.UNICODE)
-    buf:list[str] = []
-    for t in tokens:
-        if t in protected:
-            buf.append(t)
-        elif re.match(r"^\w+$", t):
-            buf.append(_romanize(t))
-        else:
-            buf.append(t)
+    # all the words of the text are romanized in one batch, through the shared memo
+    romans = romanizer.romanize_many([t for t in tokens if t not in protected and re.match(r"^\w+$", t)])
+    buf:list[str] = [romans.get(t, t) if t not in protected else t for t in tokens]
     out:str = ''
     for i, t in enumerate(buf):
         if i == 0:
@@ -2428,10 +2657,12 @@ def escape_sml(text:str)->tuple[str, list[str]]:
 
     return SML_TAG_PATTERN.sub(_replace, text), sml_blocks
 
+def sml_restore_table(sml_blocks:list[str])->dict[int, str]:
+    # build once per text, then restore any number of its pieces in a single translate pass each
+    return {sml_escape_tag + i: block for i, block in enumerate(sml_blocks)}
+
 def restore_sml(text:str, sml_blocks:list[str])->str:
-    for i, block in enumerate(sml_blocks):
-        text = text.replace(chr(sml_escape_tag + i), block)
-    return text
+    return text.translate(sml_restore_table(sml_blocks))
 
 def sml_token(tag:str, value:str|None=None, close:bool=False)->str:
     if close:
@@ -2440,70 +2671,56 @@ def sml_token(tag:str, value:str|None=None, close:bool=False)->str:
         return f"[{tag}:{value}]"
     return f"[{tag}]"
 
-def normalize_text(text:str, lang:str, lang_iso1:str, tts_engine:str)->str:
+def get_text_normalizer(lang:str, tts_engine:str)->TextNormalizer:
+    # one compiled TextNormalizer per (language, engine), shared by get_blocks(), filter_blocks() and the GUI
+    key = (lang, tts_engine)
+    normalizer = text_normalizers.get(key)
+    if normalizer is None:
+        romanize = foreign2latin if language_mapping[lang]['script'] == 'latin' else None
+        normalizer = TextNormalizer(lang, sml_token('pause'), romanize)
+        text_normalizers[key] = normalizer
+    return normalizer
+
+def get_word_segmenter(lang:str)->WordSegmenter:
+    # one WordSegmenter per language and process, its tokenizer is set up on first use or by warm_word_segmenter()
+    segmenter = word_segmenters.get(lang)
+    if segmenter is None:
+        segmenter = word_segmenters.setdefault(lang, WordSegmenter(lang))
+    return segmenter
+
+def warm_word_segmenter(lang:str)->None:
+    # loads the tokenizer in the background while the ebook is being parsed
+    if lang not in WordSegmenter.LANGS:
+        return
+    def _warm():
+        try:
+            get_word_segmenter(lang).warm()
+        except Exception as e:
+            print(f'warm_word_segmenter() error: {e}')
+    threading.Thread(target=_warm, name=f'segmenter_warm_{lang}', daemon=True).start()
 
-    def _replace(match:re.Match)->str:
-        token = match.group(1)
-        for k, expansion in mapping.items():
-            if token.lower() == k.lower():
-                return expansion
-        return token  # fallback
-            
-    # Remove emojis
-    emoji_pattern = re.compile(f"[{''.join(emojis_list)}]+", flags=re.UNICODE)
-    emoji_pattern.sub('', text)
-    if lang in abbreviations_mapping:
-        mapping = abbreviations_mapping[lang]
-        # Sort keys by descending length so longer ones match first
-        keys = sorted(mapping.keys(), key=len, reverse=True)
-        # Build a regex that only matches whole “words” (tokens) exactly
-        pattern = re.compile(
-            r'(?<!\w)(' + '|'.join(re.escape(k) for k in keys) + r')(?!\w)',
-            flags=re.IGNORECASE
-        )
-        text = pattern.sub(_replace, text)
-    # This regex matches sequences like a., c.i.a., f.d.a., m.c., etc…
-    pattern = re.compile(r'\b(?:[a-zA-Z]\.){1,}[a-zA-Z]?\b\.?')
-    # uppercase acronyms
-    text = re.sub(r'\b(?:[a-zA-Z]\.){1,}[a-zA-Z]?\b\.?', lambda m: m.group().replace('.', '').upper(), text)
-    # romanize foreign words
-    if language_mapping[lang]['script'] == 'latin':
-        text = foreign2latin(text, lang)
-    # Replace multiple newlines ("\n\n", "\r\r", "\n\r", etc.) with a [pause] 1.4sec
-    pattern = r'(?:\r\n|\r|\n){2,}'
-    text = re.sub(pattern, f" {sml_token('pause')} ", text)
-    # Replace single newlines ("\n" or "\r") with spaces
-    text = re.sub(r'\r\n|\r|\n', ' ', text)
-    # Replace punctuations causing hallucinations
-    pattern = f"[{''.join(map(re.escape, punctuation_switch.keys()))}]"
-    text = re.sub(pattern, lambda match: punctuation_switch.get(match.group(), match.group()), text)
-    # remove unwanted chars
-    chars_remove_table = str.maketrans({ch: ' ' for ch in chars_remove})
-    text = text.translate(chars_remove_table)
-    # replace double quotes by a comma if no punctuation precedes it
-    text = re.sub(r'\s*"\s*', '"', text)
-    text = re.sub(r'(?<=[\p{L}\p{N}])"(?=[\p{L}\p{N}]|$)', ', ', text)
-    text = re.sub(r'"', '', text)
-    # Replace multiple and spaces with single space
-    text = re.sub(r'\s+', ' ', text)
-    # Replace ok by 'Owkey'
-    text = re.sub(r'\bok\b', 'Okay', text, flags=re.IGNORECASE)
-    # Escape special characters in the punctuation list for regex
-    pattern = '|'.join(map(re.escape, punctuation_split_hard_set))
-    # Reduce multiple consecutive punctuations hard
-    text = re.sub(rf'(\s*({pattern})\s*)+', r'\2 ', text).strip()
-    # Escape special characters in the punctuation list for regex
-    pattern = '|'.join(map(re.escape, punctuation_split_soft_set))
-    # Reduce multiple consecutive punctuations soft
-    text = re.sub(rf'(\s*({pattern})\s*)+', r'\2 ', text).strip()
-    # Pattern 1: Add a space between UTF-8 characters and numbers
-    text = re.sub(r'(?<=[\p{L}])(?=\d)|(?<=\d)(?=[\p{L}])', ' ', text)
-    # Replace special chars with words
-    specialchars = specialchars_mapping.get(lang, specialchars_mapping.get(default_language_code, specialchars_mapping['eng']))
-    specialchars_table = {ord(char): f" {word} " for char, word in specialchars.items()}
-    text = text.translate(specialchars_table)
-    text = ' '.join(text.split())
-    return text
+def get_text_profiler(session_id:str, new:bool=False)->TextProfiler|None:
+    # stage timings of the text preparation, collected only when profile_text is on
+    if not profile_text:
+        return None
+    if new or session_id not in text_profilers:
+        text_profilers[session_id] = TextProfiler()
+    return text_profilers[session_id]
+
+def write_text_profile(session_id:str, final:bool=False)->None:
+    profiler = text_profilers.get(session_id)
+    if profiler is None:
+        return
+    session = context.get_session(session_id)
+    profiler.write(os.path.join(session['process_dir'], 'text_profile'))
+    if final:
+        text_profilers.pop(session_id, None)
+        if not session.get('is_gui_process'):
+            msg = f"Text preparation profile ({os.path.join(session['process_dir'], 'text_profile')}.json/.csv):\n{profiler.summary()}"
+            print(msg)
+
+def normalize_text(text:str, lang:str, lang_iso1:str, tts_engine:str)->str:
+    return get_text_normalizer(lang, tts_engine)(text)
 
 def block_hash(block: dict) -> str:
     return hashlib.sha1(
@@ -2658,6 +2875,45 @@ def realign_blocks(session_id:str, blocks_orig_old:dict)->bool:
         exception_alert(session_id, f'realign_blocks() error: {e}')
         return False
 
+def _tts_signature(session:DictProxy)->tuple:
+    # everything a TTSManager reads from the session when its engine is built,
+    # the fine tuned xtts_*/bark_* parameters and the voice included: the preview can change them
+    keys = ['tts_engine', 'fine_tuned', 'custom_model', 'device', 'language', 'translate_enabled', 'translate', 'voice']
+    keys += sorted(k for k in session.keys() if k.startswith(('xtts_', 'bark_')))
+    return tuple((k, session.get(k)) for k in keys)
+
+def _tts_pool_workers(session:DictProxy)->int:
+    # TTSPool processes of the conversion, 0 when the TTS runs in this process
+    workers = int(session.get('workers') or 1)
+    return workers if workers > 1 and session['device'] == devices['CPU']['proc'] else 0
+
+def preload_tts_manager(session_id:str)->None:
+    # the engine load does not depend on the ebook: run it while calibre and get_blocks() work
+    session = context.get_session(session_id)
+    if not session or session['cancellation_requested'] or _tts_pool_workers(session):
+        return
+    tts_preloads.pop(session_id, None)
+    preload = {"signature": _tts_signature(session), "manager": None, "error": None}
+    def _load()->None:
+        try:
+            preload['manager'] = TTSManager(session)
+        except Exception as e:
+            preload['error'] = e
+    preload['thread'] = threading.Thread(target=_load, name=f'tts_preload_{session_id}', daemon=True)
+    tts_preloads[session_id] = preload
+    preload['thread'].start()
+
+def get_tts_manager(session_id:str)->TTSManager:
+    session = context.get_session(session_id)
+    preload = tts_preloads.pop(session_id, None)
+    if preload is not None:
+        preload['thread'].join()
+        if preload['manager'] is not None and preload['signature'] == _tts_signature(session):
+            return preload['manager']
+        if preload['error'] is not None:
+            print(f"TTS preload failed: {preload['error']}, loading again…")
+    return TTSManager(session)
+
 def convert_chapters2audio(session_id:str)->bool:
 
     def _reset_chapter_file(block_id:str)->None:
@@ -2682,14 +2938,164 @@ def convert_chapters2audio(session_id:str)->bool:
     def _count_sentences(sentences:list)->int:
         return sum(1 for s in sentences if any(c.isalnum() for c in s.strip()))
 
+    def _save_resume()->None:
+        nonlocal baseline_initialized, last_save_time
+        now = time.monotonic()
+        if not baseline_initialized:
+            session['blocks_current'] = blocks_current
+            session['blocks_saved'] = copy.deepcopy(blocks_current)
+            save_json_blocks(session_id, 'blocks_saved')
+            baseline_initialized = True
+        elif now - last_save_time >= 5:
+            session['blocks_current'] = blocks_current
+            save_db_stamp(session_id)
+            last_save_time = now
+
+    def _split_sentences()->None:
+        # producer: fills block['sentences'] in book order while the TTS consumes the blocks already split.
+        # it never runs more than sentences_split_ahead blocks ahead of the block being synthesized.
+        for idx, block in enumerate(blocks):
+            with split_cond:
+                while idx - split_state['consumed'] > sentences_split_ahead and not split_state['stop']:
+                    split_cond.wait()
+                if split_state['stop'] or session['cancellation_requested']:
+                    return
+            if not block['keep'] or not block['text'].strip():
+                block['sentences'] = []
+            elif not block.get('sentences'):
+                timer = StageTimer(f'block {idx}', block['text'], enabled=profiler is not None)
+                sentences_list = get_sentences(session_id, block['text'])
+                if profiler is not None:
+                    timer.lap('get_sentences', sentences_list)
+                    profiler.add(timer.rows)
+                if sentences_list is None:
+                    with split_cond:
+                        split_state['error'] = f'No sentences found in block {idx}!'
+                        split_cond.notify_all()
+                    return
+                block['sentences'] = sentences_list
+            with split_cond:
+                split_state['ready'] = idx + 1
+                split_cond.notify_all()
+        write_text_profile(session_id)
+
+    def _wait_sentences(x:int)->bool:
+        with split_cond:
+            split_state['consumed'] = x
+            split_cond.notify_all()
+            while split_state['ready'] <= x:
+                if split_state['error'] is not None:
+                    show_alert(session_id, {'type': 'warning', 'msg': split_state['error']})
+                    return False
+                if session['cancellation_requested'] or not split_thread.is_alive():
+                    return False
+                split_cond.wait(timeout=1)
+        return True
+
+    def _assemble_blocks()->None:
+        # consumer: combines each finished block into its chapter file while the TTS goes on with the next ones.
+        # the first failure is kept for the TTS loop, the blocks queued after it are dropped.
+        # gradio alerts only reach the UI from the request thread: messages are queued for the TTS loop
+        while True:
+            job = assemble_queue.get()
+            try:
+                if job is None:
+                    return
+                if assemble_state['error'] is not None or session['cancellation_requested']:
+                    continue
+                x, ch_num, block_id, chapter_audio_file, block_len, sent_start, sent_end = job
+                assemble_state['alerts'].put({'type': 'info', 'msg': f'Combining chapter {ch_num} (block {x}) to audio, sentence {sent_start} to {sent_end}'})
+                if not combine_audio_sentences(session_id, chapter_audio_file, block_id, block_len) and not session['cancellation_requested']:
+                    assemble_state['error'] = f'combine_audio_sentences() failed on block {x}!'
+            except Exception as e:
+                assemble_state['error'] = f'_assemble_blocks() error: {e}'
+            finally:
+                assemble_queue.task_done()
+
+    def _pool_submit_next(x:int)->None:
+        # queues the next block behind the current one so the workers do not idle while it drains.
+        # only a block past the resume point, which is converted in full, is queued ahead
+        for y in range(x + 1, len(blocks)):
+            next_block = blocks[y]
+            if not (next_block['keep'] and next_block['text'].strip()):
+                continue
+            with split_cond:
+                if split_state['ready'] <= y:
+                    return
+            if y <= block_resume or tts_pool.submitted(y):
+                return
+            next_dir = os.path.join(session['sentences_dir'], next_block['id'])
+            os.makedirs(next_dir, exist_ok=True)
+            items = [
+                (j, os.path.join(next_dir, f'{j}.{default_audio_proc_format}'), s.strip())
+                for j, s in enumerate(next_block['sentences']) if any(c.isalnum() for c in s.strip())
+            ]
+            if items:
+                tts_pool.submit(y, items, next_block.get('voice') or session.get('voice'))
+            return
+
+    def _assemble_failed()->bool:
+        while not assemble_state['alerts'].empty():
+            show_alert(session_id, assemble_state['alerts'].get_nowait())
+        if assemble_state['error'] is not None:
+            show_alert(session_id, {'type': 'warning', 'msg': assemble_state['error']})
+            return True
+        return False
+
+    def _estimate_total()->int:
+        # exact count over the blocks already split, the others are estimated from their text length
+        known_sentences = known_chars = unknown_chars = 0
+        for i, b in enumerate(blocks):
+            if not (b['keep'] and b['text'].strip()):
+                continue
+            if i < split_state['ready']:
+                known_sentences += _count_sentences(b['sentences'])
+                known_chars += len(b['text'])
+            else:
+                unknown_chars += len(b['text'])
+        chars_per_sentence = (known_chars / known_sentences) if known_sentences else 100
+        return max(1, known_sentences + round(unknown_chars / chars_per_sentence))
+
+    def _sentence_progress(sentence:str)->None:
+        nonlocal global_sent
+        global_sent += 1
+        total_progress = min(1.0, (t.n + 1) / t.total)
+        if session['is_gui_process']:
+            progress_bar(progress=total_progress, desc=f'{ebook_name} - {sentence}')
+        t.set_description(f'{total_progress * 100:.2f}%')
+        print(f' : {sentence}')
+        t.update(1)
+
     session = context.get_session(session_id)
     if not (session and session.get('id', False)):
         return False
+    tts_pool = None
+    pinned_key = None
+    split_thread = None
+    split_cond = threading.Condition()
+    split_state = {"ready": 0, "consumed": 0, "error": None, "stop": False}
+    assemble_thread = None
+    assemble_queue = queue.Queue()
+    assemble_state = {"error": None, "alerts": queue.Queue()}
+    profiler = get_text_profiler(session_id)
     try:
         if session['cancellation_requested']:
             return False
         print(f'*********** Session: {session_id} **************\n{session_info}')
-        tts_manager = TTSManager(session)
+        workers = _tts_pool_workers(session)
+        if workers:
+            # each worker loads its own engine, none is needed in this process
+            msg = f'Starting {workers} TTS worker processes…'
+            print(msg)
+            tts_pool = TTSPool(session, workers)
+            tts_manager = None
+        else:
+            if int(session.get('workers') or 1) > 1:
+                show_alert(session_id, {'type': 'warning', 'msg': f"--workers is only used on CPU, {session['device'].upper()} runs a single worker."})
+            tts_manager = get_tts_manager(session_id)
+            # keep the engine of this conversion resident whatever other sessions load meanwhile
+            pinned_key = getattr(tts_manager.engine, 'tts_key', None)
+            loaded_tts.pin(pinned_key)
         blocks_current = session['blocks_current']
         blocks = blocks_current['blocks']
         block_resume = blocks_current['block_resume']
@@ -2712,7 +3118,7 @@ def convert_chapters2audio(session_id:str)->bool:
                     if old_voice is None:
                         new_voice = None
                     else:
-                        new_voice, error = tts_manager.set_voice(old_voice)
+                        new_voice, error = (tts_manager if tts_pool is None else tts_pool).set_voice(old_voice)
                         if new_voice is None and error is not None:
                             show_alert(session_id, {'type': 'warning', 'msg': error})
                             return False
@@ -2735,10 +3141,14 @@ def convert_chapters2audio(session_id:str)->bool:
         if total_chapters == 0:
             show_alert(session_id, {'type': 'warning', 'msg': 'No chapters found!'})
             return False
-        total_sentences = sum(_count_sentences(b['sentences']) for b in blocks if b['keep'] and b['text'].strip())
-        if total_sentences == 0:
-            show_alert(session_id, {'type': 'warning', 'msg': 'No sentences found!'})
+        print('Get sentences…')
+        split_thread = threading.Thread(target=_split_sentences, name=f'split_sentences_{session_id}', daemon=True)
+        split_thread.start()
+        assemble_thread = threading.Thread(target=_assemble_blocks, name=f'assemble_blocks_{session_id}', daemon=True)
+        assemble_thread.start()
+        if not _wait_sentences(0):
             return False
+        total_sentences = _estimate_total()
         if not session['ebook']:
             return False
         ebook_name = Path(session['ebook']).name
@@ -2751,14 +3161,19 @@ def convert_chapters2audio(session_id:str)->bool:
         msg = (f'---------<br/>'
                f"{session['filename_noext']}<br/>"
                f"A total of {total_chapters} {'block' if total_chapters <= 1 else 'blocks'} "
-               f"and {total_sentences} {'sentence' if total_sentences <= 1 else 'sentences'}."
+               f"and about {total_sentences} {'sentence' if total_sentences <= 1 else 'sentences'}."
                f'<br/>---------')
         show_alert(session_id, {'type': 'info', 'msg': msg})
         with tqdm(total=total_sentences, desc='0.00%', bar_format='{desc}: {n_fmt}/{total_fmt} ', unit='step', initial=0) as t:
             for x, block in enumerate(blocks):
+                if not _wait_sentences(x):
+                    return False
+                if t.total != (total := _estimate_total()):
+                    t.total = total
+                    t.refresh()
                 if not (block['keep'] and block['text'].strip()):
                     continue
-                if session['cancellation_requested']:
+                if session['cancellation_requested'] or _assemble_failed():
                     return False
                 ch_num += 1
                 block_id = block['id']
@@ -2770,6 +3185,9 @@ def convert_chapters2audio(session_id:str)->bool:
                 current_hash = block_hash(block)
                 block_ref = prev_blocks.get(block_id)
                 hash_ref = block_hash(block_ref) if block_ref else None
+                if block_ref and not block_ref.get('sentences'):
+                    # the baseline was saved before this block was split: compare without sentences
+                    current_hash = block_hash({**block, 'sentences': []})
                 block_changed = block_ref is not None and hash_ref != current_hash
                 missing_sentences = set()
                 start_sentence = 0
@@ -2777,6 +3195,14 @@ def convert_chapters2audio(session_id:str)->bool:
                 block_dir = os.path.join(sentences_dir, block_id)
                 if x < block_resume and not block_changed:
                     if not os.path.exists(chapter_audio_file):
+                        if os.path.isdir(block_dir) and not _check_block_sentences(block_id, sentences):
+                            # all the sentences are there, only the background assembly did not complete
+                            show_alert(session_id, {'type': 'info', 'msg': f'Block {x} chapter audio missing, combining its sentences…'})
+                            cnt = len(valid_idx)
+                            global_sent += cnt
+                            t.update(cnt)
+                            assemble_queue.put((x, ch_num, block_id, chapter_audio_file, block_len, sent_start, global_sent - 1))
+                            continue
                         show_alert(session_id, {'type': 'warning', 'msg': f'Block {x} chapter audio missing, reconverting entire block…'})
                         _reset_chapter_file(block_id)
                     else:
@@ -2804,6 +3230,12 @@ def convert_chapters2audio(session_id:str)->bool:
                 save_db_stamp(session_id)
                 converted = False
                 block_voice = block.get('voice') or session.get('voice')
+                # consecutive sentences of the block share the same voice: batch them when the engine can,
+                # or hand the whole block to the worker pool which shards it in disjoint sentence ranges,
+                # the next block queued behind it.
+                batch_size = block_len if tts_pool is not None else tts_manager.get_batch_size()
+                last_valid_idx = max(valid_idx) if valid_idx else -1
+                pending = []
                 for j in range(block_len):
                     if session['cancellation_requested']:
                         msg = 'Conversion Cancelled'
@@ -2814,39 +3246,63 @@ def convert_chapters2audio(session_id:str)->bool:
                             if j == start_sentence and start_sentence > 0:
                                 show_alert(session_id, {'type': 'info', 'msg': f'*** Resuming from sentence {global_sent} ***'})
                             sentence_file = os.path.join(block_dir, f'{j}.{default_audio_proc_format}')
-                            run, error = tts_manager.convert_sentence2audio(sentence_file, sentence, block_voice=block_voice)
+                            pending.append((j, sentence_file, sentence))
+                            if len(pending) < batch_size and j < last_valid_idx:
+                                continue
+                            if tts_pool is not None:
+                                # workers finish out of order: the resume pointer only moves over
+                                # the contiguous run of converted sentences
+                                done_idx = set()
+                                resume_pos = 0
+                                _pool_submit_next(x)
+                                for k, run, error in tts_pool.convert(x, pending, block_voice):
+                                    if not run:
+                                        show_alert(session_id, {'type': 'warning', 'msg': error})
+                                        return False
+                                    done_idx.add(k)
+                                    while resume_pos < len(pending) and pending[resume_pos][0] in done_idx:
+                                        blocks_current['sentence_resume'] = pending[resume_pos][0]
+                                        resume_pos += 1
+                                    _save_resume()
+                                    _sentence_progress(sentences[k].strip())
+                                pending = []
+                                converted = True
+                                continue
+                            if len(pending) == 1:
+                                run, error = tts_manager.convert_sentence2audio(sentence_file, sentence, block_voice=block_voice)
+                            else:
+                                run, error = tts_manager.convert_sentences2audio([(f, s) for _, f, s in pending], block_voice=block_voice)
                             if not run:
                                 show_alert(session_id, {'type': 'warning', 'msg': error})
                                 return False
+                            done = [s for _, _, s in pending]
+                            pending = []
                             converted = True
                             blocks_current['sentence_resume'] = j
-                            now = time.monotonic()
-                            if not baseline_initialized:
-                                session['blocks_current'] = blocks_current
-                                session['blocks_saved'] = copy.deepcopy(blocks_current)
-                                save_json_blocks(session_id, 'blocks_saved')
-                                baseline_initialized = True
-                            elif now - last_save_time >= 5:
-                                session['blocks_current'] = blocks_current
-                                save_db_stamp(session_id)
-                                last_save_time = now
-                        global_sent += 1
-                        total_progress = (t.n + 1) / total_sentences
-                        if session['is_gui_process']:
-                            progress_bar(progress=total_progress, desc=f'{ebook_name} - {sentence}')
-                        t.set_description(f'{total_progress * 100:.2f}%')
-                        print(f' : {sentence}')
-                        t.update(1)
+                            _save_resume()
+                        else:
+                            done = [sentence]
+                        for sentence_done in done:
+                            _sentence_progress(sentence_done)
                 sent_end = global_sent - 1
                 show_alert(session_id, {'type': 'info', 'msg': f'End of Chapter {ch_num} (block {x})'})
                 if converted or block_changed or missing_sentences:
-                    show_alert(session_id, {'type': 'info', 'msg': f'Combining chapter {ch_num} (block {x}) to audio, sentence {sent_start} to {sent_end}'})
                     session['blocks_current'] = blocks_current
                     save_db_stamp(session_id)
                     last_save_time = time.monotonic()
-                    if not combine_audio_sentences(session_id, chapter_audio_file, block_id, block_len):
-                        show_alert(session_id, {'type': 'warning', 'msg': 'combine_audio_sentences() failed!'})
-                        return False
+                    # combined in the background, the TTS starts the next block right away
+                    assemble_queue.put((x, ch_num, block_id, chapter_audio_file, block_len, sent_start, sent_end))
+            if assemble_queue.unfinished_tasks:
+                print(f'Waiting for {assemble_queue.unfinished_tasks} block(s) to be combined…')
+            assemble_queue.join()
+            if session['cancellation_requested'] or _assemble_failed():
+                return False
+            if global_sent == 0:
+                show_alert(session_id, {'type': 'warning', 'msg': 'No sentences found!'})
+                return False
+            if tts_manager is not None:
+                print(tts_manager.cache_stats())
+                print(loaded_tts.stats())
             #blocks_current['block_resume'] = 0
             #blocks_current['sentence_resume'] = 0
             session['blocks_current'] = blocks_current
@@ -2858,6 +3314,18 @@ def convert_chapters2audio(session_id:str)->bool:
         DependencyError(e)
         exception_alert(session_id, f'convert_chapters2audio() error: {e}')
         return False
+    finally:
+        with split_cond:
+            split_state['stop'] = True
+            split_cond.notify_all()
+        if assemble_thread is not None:
+            # queued blocks are dropped on cancellation or failure, the one being combined is awaited
+            assemble_queue.put(None)
+            assemble_thread.join()
+        if tts_pool is not None:
+            tts_pool.close()
+        if pinned_key is not None:
+            loaded_tts.unpin(pinned_key)
 
 def combine_audio_sentences(session_id:str, file:str, block_id:str, sentence_count:int)->bool:
     try:
@@ -2884,18 +3352,22 @@ def combine_audio_sentences(session_id:str, file:str, block_id:str, sentence_cou
             error = f'Missing sentence files in block {block_id}: {missing}'
             print(error)
             return False
-        concat_dir = session['process_dir']
-        concat_list = os.path.join(concat_dir, 'concat_list_sentences.txt')
-        with open(concat_list, 'w') as f:
-            for path in selected_files:
-                if session['cancellation_requested']:
-                    return False
-                f.write(f"file '{path.as_posix()}'\n")
-        result = assemble_audio_chunks(concat_list, file, session['is_gui_process'])
-        if not result:
-            error = 'combine_audio_sentences() FFmpeg concat failed.'
-            print(error)
+        # sentence files are appended in-process, ffmpeg only when they do not share one format
+        result = concat_audio_files([str(path) for path in selected_files], file, lambda: session['cancellation_requested'])
+        if session['cancellation_requested']:
             return False
+        if not result:
+            concat_dir = session['process_dir']
+            concat_list = os.path.join(concat_dir, 'concat_list_sentences.txt')
+            with open(concat_list, 'w') as f:
+                for path in selected_files:
+                    f.write(f"file '{path.as_posix()}'\n")
+            durations = DurationManifest(session['blocks_current_db']).durations([str(path) for path in selected_files])
+            result = assemble_audio_chunks(concat_list, file, session['is_gui_process'], sum(durations.values()))
+            if not result:
+                error = 'combine_audio_sentences() FFmpeg concat failed.'
+                print(error)
+                return False
         msg = f'********* Combined block audio file saved in {file}'
         print(msg)
         return True
@@ -2960,7 +3432,7 @@ def combine_audio_chapters(session_id:str)->list[str]|None:
                         bar.close()
                     return False
                 filepath = os.path.join(session['chapters_dir'], filename)
-                duration_ms = len(AudioSegment.from_file(filepath, format=default_audio_proc_format))
+                duration_ms = int(chapter_durations[os.path.realpath(filepath)] * 1000)
                 clean_title = re.sub(r'(^#)|[=\\]|(-$)', lambda m: '\\' + (m.group(1) or m.group(0)), sanitize_meta_chapter_title(chapter_title))
                 ffmpeg_metadata += '[CHAPTER]\nTIMEBASE=1/1000\n'
                 ffmpeg_metadata += f'START={start_time}\nEND={start_time + duration_ms}\n'
@@ -3052,7 +3524,7 @@ def combine_audio_chapters(session_id:str)->list[str]|None:
                     '-y', final_file
                 ]
             progress_desc = f'Export Part {part_num}' if part_num is not None else 'Export'
-            proc_pipe = SubprocessPipe(cmd, is_gui_process=is_gui_process, total_duration=get_audio_duration(combined_audio), msg='Export', on_progress=lambda p: _on_progress(p, progress_desc))
+            proc_pipe = SubprocessPipe(cmd, is_gui_process=is_gui_process, total_duration=manifest.duration(combined_audio), msg='Export', on_progress=lambda p: _on_progress(p, progress_desc))
             if not proc_pipe.result:
                 error = f'ffmpeg export failed for {final_file}'
                 print(error)
@@ -3124,23 +3596,12 @@ def combine_audio_chapters(session_id:str)->list[str]|None:
         if len(chapter_files) == 0:
             print('No block files exist!')
             return None
-        chunks_size = 892
-        total_duration = 0.0
-        durations = []
-        for i in range(0, len(chapter_files), chunks_size):
-            filepaths = [
-                os.path.join(session['chapters_dir'], f)
-                for f in chapter_files[i:i + chunks_size]
-            ]
-            durations_dict = get_audiolist_duration(filepaths)
-            for path in filepaths:
-                dur = durations_dict.get(path, 0.0)
-                durations.append(dur)
-                total_duration += dur
-        if len(durations) != len(chapter_files):
-            error = f'Duration count mismatch: {len(durations)} durations vs {len(chapter_files)} chapter files'
-            print(error)
-            return None
+        # durations from the manifest of the session DB, the chapter files are only measured once
+        manifest = DurationManifest(session['blocks_current_db'])
+        chapter_paths = [os.path.join(session['chapters_dir'], f) for f in chapter_files]
+        chapter_durations = manifest.durations(chapter_paths)
+        durations = [chapter_durations[os.path.realpath(path)] for path in chapter_paths]
+        total_duration = sum(durations)
         exported_files = []
         concat_dir = session['process_dir']
         if session.get('output_split'):
@@ -3176,7 +3637,7 @@ def combine_audio_chapters(session_id:str)->list[str]|None:
                         path = Path(session['chapters_dir']) / file
                         f.write(f"file '{path.as_posix()}'\n")
                 merged_audio = Path(session['process_dir']) / f"{get_sanitized(session['metadata']['title'])}_part{part_idx+1:0{pad_width}d}.{default_audio_proc_format}"
-                result = assemble_audio_chunks(concat_list, merged_audio, is_gui_process)
+                result = assemble_audio_chunks(concat_list, merged_audio, is_gui_process, sum(durations[i] for i in indices))
                 if not result:
                     error = f'assemble_audio_chunks() Final merge failed for part {part_idx+1}.'
                     print(error)
@@ -3201,7 +3662,7 @@ def combine_audio_chapters(session_id:str)->list[str]|None:
                         return None
                     path = Path(session['chapters_dir']) / file
                     f.write(f"file '{path.as_posix()}'\n")
-            result = assemble_audio_chunks(concat_list, merged_audio, is_gui_process)
+            result = assemble_audio_chunks(concat_list, merged_audio, is_gui_process, total_duration)
             if not result:
                 print(f'assemble_audio_chunks() Final merge failed for {merged_audio}.')
                 return None
@@ -3216,34 +3677,35 @@ def combine_audio_chapters(session_id:str)->list[str]|None:
         DependencyError(e)
         return None
 
-def assemble_audio_chunks(txt_file:str, out_file:str, is_gui_process:bool)->bool:
+def assemble_audio_chunks(txt_file:str, out_file:str, is_gui_process:bool, total_duration:float|None=None)->bool:
 
     def _on_progress(p:float)->None:
         if is_gui_process:
             progress_bar(p / 100.0, desc='Assemble')
 
     try:
-        total_duration = 0.0
-        filepaths = []
-        try:
-            with open(txt_file, 'r') as f:
-                for line in f:
-                    if line.strip().startswith('file'):
-                        file_path = (
-                            line.strip()
-                            .split('file ')[1]
-                            .strip()
-                            .strip("'")
-                            .strip('"')
-                        )
-                        if os.path.exists(file_path):
-                            filepaths.append(file_path)
-            durations = get_audiolist_duration(filepaths)
-            total_duration = sum(durations.values())
-        except Exception as e:
-            error = f'assemble_audio_chunks() open file {txt_file} Error: {e}'
-            print(error)
-            return False
+        # the callers pass the total from the duration manifest, the list is only measured without it
+        if total_duration is None:
+            filepaths = []
+            try:
+                with open(txt_file, 'r') as f:
+                    for line in f:
+                        if line.strip().startswith('file'):
+                            file_path = (
+                                line.strip()
+                                .split('file ')[1]
+                                .strip()
+                                .strip("'")
+                                .strip('"')
+                            )
+                            if os.path.exists(file_path):
+                                filepaths.append(file_path)
+                durations = get_audiolist_duration(filepaths)
+                total_duration = sum(durations.values())
+            except Exception as e:
+                error = f'assemble_audio_chunks() open file {txt_file} Error: {e}'
+                print(error)
+                return False
         ffmpeg = shutil.which('ffmpeg')
         if not ffmpeg:
             error = 'ffmpeg not found'
@@ -3557,6 +4019,7 @@ def convert_ebook(args:dict)->tuple:
             session['is_gui_process'] = bool(args['is_gui_process'])
             session['blocks_preview'] = bool(args['blocks_preview']) if args.get('blocks_preview') else False
             session['device'] = str(args['device'])
+            session['workers'] = max(1, int(args.get('workers') or 1))
             session['language'] = str(args['language'])
             session['language_iso1'] = str(args['language_iso1'])
             session['translate_enabled'] = bool(args.get('translate_enabled', False))
@@ -3708,6 +4171,8 @@ def convert_ebook(args:dict)->tuple:
                             show_alert(session_id, {"type": "warning", "msg": msg + msg_extra})
                         else:
                             show_alert(session_id, {"type": "info", "msg": msg_extra})
+                        preload_tts_manager(session_id)
+                        warm_word_segmenter(session['language'])
                         session['epub_path'] = os.path.join(session['process_dir'], f"__{session['filename_noext']}.epub")
                         session['blocks_orig_json'] = os.path.join(session['process_dir'], f"{file_prefixes['clone']}{session['filename_noext']}.json")
                         session['blocks_saved_json']   = os.path.join(session['process_dir'], f"{file_prefixes['saved']}{session['filename_noext']}.json")
@@ -3784,108 +4249,115 @@ def convert_ebook(args:dict)->tuple:
                                         blocks_current['blocks'] = blocks
                                         session['blocks_current'] = blocks_current
                                         save_db_blocks(session_id)
-                            epubBook = epub.read_epub(session['epub_path'], {'ignore_ncx': True})
-                            if epubBook:
-                                metadata = dict(session['metadata'])
-                                for key, value in metadata.items():
-                                    data = epubBook.get_metadata('DC', key)
-                                    if data:
-                                        for value, attributes in data:
-                                            metadata[key] = value
-                                metadata['language'] = final_language
-                                metadata['title'] = metadata['title'] or Path(session['ebook']).stem.replace('_', ' ')
-                                metadata['creator'] = False if not metadata['creator'] or metadata['creator'] == 'Unknown' else metadata['creator']
-                                session['metadata'] = metadata
-                                try:
-                                    if len(session['metadata']['language']) == 2:
-                                        lang_dict = Lang(final_language)
-                                        if lang_dict:
-                                            session['metadata']['language'] = lang_dict.pt3
-                                except Exception as e:
-                                    pass
-                                if not session.get('translate_enabled'):
-                                    if session['metadata']['language'] != session['language']:
-                                        error = f"WARNING!!! language selected {session['language']} differs from the EPUB file language {session['metadata']['language']}"
-                                        show_alert(session_id, {'type': 'warning', 'msg': error})
-                                is_lang_in_tts_engine = (
-                                    session.get('tts_engine') in default_engine_settings and
-                                    final_language in default_engine_settings[session['tts_engine']].get('languages', {})
-                                )
-                                if is_lang_in_tts_engine:
-                                    session['cover'] = get_cover(epubBook, session_id)
-                                    if session.get('cover', False):
-                                        if missing_orig_json:
-                                            raw_blocks = get_blocks(session_id, epubBook)
-                                            if raw_blocks and session.get('translate_enabled'):
-                                                raw_blocks, error = translate_blocks(session_id, list(raw_blocks))
-                                                if error is not None:
-                                                    return error, False
-                                            if raw_blocks:
-                                                session['blocks_orig'] = {
-                                                    "page": 0,
-                                                    "block_resume": 0,
-                                                    "sentence_resume": 0,
-                                                    "voice": session['voice'],
-                                                    "tts_engine": session['tts_engine'],
-                                                    "fine_tuned": session['fine_tuned'],
-                                                    "blocks": [
-                                                        {
-                                                            "id": str(uuid.uuid4()),
-                                                            "expand": False,
-                                                            "keep": True,
-                                                            "text": t,
-                                                            "voice": session['voice'],
-                                                            "tts_engine": session['tts_engine'],
-                                                            "fine_tuned": session['fine_tuned'],
-                                                            "sentences": [],
-                                                        }
-                                                        for t in raw_blocks if t
-                                                    ],
-                                                }
-                                            if session.get('blocks_orig', {}):
-                                                if blocks_orig_old:
-                                                    if not realign_blocks(session_id, blocks_orig_old):
-                                                        # realign failed or nothing to migrate: restart from scratch.
-                                                        # loud on purpose: a silent fallback here looks like a random
-                                                        # full reconversion and is the whole bug class this guards.
-                                                        msg = 'realign_blocks() could not migrate the previous work: restarting the conversion from scratch.'
-                                                        print(msg)
-                                                        show_alert(session_id, {'type': 'warning', 'msg': msg})
-                                                        session['blocks_saved'] = {}
-                                                        session['blocks_current'] = {}
-                                                        if os.path.exists(session['blocks_saved_json']):
-                                                            os.unlink(session['blocks_saved_json'])
-                                                save_json_blocks(session_id, 'blocks_orig')
-                                        if not session.get('blocks_current', {}):
-                                            session['blocks_current'] = copy.deepcopy(session['blocks_orig'])
-                                            save_db_blocks(session_id)
-                                        if session.get('blocks_orig', {}) and session.get('blocks_current', {}):
-                                            sync_globals_to_blocks(session_id)
-                                            if session['blocks_preview']:
-                                                msg = f'Chapters preview requested. Select which block to convert:'
-                                                print(msg)
-                                                progress_status = os.path.basename(session['ebook'])
-                                                return progress_status, True
+                            with EpubReader(session['epub_path']) as epubBook:
+                                if epubBook:
+                                    metadata = dict(session['metadata'])
+                                    for key, value in metadata.items():
+                                        data = epubBook.get_metadata('DC', key)
+                                        if data:
+                                            for value, attributes in data:
+                                                metadata[key] = value
+                                    metadata['language'] = final_language
+                                    metadata['title'] = metadata['title'] or Path(session['ebook']).stem.replace('_', ' ')
+                                    metadata['creator'] = False if not metadata['creator'] or metadata['creator'] == 'Unknown' else metadata['creator']
+                                    session['metadata'] = metadata
+                                    try:
+                                        if len(session['metadata']['language']) == 2:
+                                            lang_dict = Lang(final_language)
+                                            if lang_dict:
+                                                session['metadata']['language'] = lang_dict.pt3
+                                    except Exception as e:
+                                        pass
+                                    if not session.get('translate_enabled'):
+                                        if session['metadata']['language'] != session['language']:
+                                            error = f"WARNING!!! language selected {session['language']} differs from the EPUB file language {session['metadata']['language']}"
+                                            show_alert(session_id, {'type': 'warning', 'msg': error})
+                                    is_lang_in_tts_engine = (
+                                        session.get('tts_engine') in default_engine_settings and
+                                        final_language in default_engine_settings[session['tts_engine']].get('languages', {})
+                                    )
+                                    if is_lang_in_tts_engine:
+                                        session['cover'] = get_cover(epubBook, session_id)
+                                        if session.get('cover', False):
+                                            if missing_orig_json:
+                                                raw_blocks = get_blocks(session_id, epubBook)
+                                                if raw_blocks and session.get('translate_enabled'):
+                                                    raw_blocks, error = translate_blocks(session_id, list(raw_blocks))
+                                                    if error is not None:
+                                                        return error, False
+                                                if raw_blocks:
+                                                    session['blocks_orig'] = {
+                                                        "page": 0,
+                                                        "block_resume": 0,
+                                                        "sentence_resume": 0,
+                                                        "voice": session['voice'],
+                                                        "tts_engine": session['tts_engine'],
+                                                        "fine_tuned": session['fine_tuned'],
+                                                        "blocks": [
+                                                            {
+                                                                "id": str(uuid.uuid4()),
+                                                                "expand": False,
+                                                                "keep": True,
+                                                                "text": t,
+                                                                "voice": session['voice'],
+                                                                "tts_engine": session['tts_engine'],
+                                                                "fine_tuned": session['fine_tuned'],
+                                                                "sentences": [],
+                                                            }
+                                                            for t in raw_blocks if t
+                                                        ],
+                                                    }
+                                                if session.get('blocks_orig', {}):
+                                                    if blocks_orig_old:
+                                                        if not realign_blocks(session_id, blocks_orig_old):
+                                                            # realign failed or nothing to migrate: restart from scratch.
+                                                            # loud on purpose: a silent fallback here looks like a random
+                                                            # full reconversion and is the whole bug class this guards.
+                                                            msg = 'realign_blocks() could not migrate the previous work: restarting the conversion from scratch.'
+                                                            print(msg)
+                                                            show_alert(session_id, {'type': 'warning', 'msg': msg})
+                                                            session['blocks_saved'] = {}
+                                                            session['blocks_current'] = {}
+                                                            if os.path.exists(session['blocks_saved_json']):
+                                                                os.unlink(session['blocks_saved_json'])
+                                                    save_json_blocks(session_id, 'blocks_orig')
+                                            # released before the TTS, the with only covers the early returns
+                                            epubBook.close()
+                                            if not session.get('blocks_current', {}):
+                                                session['blocks_current'] = copy.deepcopy(session['blocks_orig'])
+                                                save_db_blocks(session_id)
+                                            if session.get('blocks_orig', {}) and session.get('blocks_current', {}):
+                                                sync_globals_to_blocks(session_id)
+                                                if session['blocks_preview']:
+                                                    msg = f'Chapters preview requested. Select which block to convert:'
+                                                    print(msg)
+                                                    # the settings can change before finalize_audiobook(): do not keep the engine loaded meanwhile
+                                                    tts_preloads.pop(session_id, None)
+                                                    progress_status = os.path.basename(session['ebook'])
+                                                    return progress_status, True
+                                                else:
+                                                    progress_status, passed = finalize_audiobook(session_id)
+                                                    write_text_profile(session_id, final=True)
+                                                    return progress_status, passed
                                             else:
-                                                progress_status, passed = finalize_audiobook(session_id)
-                                                return progress_status, passed
+                                                error = f"get_blocks() or save_json_blocks() failed! {session['blocks_orig']}"
                                         else:
-                                            error = f"get_blocks() or save_json_blocks() failed! {session['blocks_orig']}"
+                                            error = 'get_cover() failed!'
                                     else:
-                                        error = 'get_cover() failed!'
+                                        error = f"language {final_language} not supported by {session['tts_engine']}!"
                                 else:
-                                    error = f"language {final_language} not supported by {session['tts_engine']}!"
-                            else:
-                                error = 'epubBook.read_epub failed!'
+                                    error = 'epubBook.read_epub failed!'
                     else:
                         error = f"Your device has not enough memory ({total_vram_gb}GB) to run {session['tts_engine']} engine ({device_vram_required}GB)"
                 else:
                     error = f"Temporary directory {session['process_dir']} not removed due to failure."
         if session['cancellation_requested']:
             error = 'Conversion Cancelled'
+        tts_preloads.pop(session_id, None)
         return error, False
     except Exception as e:
         error = f'convert_ebook() Exception: {e}\n{traceback.format_exc()}'
+        tts_preloads.pop(session_id, None)
         return error, False
 
 def finalize_audiobook(session_id:str)->tuple:
@@ -3908,30 +4380,14 @@ def finalize_audiobook(session_id:str)->tuple:
             error = 'finalize_audiobook() failed! blocks_current empty!'
             return _fail(error)
         session['status'] = status_tags['CONVERTING']
-        print('Get sentences…')
-        blocks_current = session['blocks_current']
-        blocks = blocks_current['blocks']
-        for idx, block in enumerate(blocks):
-            if session['cancellation_requested']:
-                if session['status'] == status_tags['DISCONNECTED']:
-                    context_tracker.end_session(session_id, session['socket_hash'])
-                    msg = 'Frontend disconnected!'
-                    return result(msg, False)
-                msg = 'Conversion cancelled'
+        if session['cancellation_requested']:
+            if session['status'] == status_tags['DISCONNECTED']:
+                context_tracker.end_session(session_id, session['socket_hash'])
+                msg = 'Frontend disconnected!'
                 return result(msg, False)
-            if not block['keep'] or not block['text'].strip():
-                block['sentences'] = []
-                continue
-            if block.get('sentences', []):
-                print(f'Block {idx} — sentences already split, skipping')
-                continue
-            sentences_list = get_sentences(session_id, block['text'])
-            if sentences_list is None:
-                error = 'No sentences found!'
-                return result(error, False)
-            block['sentences'] = sentences_list
-        blocks_current['blocks'] = blocks
-        session['blocks_current'] = blocks_current
+            msg = 'Conversion cancelled'
+            return result(msg, False)
+        # blocks are split into sentences by convert_chapters2audio() while the first ones are synthesized
         conversion = convert_chapters2audio(session_id)
         if not conversion:
             error = 'convert_chapters2audio() failed!'
@@ -4084,9 +4540,7 @@ def cleanup_models_cache()->None:
             for cache in (session.get('model_cache'), session.get('model_zs_cache'), session.get('stanza_cache'))
             if cache is not None
         }
-        for key in list(loaded_tts.keys()):
-            if key not in active_models:
-                del loaded_tts[key]
+        loaded_tts.release_unused(active_models)
         gc.collect()
     except Exception as e:
         error = f"cleanup_models_cache() error: {e}"
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+get_sentences() golden check and scaling benchmark.
+
+Usage (from the repository root, inside the python env):
+    python tools/benchmarks/bench_get_sentences.py check     # compare with golden/get_sentences.json
+    python tools/benchmarks/bench_get_sentences.py update    # regenerate the golden file
+    python tools/benchmarks/bench_get_sentences.py bench [max_mb]   # 10KB to 50MB by default
+"""
+
+import sys
+import json
+import random
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+SAMPLES = ROOT / 'tools' / 'workflow-testing'
+GOLDEN = Path(__file__).resolve().parent / 'golden' / 'get_sentences.json'
+SAMPLE_LANGS = {
+    'eng_long_test.txt': 'eng', 'spa_long_test.txt': 'spa', 'hun-test.txt': 'hun', 'sml-test.txt': 'eng',
+    'test1.txt': 'eng', 'test2.txt': 'eng', 'test3.txt': 'eng', 'test4.txt': 'eng', 'test5.txt': 'eng'
+}
+WORDS = [
+    'alpha', 'beta', 'gamma', 'delta', 'épsilon', 'zeta', '[break]', '[pause]', '.', ',', ';', '!', '?',
+    '  ', '\n', '[voice:/tmp/v.wav]', '[/voice]', '，', '。'
+]
+
+def golden_cases()->dict[str, tuple[str, str]]:
+    cases = {}
+    for name, lang in SAMPLE_LANGS.items():
+        cases[name] = (lang, (SAMPLES / name).read_text(encoding='utf-8', errors='ignore'))
+    rnd = random.Random(1)
+    for k in range(60):
+        lang = rnd.choice(['eng', 'spa', 'fra', 'deu'])
+        cases[f'random-{k}'] = (lang, ' '.join(rnd.choice(WORDS) for _ in range(rnd.randint(1, 600))))
+    cases['no-punctuation'] = ('eng', 'word ' * 3000)
+    cases['no-space'] = ('eng', 'x' * 5000)
+    cases['sml-dense'] = ('eng', 'a [break] ' * 2000)
+    return cases
+
+def scaled_texts(size:int)->dict[str, str]:
+    # worst cases of OCRed PDFs: no punctuation at all, and a [break] every line
+    plain = 'lorem ipsum dolor sit amet '
+    ocr = 'lorem ipsum dolor. [break] sit amet, '
+    return {
+        'no-punctuation': (plain * (size // len(plain) + 1))[:size],
+        'sml-lines': (ocr * (size // len(ocr) + 1))[:size]
+    }
+
+def get_splitter():
+    import lib.core as core
+    session = {"id": 'bench', "language": 'eng', "tts_engine": 'xtts'}
+    core.context = SimpleNamespace(get_session=lambda _id: session)
+    def split(text:str, lang:str)->list|None:
+        session['language'] = lang
+        return core.get_sentences('bench', text)
+    return split
+
+def check(update:bool=False)->int:
+    split = get_splitter()
+    results = {name: split(text, lang) for name, (lang, text) in golden_cases().items()}
+    if update:
+        GOLDEN.parent.mkdir(parents=True, exist_ok=True)
+        GOLDEN.write_text(json.dumps(results, ensure_ascii=False, indent=1), encoding='utf-8')
+        print(f'{len(results)} cases written to {GOLDEN}')
+        return 0
+    golden = json.loads(GOLDEN.read_text(encoding='utf-8'))
+    failed = [name for name, sentences in results.items() if golden.get(name) != sentences]
+    for name in failed:
+        print(f'MISMATCH {name}')
+    print(f'{len(results) - len(failed)}/{len(results)} cases identical')
+    return 1 if failed else 0
+
+def bench(max_mb:float)->int:
+    split = get_splitter()
+    size = 10 * 1024
+    while size <= max_mb * 1024 * 1024:
+        for label, text in scaled_texts(size).items():
+            start = time.perf_counter()
+            sentences = split(text, 'eng')
+            elapsed = time.perf_counter() - start
+            print(f'{size / 1024:>10.0f}KB {label:<15} {elapsed:8.3f}s {len(sentences or []):>9} sentences')
+        size *= 5 if size < 10 * 1024 * 1024 else 2.5
+        size = int(size)
+    return 0
+
+if __name__ == '__main__':
+    mode = sys.argv[1] if len(sys.argv) > 1 else 'check'
+    if mode == 'bench':
+        sys.exit(bench(float(sys.argv[2]) if len(sys.argv) > 2 else 50))
+    sys.exit(check(update=(mode == 'update')))
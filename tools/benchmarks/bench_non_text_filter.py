@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark of NonTextFilter on math-heavy text: codepoint tables vs the former
+per-character unicodedata classification (kept below as ReferenceFilter).
+Outputs must be identical.
+
+Usage (from the repository root, inside the python env):
+    python tools/benchmarks/bench_non_text_filter.py [book.epub] [rounds]
+Without an EPUB, the workflow-testing texts are interleaved with LaTeX, unicode
+math, chemistry, code, urls, emoji, private use and astral characters.
+"""
+
+import sys
+import random
+import time
+import unicodedata
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from lib.classes.non_text_filter import NonTextFilter
+
+SAMPLES = ROOT / 'tools' / 'workflow-testing'
+MATH = [
+    r'$\sum_{i=1}^{n} x_i^2$', r'\begin{equation} E = mc^2 \end{equation}', '∀ε>0 ∃δ>0: |x−a|<δ ⇒ |f(x)−f(a)|<ε',
+    '𝐀𝐱 = 𝐛', '∫₀¹ f(t) dt ≈ 0.5', '2H2 + O2 -> 2H2O', 'x = y + 3', '`print(x)`', 'https://example.org/a?b=c',
+    'ℝⁿ → ℝᵐ', '☢ ⚛ ☆', '😀🚀', '\U000f0001', '‍‌', 'α + β = γ', '≤ ≥ ≠ ± × ÷ √ ∞', '१२३ क्षत्रिय',
+    'ภาษาไทย', '中文句子。', '€100 and $5', '\U0001d7d8\U0001d7d9', 'a² + b² = c²'
+]
+
+class ReferenceFilter(NonTextFilter):
+    # NonTextFilter classification as it was before the codepoint tables
+
+    def _strip_unicode_math(self, s:str)->str:
+        ranges = self._MATH_UNICODE_RANGES
+        keep   = self._MATH_KEEP
+        return ''.join(
+            ch for ch in s
+            if ch in keep or not any(lo <= ord(ch) <= hi for lo, hi in ranges)
+        )
+
+    def _strip_special_chars(self, s:str)->str:
+        out = []
+        for ch in s:
+            if (ch.isspace() or ch.isalnum() or ch in self._TEXT_PUNCT
+                    or ch in self._KEEP_CURRENCY or ch in self._MATH_KEEP):
+                out.append(ch)
+                continue
+            out.append(' ' if unicodedata.category(ch) in self._SPECIAL_CATEGORIES else ch)
+        return ''.join(out)
+
+    def _filter_sentences(self, text:str)->str:
+        import regex as re
+        kept = []
+        punct = self._TEXT_PUNCT
+        no_space = self._no_space if self._no_space is not None else self._detect_no_space(text)
+        for sent in self._SENT_SPLIT.split(text):
+            s = sent.strip() if sent else ''
+            if not s:
+                continue
+            non_space = [c for c in s if not c.isspace()]
+            if not non_space:
+                continue
+            text_chars = sum(1 for c in non_space if c.isalpha() or c.isdigit() or c in punct or self._is_mark(c))
+            if text_chars / len(non_space) < self.alpha_ratio:
+                continue
+            if no_space:
+                if not any(c.isalnum() for c in s):
+                    continue
+                if sum(1 for c in s if c.isalnum() or self._is_mark(c)) < self.min_words * 2:
+                    continue
+            else:
+                words = [w for w in re.split(r'\s+', s) if any(c.isalnum() for c in w)]
+                if len(words) < self.min_words:
+                    continue
+            kept.append(s)
+        return ' '.join(kept)
+
+def epub_docs(path:str)->list[str]:
+    import ebooklib
+    from ebooklib import epub
+    from bs4 import BeautifulSoup
+    book = epub.read_epub(path)
+    return [
+        BeautifulSoup(item.get_content(), 'html.parser').get_text(' ')
+        for item in book.get_items_of_type(ebooklib.ITEM_DOCUMENT)
+    ]
+
+def synthetic_docs()->list[str]:
+    rnd = random.Random(7)
+    docs = []
+    for path in sorted(SAMPLES.glob('*.txt')):
+        # a chapter sized document per sample
+        words = (path.read_text(encoding='utf-8', errors='ignore') + ' ').split(' ') * 50
+        for i in range(0, len(words), 40):
+            words.insert(i, rnd.choice(MATH))
+        docs.append(' '.join(words))
+    return docs
+
+def bench(label:str, flt:NonTextFilter, docs:list[str], rounds:int)->tuple[float, list[str]]:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        out = [flt(d) for d in docs]
+    elapsed = time.perf_counter() - start
+    print(f'{label:<12} {elapsed:8.3f}s')
+    return elapsed, out
+
+def main()->int:
+    epub_path = sys.argv[1] if len(sys.argv) > 1 and sys.argv[1].endswith('.epub') else None
+    rounds = int(sys.argv[-1]) if len(sys.argv) > 1 and sys.argv[-1].isdigit() else 5
+    docs = epub_docs(epub_path) if epub_path else synthetic_docs()
+    print(f'{len(docs)} documents, {sum(map(len, docs))} chars, rounds={rounds}')
+    start = time.perf_counter()
+    NonTextFilter()
+    print(f'tables built in {time.perf_counter() - start:.3f}s')
+    failed = 0
+    for lang in (None, 'eng', 'zho'):
+        t_old, out_old = bench(f'reference {lang}', ReferenceFilter(lang=lang), docs, rounds)
+        t_new, out_new = bench(f'tables {lang}', NonTextFilter(lang=lang), docs, rounds)
+        mismatches = sum(1 for a, b in zip(out_old, out_new) if a != b)
+        failed += mismatches
+        print(f'speedup      {t_old / t_new:8.2f}x, {mismatches} mismatches')
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark of normalize_text() over tools/workflow-testing/*.txt
+Compares the former normalize_text() (copied below from the baseline commit,
+romanization left out on both sides) with the cached, precompiled TextNormalizer.
+
+Usage (from the repository root, inside the python env):
+    python tools/benchmarks/bench_text_normalizer.py [lang] [rounds]
+"""
+
+import sys
+import time
+import regex as re
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from lib.classes.text_normalizer import TextNormalizer
+from lib.conf_lang import (
+    abbreviations_mapping, punctuation_switch, chars_remove, punctuation_split_hard_set,
+    punctuation_split_soft_set, specialchars_mapping, default_language_code, emojis_list
+)
+
+SAMPLES = ROOT / 'tools' / 'workflow-testing'
+PAUSE = '[pause]'
+
+def load_chunks()->list[str]:
+    # one chunk per paragraph: the size of a TOC entry up to a short document
+    chunks = []
+    for path in sorted(SAMPLES.glob('*.txt')):
+        text = path.read_text(encoding='utf-8', errors='ignore')
+        chunks.extend(p for p in text.split('\n\n') if p.strip())
+    return chunks
+
+def legacy_normalize_text(text:str, lang:str)->str:
+    # normalize_text() as it was before TextNormalizer, minus foreign2latin()
+
+    def _replace(match:re.Match)->str:
+        token = match.group(1)
+        for k, expansion in mapping.items():
+            if token.lower() == k.lower():
+                return expansion
+        return token
+
+    emoji_pattern = re.compile(f"[{''.join(emojis_list)}]+", flags=re.UNICODE)
+    emoji_pattern.sub('', text)
+    if lang in abbreviations_mapping:
+        mapping = abbreviations_mapping[lang]
+        keys = sorted(mapping.keys(), key=len, reverse=True)
+        pattern = re.compile(
+            r'(?<!\w)(' + '|'.join(re.escape(k) for k in keys) + r')(?!\w)',
+            flags=re.IGNORECASE
+        )
+        text = pattern.sub(_replace, text)
+    pattern = re.compile(r'\b(?:[a-zA-Z]\.){1,}[a-zA-Z]?\b\.?')
+    text = re.sub(r'\b(?:[a-zA-Z]\.){1,}[a-zA-Z]?\b\.?', lambda m: m.group().replace('.', '').upper(), text)
+    pattern = r'(?:\r\n|\r|\n){2,}'
+    text = re.sub(pattern, f' {PAUSE} ', text)
+    text = re.sub(r'\r\n|\r|\n', ' ', text)
+    pattern = f"[{''.join(map(re.escape, punctuation_switch.keys()))}]"
+    text = re.sub(pattern, lambda match: punctuation_switch.get(match.group(), match.group()), text)
+    chars_remove_table = str.maketrans({ch: ' ' for ch in chars_remove})
+    text = text.translate(chars_remove_table)
+    text = re.sub(r'\s*"\s*', '"', text)
+    text = re.sub(r'(?<=[\p{L}\p{N}])"(?=[\p{L}\p{N}]|$)', ', ', text)
+    text = re.sub(r'"', '', text)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\bok\b', 'Okay', text, flags=re.IGNORECASE)
+    pattern = '|'.join(map(re.escape, punctuation_split_hard_set))
+    text = re.sub(rf'(\s*({pattern})\s*)+', r'\2 ', text).strip()
+    pattern = '|'.join(map(re.escape, punctuation_split_soft_set))
+    text = re.sub(rf'(\s*({pattern})\s*)+', r'\2 ', text).strip()
+    text = re.sub(r'(?<=[\p{L}])(?=\d)|(?<=\d)(?=[\p{L}])', ' ', text)
+    specialchars = specialchars_mapping.get(lang, specialchars_mapping.get(default_language_code, specialchars_mapping['eng']))
+    specialchars_table = {ord(char): f" {word} " for char, word in specialchars.items()}
+    text = text.translate(specialchars_table)
+    return ' '.join(text.split())
+
+def bench(label:str, func, chunks:list[str], rounds:int)->float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for chunk in chunks:
+            func(chunk)
+    elapsed = time.perf_counter() - start
+    calls = rounds * len(chunks)
+    print(f'{label:<12} {elapsed:8.3f}s  {elapsed / calls * 1e6:9.1f}us/call')
+    return elapsed
+
+def main()->None:
+    lang = sys.argv[1] if len(sys.argv) > 1 else 'eng'
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    chunks = load_chunks()
+    print(f'{len(chunks)} chunks, {sum(map(len, chunks))} chars, lang={lang}, rounds={rounds}')
+    cached = TextNormalizer(lang, PAUSE)
+    legacy = lambda text: legacy_normalize_text(text, lang)
+    assert all(legacy(c) == cached(c) for c in chunks)
+    t_old = bench('former', legacy, chunks, rounds)
+    t_new = bench('cached', cached, chunks, rounds)
+    print(f'speedup      {t_old / t_new:8.2f}x')
+
+if __name__ == '__main__':
+    main()